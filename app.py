@@ -1,24 +1,131 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import logging
-from datetime import datetime
+import logging.handlers
+import atexit
+from datetime import datetime, timedelta
+import hmac
+import string
 import base64
+import ipaddress
+import fnmatch
+import uuid
+import bisect
+import hashlib
+import heapq
+import re
+import mmap
+import socket
+import ssl
+import queue
+import random
+import struct
 import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
 import urllib3
 
+try:
+    import yaml  # Optionnel: fichier de configuration des APIs au format YAML
+except ImportError:
+    yaml = None
+
+try:
+    import fcntl  # Verrous de fichier: élection du leader, écritures des fenêtres de maintenance (POSIX uniquement)
+except ImportError:
+    fcntl = None
+
 # Désactiver les warnings SSL pour les certificats auto-signés
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # Configuration du logging avec horodatage
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()  # text ou json (un objet JSON par ligne)
+LOG_ASYNC = os.getenv('LOG_ASYNC', 'True').lower() == 'true'  # écriture des logs par un thread dédié
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))  # logs en attente avant abandon
+LOG_CHECKS = os.getenv('LOG_CHECKS', 'all').lower()  # all: une ligne par health check, summary: résumé périodique
+LOG_SUMMARY_INTERVAL = float(os.getenv('LOG_SUMMARY_INTERVAL', '60'))  # secondes entre deux résumés (LOG_CHECKS=summary)
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    Un objet JSON par ligne: horodatage, niveau, logger, message et champs
+    structurés passés via extra= (api, api_name, event, state...)
+    """
+    RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+    
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in self.RESERVED)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Met les logs dans une file bornée, écrite par un QueueListener:
+    les threads de probe ne font jamais d'I/O de log. Le message n'est pas
+    formaté ici (formatage %-style différé au thread d'écriture); si la file
+    est pleine, le log est abandonné et compté plutôt que de bloquer un probe.
+    """
+    
+    def __init__(self, maxsize):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+    
+    def prepare(self, record):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def setup_logging():
+    """
+    Configure le logger racine (sauf s'il l'est déjà, comme logging.basicConfig)
+    
+    Returns:
+        Le AsyncQueueHandler si les logs sont asynchrones, sinon None
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return None
+    root.setLevel(LOG_LEVEL)
+    handler = logging.StreamHandler()
+    if LOG_FORMAT == 'json':
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                                               datefmt='%Y-%m-%d %H:%M:%S'))
+    if not LOG_ASYNC:
+        root.addHandler(handler)
+        return None
+    queue_handler = AsyncQueueHandler(LOG_QUEUE_SIZE)
+    listener = logging.handlers.QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    root.addHandler(queue_handler)
+    return queue_handler
+
+log_queue_handler = setup_logging()
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
@@ -33,296 +140,4408 @@ def startup():
         start_monitoring()
         startup.monitoring_started = True
 
+@app.before_request
+def refresh_targets():
+    """Prise en compte des modifications du fichier des APIs (tous les workers)"""
+    reload_targets()
+
 # Configuration Jira depuis les variables d'environnement
 JIRA_URL = os.getenv('JIRA_URL')
 JIRA_USERNAME = os.getenv('JIRA_USERNAME')
 JIRA_API_TOKEN = os.getenv('JIRA_API_TOKEN')
 JIRA_PROJECT_KEY = os.getenv('JIRA_PROJECT_KEY')
 JIRA_ISSUE_TYPE = os.getenv('JIRA_ISSUE_TYPE', 'Task')
+JIRA_TIMEOUT = int(os.getenv('JIRA_TIMEOUT', '15'))  # secondes
+JIRA_MAX_RETRIES = int(os.getenv('JIRA_MAX_RETRIES', '5'))
+JIRA_BACKOFF_BASE = float(os.getenv('JIRA_BACKOFF_BASE', '1'))  # secondes
+JIRA_BACKOFF_MAX = float(os.getenv('JIRA_BACKOFF_MAX', '60'))  # secondes
+JIRA_RETRY_AFTER_MAX = float(os.getenv('JIRA_RETRY_AFTER_MAX', '900'))  # attente maximale demandée par Retry-After (secondes)
+JIRA_QUEUE_MAXSIZE = int(os.getenv('JIRA_QUEUE_MAXSIZE', '1000'))
+JIRA_BULK_MAX = int(os.getenv('JIRA_BULK_MAX', '50'))  # tickets par appel /issue/bulk
+JIRA_BATCH_WINDOW = float(os.getenv('JIRA_BATCH_WINDOW', '1'))  # secondes d'attente pour grouper les tickets
+JIRA_OPEN_TICKETS_JQL = os.getenv('JIRA_OPEN_TICKETS_JQL', '')  # JQL des tickets de monitoring ouverts (défaut: dérivé du projet et du préfixe)
+JIRA_INDEX_REFRESH_INTERVAL = int(os.getenv('JIRA_INDEX_REFRESH_INTERVAL', '3600'))  # secondes entre deux resynchronisations
+JIRA_RESOLVE_TRANSITION = os.getenv('JIRA_RESOLVE_TRANSITION', '')  # transition appliquée au retour de l'API (vide: commentaire seul)
+
+# Corrélation des pannes: un incident parent pour les APIs tombées ensemble
+OUTAGE_CORRELATION_WINDOW = float(os.getenv('OUTAGE_CORRELATION_WINDOW', '15'))  # secondes de regroupement (0 pour désactiver)
+OUTAGE_CORRELATION_KEYS = {key.strip() for key in os.getenv('OUTAGE_CORRELATION_KEYS', 'dependency').split(',') if key.strip()}  # host, port, subnet, dependency
+OUTAGE_MIN_APIS = max(2, int(os.getenv('OUTAGE_MIN_APIS', '3')))  # APIs minimum pour un incident parent
+OUTAGE_SUBNET_PREFIX = int(os.getenv('OUTAGE_SUBNET_PREFIX', '24'))  # taille du segment réseau (IPv4)
 
 # Configuration du monitoring
-MONITORED_APIS_RAW = os.getenv('MONITORED_APIS', '')  # Format: URL|NOM_API,URL|NOM_API
+MONITORED_APIS_RAW = os.getenv('MONITORED_APIS', '')  # Format: URL|NOM_API[|INTERVALLE],URL|NOM_API
+MONITORED_APIS_FILE = os.getenv('MONITORED_APIS_FILE', 'data/targets.json')  # prioritaire sur MONITORED_APIS s'il existe
+TARGETS_RELOAD_INTERVAL = float(os.getenv('TARGETS_RELOAD_INTERVAL', '1'))  # secondes entre deux vérifications du fichier
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')  # jeton exigé par les endpoints d'administration
+ADMIN_ALLOW_UNAUTHENTICATED = os.getenv('ADMIN_ALLOW_UNAUTHENTICATED', 'False').lower() == 'true'  # sans ADMIN_TOKEN: écritures ouvertes à tous
+DEFAULT_HEALTH_PATH = '/actuator/health'
+PROBE_MAX_BODY_BYTES = int(os.getenv('PROBE_MAX_BODY_BYTES', '65536'))  # taille maximale lue d'une réponse HTTP
+TLS_EXPIRY_MIN_DAYS = float(os.getenv('TLS_EXPIRY_MIN_DAYS', '14'))  # jours de validité minimum d'un certificat
 HEALTH_CHECK_INTERVAL = int(os.getenv('HEALTH_CHECK_INTERVAL', '30'))  # secondes
+HEALTH_CHECK_RETRY_INTERVAL = float(os.getenv('HEALTH_CHECK_RETRY_INTERVAL', '5'))  # secondes entre deux probes d'une API en échec
+HEALTH_CHECK_MAX_BACKOFF = float(os.getenv('HEALTH_CHECK_MAX_BACKOFF', '300'))  # intervalle max pour une API DOWN depuis longtemps
+HEALTH_CHECK_JITTER = float(os.getenv('HEALTH_CHECK_JITTER', '0.1'))  # variation aléatoire de l'intervalle (fraction)
 TIMEOUT = int(os.getenv('HEALTH_CHECK_TIMEOUT', '10'))  # secondes
 RETRY_ATTEMPTS = int(os.getenv('HEALTH_CHECK_RETRY', '3'))
+RECOVERY_ATTEMPTS = max(1, int(os.getenv('HEALTH_CHECK_RECOVERY', '2')))  # succès consécutifs avant de repasser UP
+FLAP_WINDOW = max(2, min(64, int(os.getenv('FLAP_WINDOW', '10'))))  # derniers résultats observés pour le flapping
+FLAP_HIGH_THRESHOLD = float(os.getenv('FLAP_HIGH_THRESHOLD', '0.5'))  # part de changements d'état pour passer FLAPPING
+FLAP_LOW_THRESHOLD = float(os.getenv('FLAP_LOW_THRESHOLD', '0.25'))  # part de changements d'état pour sortir de FLAPPING
+PROBE_CONCURRENCY = max(1, int(os.getenv('HEALTH_CHECK_CONCURRENCY', '20')))  # probes simultanés
+
+# Timeouts adaptatifs: calculés par API à partir des latences observées (moyenne et écart lissés)
+ADAPTIVE_TIMEOUT = os.getenv('ADAPTIVE_TIMEOUT', 'True').lower() == 'true'
+ADAPTIVE_TIMEOUT_MIN = float(os.getenv('ADAPTIVE_TIMEOUT_MIN', '1'))  # secondes (plancher)
+ADAPTIVE_TIMEOUT_MAX = float(os.getenv('ADAPTIVE_TIMEOUT_MAX', str(TIMEOUT)))  # secondes (plafond, HEALTH_CHECK_TIMEOUT par défaut)
+ADAPTIVE_TIMEOUT_MULTIPLIER = float(os.getenv('ADAPTIVE_TIMEOUT_MULTIPLIER', '3'))  # timeout = multiplicateur x (moyenne + 4 écarts)
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = int(os.getenv('ADAPTIVE_TIMEOUT_MIN_SAMPLES', '5'))  # mesures avant d'adapter le timeout
+LATENCY_EWMA_ALPHA = float(os.getenv('LATENCY_EWMA_ALPHA', '0.125'))  # poids d'une nouvelle mesure
+SLOW_RESPONSE_MS = float(os.getenv('SLOW_RESPONSE_MS', '0'))  # seuil absolu de réponse lente (0: seuil relatif seul)
+SLOW_RESPONSE_FACTOR = float(os.getenv('SLOW_RESPONSE_FACTOR', '4'))  # réponse lente au-delà de N fois la latence moyenne (0 pour désactiver)
+SLOW_RESPONSE_MIN_MS = float(os.getenv('SLOW_RESPONSE_MIN_MS', '100'))  # latence en dessous de laquelle une réponse n'est jamais lente
+SLOW_RESPONSE_ATTEMPTS = max(1, int(os.getenv('SLOW_RESPONSE_ATTEMPTS', '3')))  # réponses lentes consécutives avant DEGRADED
+SLOW_RECOVERY_ATTEMPTS = max(1, int(os.getenv('SLOW_RECOVERY_ATTEMPTS', '3')))  # réponses rapides consécutives pour sortir de DEGRADED
+
+# Configuration des connexions HTTP
+HTTP_POOL_MAXSIZE = max(1, int(os.getenv('HTTP_POOL_MAXSIZE', '10')))  # connexions conservées par hôte
+HTTP_KEEP_ALIVE = os.getenv('HTTP_KEEP_ALIVE', 'True').lower() == 'true'
+
+# Configuration multi-workers (Gunicorn): un seul worker exécute le monitoring
+LEADER_ELECTION = os.getenv('MONITORING_LEADER_ELECTION', 'True').lower() == 'true'
+MONITORING_LOCK_FILE = os.getenv('MONITORING_LOCK_FILE', '/tmp/jira-webhook-monitor.lock')
+LEADER_RETRY_INTERVAL = int(os.getenv('MONITORING_LEADER_RETRY', '5'))  # secondes
+STATUS_STORE_PATH = os.getenv('STATUS_STORE_PATH', '/tmp/jira-webhook-status.mmap')
+STATUS_STORE_CAPACITY = int(os.getenv('STATUS_STORE_CAPACITY', '4096'))  # nombre maximum d'APIs
+
+# Sharding: les APIs sont réparties entre plusieurs instances par hachage cohérent
+CLUSTER_NODE_ID = os.getenv('CLUSTER_NODE_ID', '')  # identifiant de cette instance (vide: pas de sharding)
+CLUSTER_PEERS = os.getenv('CLUSTER_PEERS', '')  # Format: ID=URL,ID=URL (toutes les instances, y compris celle-ci)
+CLUSTER_MEMBERS_FILE = os.getenv('CLUSTER_MEMBERS_FILE', '')  # alternative à CLUSTER_PEERS, rechargé à chaud
+CLUSTER_VNODES = int(os.getenv('CLUSTER_VNODES', '64'))  # points par instance sur l'anneau
+CLUSTER_REFRESH_INTERVAL = float(os.getenv('CLUSTER_REFRESH_INTERVAL', '5'))  # secondes entre deux vérifications des pairs
+CLUSTER_PEER_TIMEOUT = float(os.getenv('CLUSTER_PEER_TIMEOUT', '2'))  # secondes
+CLUSTER_PEER_FAILURES = int(os.getenv('CLUSTER_PEER_FAILURES', '3'))  # échecs consécutifs avant d'exclure un pair
+
+# Confirmation d'une panne depuis d'autres points de vue avant de la déclarer DOWN
+VANTAGE_POINTS = os.getenv('VANTAGE_POINTS', '')  # Format: ID=URL,ID=URL (vide: autres instances du cluster)
+VANTAGE_QUORUM = int(os.getenv('VANTAGE_QUORUM', '0'))  # votes DOWN requis, point de vue local compris (0: majorité des réponses)
+VANTAGE_TOKEN = os.getenv('VANTAGE_TOKEN', '') or ADMIN_TOKEN  # jeton des appels à /monitoring/probe
+
+# Persistance de l'état du monitoring (vide pour désactiver)
+STATE_JOURNAL_PATH = os.getenv('STATE_JOURNAL_PATH', 'data/state.journal')
+STATE_SNAPSHOT_INTERVAL = int(os.getenv('STATE_SNAPSHOT_INTERVAL', '300'))  # secondes entre deux compactions
+
+# Exposition des métriques Prometheus (/metrics)
+METRICS_EXPORT_PATH = os.getenv('METRICS_EXPORT_PATH', '/tmp/jira-webhook-metrics.prom')  # métriques publiées par le leader
+METRICS_CACHE_TTL = float(os.getenv('METRICS_CACHE_TTL', '5'))  # secondes de cache entre deux scrapes
+
+# Flux des changements d'état (/monitoring/stream)
+EVENT_STORE_PATH = os.getenv('EVENT_STORE_PATH', '/tmp/jira-webhook-events.mmap')
+EVENT_BUFFER_SIZE = max(16, int(os.getenv('EVENT_BUFFER_SIZE', '4096')))  # derniers événements conservés pour la reprise
+STREAM_POLL_INTERVAL = float(os.getenv('STREAM_POLL_INTERVAL', '0.5'))  # secondes entre deux lectures du buffer
+STREAM_KEEPALIVE = float(os.getenv('STREAM_KEEPALIVE', '15'))  # secondes entre deux commentaires keep-alive
+STREAM_MAX_DURATION = float(os.getenv('STREAM_MAX_DURATION', '300'))  # durée d'une connexion avant reconnexion du client
+LONG_POLL_TIMEOUT = float(os.getenv('LONG_POLL_TIMEOUT', '25'))  # attente maximale d'une requête long-poll
+
+# Historique des health checks (ring buffers de taille fixe par API)
+HISTORY_STORE_PATH = os.getenv('HISTORY_STORE_PATH', '/tmp/jira-webhook-history.mmap')
+HISTORY_SAMPLES = int(os.getenv('HISTORY_SAMPLES', '2880'))  # résultats bruts conservés par API
+HISTORY_MINUTES = int(os.getenv('HISTORY_MINUTES', '1440'))  # agrégats à la minute conservés par API
+HISTORY_HOURS = int(os.getenv('HISTORY_HOURS', '720'))  # agrégats à l'heure conservés par API
+
+# Fenêtres de maintenance: pas de ticket pendant une fenêtre (les health checks continuent)
+MAINTENANCE_FILE = os.getenv('MAINTENANCE_FILE', 'data/maintenance.json')  # vide pour désactiver
+MAINTENANCE_HORIZON = float(os.getenv('MAINTENANCE_HORIZON', '86400'))  # secondes d'occurrences récurrentes indexées à l'avance
 
 # Configuration des tickets
 TICKET_SUMMARY_PREFIX = os.getenv('TICKET_SUMMARY_PREFIX', '[CRITICAL] API DOWN')
 TICKET_DESCRIPTION_MESSAGE = os.getenv('TICKET_DESCRIPTION_MESSAGE', "L'API ne répond plus aux health checks")
+# Gabarits string.Template (${champ}, \n pour un saut de ligne), compilés une fois au démarrage
+TICKET_DESCRIPTION_TEMPLATE = os.getenv('TICKET_DESCRIPTION_TEMPLATE', '')  # vide: gabarit par défaut
+TICKET_RECOVERY_TEMPLATE = os.getenv('TICKET_RECOVERY_TEMPLATE', '')  # vide: gabarit par défaut
+TICKET_LATENCY_SAMPLES = int(os.getenv('TICKET_LATENCY_SAMPLES', '5'))  # derniers health checks cités dans le ticket
 
 # Parser les APIs monitorées
+def normalize_target(config):
+    """
+    Valide et normalise la configuration d'une API monitorée
+    
+    Champs: url (obligatoire), name, type, interval, timeout, health_path, method,
+    expected_status, json_path, expected_value, min_days, slow_ms, tags, depends_on
+    """
+    if not isinstance(config, dict) or not str(config.get('url', '')).strip():
+        raise ValueError(f"Configuration d'API invalide (url obligatoire): {config}")
+    url = str(config['url']).strip()
+    target = {'url': url, 'name': str(config.get('name') or urlparse(url).netloc or url).strip()}
+    
+    # Type de probe: explicite, ou déduit du schéma de l'URL (tcp://, dns://, tls://)
+    probe_type = config.get('type') or PROBE_SCHEMES.get(urlparse(url).scheme, 'http')
+    if probe_type not in PROBE_TYPES:
+        raise ValueError(f"Type de probe inconnu pour {url}: {probe_type} (disponibles: {', '.join(sorted(PROBE_TYPES))})")
+    if probe_type != 'http':
+        target['type'] = probe_type
+    for key in ('interval', 'timeout', 'min_days', 'slow_ms'):
+        if config.get(key) is not None:
+            value = float(config[key])
+            if value <= 0:
+                raise ValueError(f"{key} doit être positif pour {url}")
+            target[key] = value
+    for key in ('health_path', 'json_path', 'expected_value'):
+        if config.get(key) is not None:
+            target[key] = str(config[key])
+    if config.get('method'):
+        target['method'] = str(config['method']).upper()
+    if 'json_path' in target:
+        parse_json_path(target['json_path'])
+    if config.get('expected_status') is not None:
+        expected = config['expected_status']
+        target['expected_status'] = [int(code) for code in (expected if isinstance(expected, list) else [expected])]
+    for key in ('tags', 'depends_on'):
+        if config.get(key):
+            values = config[key] if isinstance(config[key], list) else [config[key]]
+            target[key] = [str(value) for value in values]
+    return target
+
 def parse_monitored_apis():
     """
     Parse les APIs monitorées depuis la variable d'environnement
-    Format: URL|NOM_API,URL|NOM_API
+    Format: URL|NOM_API,URL|NOM_API ou URL|NOM_API|INTERVALLE (secondes)
     """
     apis = []
     if MONITORED_APIS_RAW:
         for api_config in MONITORED_APIS_RAW.split(','):
             api_config = api_config.strip()
             if '|' in api_config:
-                url, name = api_config.split('|', 1)
-                apis.append({'url': url.strip(), 'name': name.strip()})
+                url, name, *options = api_config.split('|')
+                api = {'url': url.strip(), 'name': name.strip()}
+                if options and options[0].strip():
+                    api['interval'] = float(options[0])
+                apis.append(api)
             else:
                 # Format legacy: juste l'URL
                 apis.append({'url': api_config, 'name': urlparse(api_config).netloc})
     return apis
 
-MONITORED_APIS = parse_monitored_apis()
+def parse_targets_file(path):
+    """
+    Lit le fichier des APIs monitorées (JSON, ou YAML si PyYAML est installé)
+    Format: liste d'APIs, ou {"targets": [...]}
+    """
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yml', '.yaml')):
+            if yaml is None:
+                raise ValueError("PyYAML n'est pas installé, utilisez un fichier JSON")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    return parse_targets(data)
+
+def parse_targets(data):
+    if isinstance(data, dict):
+        data = data.get('targets')
+    if not isinstance(data, list):
+        raise ValueError("Une liste d'APIs est attendue")
+    targets = [normalize_target(config) for config in data]
+    urls = [target['url'] for target in targets]
+    if len(set(urls)) != len(urls):
+        raise ValueError("Une même URL est configurée plusieurs fois")
+    return targets
+
+def load_monitored_apis():
+    """
+    APIs monitorées: fichier MONITORED_APIS_FILE s'il existe, sinon MONITORED_APIS
+    """
+    if MONITORED_APIS_FILE and os.path.exists(MONITORED_APIS_FILE):
+        try:
+            return parse_targets_file(MONITORED_APIS_FILE)
+        except (OSError, ValueError) as e:
+            logger.error(f"Fichier des APIs invalide ({MONITORED_APIS_FILE}): {str(e)}")
+    return [normalize_target(api) for api in parse_monitored_apis() if api['url'].strip()]
 
 # État du monitoring
-api_status = {}  # {url: {'status': 'up'/'down', 'last_check': datetime, 'consecutive_failures': int, 'name': str}}
+api_status = {}  # {url: ApiState}
+api_status_lock = threading.Lock()
+check_counts = Counter()  # health checks depuis le dernier résumé (LOG_CHECKS=summary)
 monitoring_thread = None
+leader_lock_fd = None  # Descripteur du verrou détenu par le worker leader
+targets_lock = threading.Lock()
+targets_state = {'mtime': None, 'checked_at': 0.0, 'version': 0}
+if MONITORED_APIS_FILE and os.path.exists(MONITORED_APIS_FILE):
+    targets_state['mtime'] = os.stat(MONITORED_APIS_FILE).st_mtime_ns
+probe_executor = None  # Pool borné partagé par tous les health checks
+vantage_executor = None  # Pool des probes de confirmation envoyés aux autres points de vue
+HOUSEKEEPING_INTERVAL = 5  # secondes entre deux heartbeats du leader
 
-# Headers pour l'authentification Jira
-def get_jira_headers():
-    # Utiliser l'authentification Basic avec username:password
-    credentials = f"{JIRA_USERNAME}:{JIRA_API_TOKEN}"
-    encoded_credentials = base64.b64encode(credentials.encode()).decode()
-    return {
-        'Authorization': f'Basic {encoded_credentials}',
-        'Content-Type': 'application/json'
-    }
-
-def check_api_health(api_url):
+class HttpSessionPool:
     """
-    Vérifie la santé d'une API en effectuant un health check
+    Sessions HTTP partagées et thread-safe, une par hôte cible.
+    Chaque session garde un pool de connexions keep-alive, ce qui évite
+    une connexion TCP et une négociation TLS par health check.
     """
-    try:
-        # Nettoyer l'URL
-        clean_url = api_url.strip()
-        if not clean_url:
-            return False, "URL vide"
-        
-        # Ajouter /actuator/health si ce n'est pas déjà présent
-        if not clean_url.endswith('/actuator/health'):
-            clean_url = clean_url.rstrip('/') + '/actuator/health'
+    
+    def __init__(self, pool_maxsize, keep_alive=True):
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self._sessions = {}  # {(scheme, netloc): requests.Session}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+    
+    def get(self, url):
+        """
+        Retourne la session associée à l'hôte de l'URL (créée si nécessaire)
+        """
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.netloc)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                self.misses += 1
+                session = self._create_session()
+                self._sessions[key] = session
+            else:
+                self.hits += 1
+            return session
+    
+    def stats(self):
+        """
+        Compteurs du pool : sessions, hits/miss et réutilisation des connexions
+        """
+        with self._lock:
+            sessions = list(self._sessions.values())
+            hits, misses = self.hits, self.misses
         
-        # Effectuer la requête avec timeout
-        response = requests.get(clean_url, timeout=TIMEOUT)
+        connections = 0
+        requests_sent = 0
+        for session in sessions:
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is not None:
+                        connections += pool.num_connections
+                        requests_sent += pool.num_requests
         
-        if response.status_code == 200:
-            try:
-                health_data = response.json()
-                # Vérifier le statut dans la réponse JSON
-                if health_data.get('status') == 'UP':
-                    return True, "API UP"
-                else:
-                    return False, f"API DOWN - Status: {health_data.get('status')}"
-            except json.JSONDecodeError:
-                # Si ce n'est pas du JSON, considérer que c'est OK si 200
-                return True, "API UP (non-JSON response)"
-        else:
-            return False, f"HTTP {response.status_code}"
-            
-    except requests.exceptions.Timeout:
-        return False, "Timeout"
-    except requests.exceptions.ConnectionError:
-        return False, "Connection Error"
-    except Exception as e:
-        return False, f"Error: {str(e)}"
+        return {
+            "hosts": len(sessions),
+            "session_hits": hits,
+            "session_misses": misses,
+            "connections_opened": connections,
+            "requests_sent": requests_sent,
+            "connections_reused": max(0, requests_sent - connections),
+            "pool_maxsize": self.pool_maxsize,
+            "keep_alive": self.keep_alive
+        }
 
-def create_jira_ticket(ticket_type, **kwargs):
+STATUS_CODES = ('unknown', 'up', 'down', 'degraded', 'flapping', 'recovering')
+
+class ApiState:
     """
-    Crée un ticket Jira pour les APIs down
+    État d'une API pour la machine à états du monitoring
+    (UNKNOWN, UP, DEGRADED, DOWN, FLAPPING, RECOVERING).
+    Structure compacte (__slots__): les derniers résultats sont gardés dans
+    un entier, un bit par health check (1 = succès, bit 0 = le plus récent).
+    """
+    __slots__ = ('name', 'status', 'since', 'last_check', 'consecutive_failures', 'consecutive_successes',
+                 'results', 'results_count', 'last_ticket_created', 'ticket_key', 'ticket_pending',
+                 'latency_avg', 'latency_dev', 'latency_samples', 'failing_since', 'ticket_suppressed',
+                 'consecutive_slow', 'consecutive_fast')
     
-    Args:
-        ticket_type: 'api_down'
-        **kwargs: Données spécifiques (api_url, api_name, error_message)
+    def __init__(self, name, status='unknown', since=None, last_check=None, consecutive_failures=0,
+                 consecutive_successes=0, results=0, results_count=0, last_ticket_created=None, ticket_key=None,
+                 latency_avg=0.0, latency_dev=0.0, latency_samples=0, failing_since=None):
+        self.name = name
+        self.status = status
+        self.since = since
+        self.last_check = last_check
+        self.consecutive_failures = consecutive_failures
+        self.consecutive_successes = consecutive_successes
+        self.consecutive_slow = 0  # réponses lentes consécutives
+        self.consecutive_fast = 0  # réponses rapides consécutives
+        self.results = results
+        self.results_count = results_count
+        self.last_ticket_created = last_ticket_created
+        self.ticket_key = ticket_key
+        self.ticket_pending = False
+        self.ticket_suppressed = False  # ticket de la panne en cours déjà retenu par une fenêtre de maintenance
+        # Estimateur de latence (ms) des health checks réussis: moyenne et écart moyen lissés (EWMA)
+        self.latency_avg = latency_avg
+        self.latency_dev = latency_dev
+        self.latency_samples = latency_samples
+        # Premier échec de la panne en cours (None si l'API répond)
+        self.failing_since = failing_since
+    
+    def copy(self):
+        state = ApiState.__new__(ApiState)
+        for field in self.__slots__:
+            setattr(state, field, getattr(self, field))
+        return state
+    
+    def record_result(self, is_healthy, slow=False):
+        """
+        Ajoute un résultat à la fenêtre glissante et met à jour les compteurs
+        """
+        self.results = ((self.results << 1) | int(is_healthy)) & ((1 << FLAP_WINDOW) - 1)
+        self.results_count = min(self.results_count + 1, FLAP_WINDOW)
+        if is_healthy:
+            self.consecutive_successes += 1
+            self.consecutive_failures = 0
+            self.consecutive_slow = self.consecutive_slow + 1 if slow else 0
+            self.consecutive_fast = 0 if slow else self.consecutive_fast + 1
+        else:
+            self.consecutive_failures += 1
+            self.consecutive_successes = 0
+            self.consecutive_slow = self.consecutive_fast = 0
+    
+    def flap_ratio(self):
+        """
+        Part de changements de résultat entre deux health checks successifs de la fenêtre
+        """
+        if self.results_count < 2:
+            return 0.0
+        changes = (self.results ^ (self.results >> 1)) & ((1 << (self.results_count - 1)) - 1)
+        return bin(changes).count('1') / (self.results_count - 1)
+    
+    def record_latency(self, latency_ms):
+        """
+        Met à jour l'estimateur avec la latence d'un health check réussi
+        """
+        if self.latency_samples == 0:
+            self.latency_avg, self.latency_dev = latency_ms, latency_ms / 2
+        else:
+            self.latency_dev += LATENCY_EWMA_ALPHA * (abs(latency_ms - self.latency_avg) - self.latency_dev)
+            self.latency_avg += LATENCY_EWMA_ALPHA * (latency_ms - self.latency_avg)
+        self.latency_samples += 1
+    
+    def is_slow(self, latency_ms, slow_ms=None):
+        """
+        Réponse lente: au-delà du seuil absolu (slow_ms de l'API ou SLOW_RESPONSE_MS),
+        sinon nettement au-dessus de la latence habituelle de l'API
+        """
+        threshold = slow_ms or SLOW_RESPONSE_MS
+        if threshold:
+            return latency_ms > threshold
+        if not SLOW_RESPONSE_FACTOR or self.latency_samples < ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+            return False
+        return latency_ms > max(SLOW_RESPONSE_MIN_MS, SLOW_RESPONSE_FACTOR * self.latency_avg,
+                                self.latency_avg + 4 * self.latency_dev)
+    
+    def probe_timeout(self):
+        """
+        Timeout adaptatif du prochain health check (secondes):
+        multiplicateur x (moyenne + 4 écarts), borné par ADAPTIVE_TIMEOUT_MIN/MAX et doublé
+        à chaque échec consécutif. Une API figée est ainsi coupée vite, sans occuper un slot
+        de probe pendant HEALTH_CHECK_TIMEOUT. Le health check qui ferait passer l'API DOWN
+        utilise le plafond: une API lente mais joignable passe DEGRADED, pas DOWN.
+        """
+        if self.latency_samples < ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+            return ADAPTIVE_TIMEOUT_MAX
+        if self.status not in ('down', 'recovering') and self.consecutive_failures + 1 >= RETRY_ATTEMPTS:
+            return ADAPTIVE_TIMEOUT_MAX
+        timeout = ADAPTIVE_TIMEOUT_MULTIPLIER * (self.latency_avg + 4 * self.latency_dev) / 1000
+        timeout *= 2 ** min(self.consecutive_failures, 4)
+        return min(ADAPTIVE_TIMEOUT_MAX, max(ADAPTIVE_TIMEOUT_MIN, timeout))
+
+class StatusStore:
     """
-    try:
-        if ticket_type == 'api_down':
-            # Ticket pour API down
-            api_url = kwargs['api_url']
-            api_name = kwargs['api_name']
-            error_message = kwargs['error_message']
-            
-            fields = {
-                "project": {"key": JIRA_PROJECT_KEY},
-                "summary": f"{TICKET_SUMMARY_PREFIX} - {api_name}",
-                "description": f"{TICKET_DESCRIPTION_MESSAGE}",
-                "issuetype": {"name": JIRA_ISSUE_TYPE}
-            }
-                
+    Statuts des APIs dans un fichier mappé en mémoire, partagé par tous les workers.
+    Le leader écrit des enregistrements de taille fixe protégés par un seqlock :
+    les lecteurs ne prennent aucun verrou et relisent simplement un enregistrement
+    modifié pendant leur lecture.
+    """
+    MAGIC = b'JWSTATUS'
+    # magic, capacité, génération, heartbeat du leader, nombre de slots utilisés, pid du leader,
+    # date du dernier changement de génération
+    HEADER = struct.Struct('<8sIQdIId')
+    HEADER_SIZE = 64
+    # seq, statut, échecs consécutifs, last_check, last_ticket_created, longueurs url/nom, url, nom
+    RECORD = struct.Struct('<IB3xIddHH256s96s')
+    SEQ = struct.Struct('<I')
+    # Zone de statistiques (JSON) publiée par le leader: seq, longueur, données
+    STATS_HEADER = struct.Struct('<II')
+    STATS_SIZE = 65536
+    
+    def __init__(self, path, capacity):
+        self.path = path
+        self.capacity = capacity
+        self._mm = None
+        self._inode = None
+        self._writer = False
+        # État propre au writer
+        self._write_lock = threading.Lock()
+        self._slots = {}  # {url: slot}
+        self._free_slots = []
+        self._used = 0
+        self._generation = 0
+        self._changed_at = 0.0
+        self._served = {}  # {url: champs servis par /health et /monitoring/status}
+        self._overflow_logged = False
+    
+    def _size(self, capacity):
+        return self.HEADER_SIZE + capacity * self.RECORD.size + self.STATS_SIZE
+    
+    def _stats_offset(self, capacity):
+        return self.HEADER_SIZE + capacity * self.RECORD.size
+    
+    def open_writer(self):
+        """
+        Ouvre (ou crée) le store en écriture. Appelé uniquement par le leader.
+        Sans élection de leader, le store est anonyme et propre au processus.
+        """
+        size = self._size(self.capacity)
+        if not LEADER_ELECTION:
+            mm = mmap.mmap(-1, size)
         else:
-            raise ValueError(f"Type de ticket non supporté: {ticket_type}. Seul 'api_down' est supporté.")
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size != size:
+                    os.ftruncate(fd, size)
+                mm = mmap.mmap(fd, size)
+                self._inode = os.fstat(fd).st_ino
+            finally:
+                os.close(fd)
         
-        # Envoi de la requête à Jira
-        jira_ticket = {"fields": fields}
-        response = requests.post(
-            f"{JIRA_URL}/rest/api/2/issue",
-            headers=get_jira_headers(),
-            json=jira_ticket,
-            verify=False  # Désactiver la vérification SSL pour les certificats auto-signés
-        )
+        self._mm = mm
+        self._writer = True
+        self._slots.clear()
+        self._free_slots.clear()
+        self._served.clear()
+        self._used = 0
+        self._write_header()
+    
+    def _write_header(self, changed=True):
+        if changed:
+            self._generation += 1
+            self._changed_at = time.time()
+        self.HEADER.pack_into(self._mm, 0, self.MAGIC, self.capacity, self._generation,
+                              time.time(), self._used, os.getpid(), self._changed_at)
+    
+    def _write_record(self, slot, status, consecutive_failures, last_check, last_ticket_created, url, name):
+        offset = self.HEADER_SIZE + slot * self.RECORD.size
+        seq = self.SEQ.unpack_from(self._mm, offset)[0]
+        seq += 1 if seq % 2 == 0 else 2  # seq impair: écriture en cours
+        self.SEQ.pack_into(self._mm, offset, seq)
+        url_bytes = url.encode()[:256]
+        name_bytes = name.encode()[:96]
+        self.RECORD.pack_into(self._mm, offset, seq, status, consecutive_failures, last_check,
+                              last_ticket_created, len(url_bytes), len(name_bytes), url_bytes, name_bytes)
+        self.SEQ.pack_into(self._mm, offset, seq + 1)
+    
+    def write(self, url, state):
+        """
+        Publie l'état d'une API (appelé par le leader à chaque résultat)
+        """
+        if not self._writer:
+            return
+        with self._write_lock:
+            self._write(url, state)
+    
+    def _write(self, url, state):
+        slot = self._slots.get(url)
+        if slot is None:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            elif self._used < self.capacity:
+                slot = self._used
+                self._used += 1
+            else:
+                if not self._overflow_logged:
+                    logger.error(f"Status store plein ({self.capacity} APIs), augmentez STATUS_STORE_CAPACITY")
+                    self._overflow_logged = True
+                return
+            self._slots[url] = slot
         
-        if response.status_code == 201:
-            ticket_data = response.json()
-            logger.info(f"Ticket Jira créé ({ticket_type}): {ticket_data['key']}")
-            return {
-                "success": True,
-                "ticket_key": ticket_data['key'],
-                "ticket_url": f"{JIRA_URL}/browse/{ticket_data['key']}"
-            }
+        last_ticket_created = state.last_ticket_created.timestamp() if state.last_ticket_created else 0.0
+        self._write_record(
+            slot,
+            STATUS_CODES.index(state.status),
+            state.consecutive_failures,
+            state.last_check.timestamp(),
+            last_ticket_created,
+            url,
+            state.name
+        )
+        # La génération (clé du cache des réponses) ne change qu'avec l'état servi,
+        # pas à chaque health check (last_check, échecs consécutifs)
+        served = (state.status, last_ticket_created, state.name)
+        changed = self._served.get(url) != served
+        self._served[url] = served
+        self._write_header(changed)
+    
+    def remove(self, url):
+        """
+        Libère le slot d'une API qui n'est plus monitorée
+        """
+        with self._write_lock:
+            slot = self._slots.pop(url, None)
+            if slot is None:
+                return
+            self._write_record(slot, 0, 0, 0.0, 0.0, '', '')
+            self._served.pop(url, None)
+            self._free_slots.append(slot)
+            self._write_header()
+    
+    def heartbeat(self):
+        """
+        Signale que le leader est toujours actif
+        """
+        if self._writer:
+            with self._write_lock:
+                self._write_header(changed=False)
+    
+    def publish_stats(self, stats):
+        """
+        Publie les statistiques d'exécution du leader (pool HTTP, file Jira...)
+        """
+        if not self._writer:
+            return
+        data = json.dumps(stats, default=str).encode()
+        max_len = self.STATS_SIZE - self.STATS_HEADER.size
+        if len(data) > max_len:
+            data = b'{}'
+        offset = self._stats_offset(self.capacity)
+        with self._write_lock:
+            seq = self.SEQ.unpack_from(self._mm, offset)[0]
+            seq += 1 if seq % 2 == 0 else 2
+            self.SEQ.pack_into(self._mm, offset, seq)
+            self.STATS_HEADER.pack_into(self._mm, offset, seq, len(data))
+            start = offset + self.STATS_HEADER.size
+            self._mm[start:start + len(data)] = data
+            self.SEQ.pack_into(self._mm, offset, seq + 1)
+    
+    def read_stats(self):
+        """
+        Lit les statistiques publiées par le leader
+        """
+        header = self.read_header()
+        if header is None:
+            return {}
+        mm = self._mm
+        offset = self._stats_offset(header['capacity'])
+        start = offset + self.STATS_HEADER.size
+        for _ in range(1000):
+            seq, length = self.STATS_HEADER.unpack_from(mm, offset)
+            if seq % 2:
+                continue
+            data = mm[start:start + length]
+            if self.SEQ.unpack_from(mm, offset)[0] == seq:
+                break
         else:
-            logger.error(f"Erreur création ticket Jira: {response.status_code} - {response.text}")
-            return {
-                "success": False,
-                "error": f"Erreur Jira: {response.status_code} - {response.text}"
+            # Écriture interrompue (leader arrêté en pleine écriture): dernière valeur lue
+            _, length = self.STATS_HEADER.unpack_from(mm, offset)
+            length = min(length, self.STATS_SIZE - self.STATS_HEADER.size)
+            data = mm[start:start + length]
+        try:
+            return json.loads(data) if length else {}
+        except ValueError:
+            return {}
+    
+    def _reader_map(self):
+        if self._writer:
+            return self._mm
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        # Re-mapper si le fichier a été recréé ou redimensionné par un nouveau leader
+        if self._mm is None or st.st_ino != self._inode or st.st_size != len(self._mm):
+            if st.st_size < self.HEADER_SIZE:
+                return None
+            with open(self.path, 'rb') as f:
+                self._mm = mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ)
+            self._inode = st.st_ino
+        return self._mm
+    
+    def read_header(self):
+        mm = self._reader_map()
+        if mm is None:
+            return None
+        magic, capacity, generation, updated_at, used, leader_pid, changed_at = self.HEADER.unpack_from(mm, 0)
+        if magic != self.MAGIC or len(mm) < self._size(capacity):
+            return None
+        return {
+            "capacity": capacity,
+            "generation": generation,
+            "updated_at": updated_at,
+            "changed_at": changed_at,
+            "used": min(used, capacity),
+            "leader_pid": leader_pid
+        }
+    
+    def _read_record(self, mm, slot):
+        offset = self.HEADER_SIZE + slot * self.RECORD.size
+        for _ in range(1000):
+            seq = self.SEQ.unpack_from(mm, offset)[0]
+            if seq % 2:
+                continue
+            record = self.RECORD.unpack_from(mm, offset)
+            if self.SEQ.unpack_from(mm, offset)[0] == seq:
+                return record
+        # Écriture interrompue (leader arrêté en pleine écriture): dernière valeur lue
+        return self.RECORD.unpack_from(mm, offset)
+    
+    def read_all(self):
+        """
+        Lit l'état de toutes les APIs publiées, sans verrou
+        """
+        header = self.read_header()
+        if header is None:
+            return {}
+        mm = self._mm
+        result = {}
+        for slot in range(header['used']):
+            _, status, failures, last_check, last_ticket, url_len, name_len, url, name = self._read_record(mm, slot)
+            if not url_len:
+                continue
+            result[url[:url_len].decode(errors='replace')] = {
+                'name': name[:name_len].decode(errors='replace'),
+                'status': STATUS_CODES[status] if status < len(STATUS_CODES) else 'unknown',
+                'last_check': datetime.fromtimestamp(last_check).isoformat(),
+                'consecutive_failures': failures,
+                'last_ticket_created': datetime.fromtimestamp(last_ticket).isoformat() if last_ticket else None
             }
-            
-    except Exception as e:
-        logger.error(f"Erreur création ticket: {str(e)}")
-        return {"success": False, "error": str(e)}
+        return result
 
-# Support Prometheus supprimé pour le moment
-
-def monitoring_worker():
+class HistoryStore:
     """
-    Thread de monitoring qui vérifie périodiquement la santé des APIs
+    Historique des health checks par API, dans des ring buffers de taille fixe
+    (fichier mappé en mémoire partagé entre workers, comme le StatusStore).
+    
+    Chaque API dispose d'une région contenant:
+    - les HISTORY_SAMPLES derniers résultats bruts (timestamp, latence, code HTTP, message)
+    - des agrégats à la minute et à l'heure (nombre, échecs, somme et max des latences)
+    Les tableaux sont lus directement via des memoryview typées: une requête
+    sur une plage de temps fait une recherche dichotomique puis ne lit que cette plage.
+    La mémoire occupée est fixe: HISTORY_SAMPLES * 17 + (HISTORY_MINUTES + HISTORY_HOURS) * 28 octets par API.
     """
-    global api_status
+    MAGIC = b'JWHISTRY'
+    # magic, capacité, échantillons, minutes, heures, nombre de messages
+    HEADER = struct.Struct('<8sIIIII')
+    HEADER_SIZE = 64
+    MESSAGE_CAPACITY = 1024
+    MESSAGE = struct.Struct('<B63s')
+    NO_MESSAGE = 0xFFFF
+    # seq, longueur de l'url, tête/taille du buffer brut, des agrégats minute et heure, url
+    REGION_HEADER = struct.Struct('<IH2xIIIIII256s')
+    REGION_HEADER_SIZE = 320
+    SEQ = struct.Struct('<I')
+    ROLLUPS = (('1m', 60), ('1h', 3600))
+    
+    def __init__(self, path, capacity, samples, minutes, hours):
+        self.path = path
+        self.capacity = capacity
+        self.samples = max(8, samples)
+        self.rollup_sizes = {'1m': max(1, minutes), '1h': max(1, hours)}
+        self._mm = None
+        self._inode = None
+        self._writer = False
+        self._lock = threading.Lock()
+        self._slots = {}  # {url: slot}
+        self._free_slots = []
+        self._used = 0
+        self._messages = {}  # {message: index}
+        self._reader_slots = {}
+        
+        # Disposition d'une région: en-tête, buffer brut, puis agrégats
+        layout = [('ts', 'd', self.samples), ('latency', 'f', self.samples), ('code', 'h', self.samples),
+                  ('message', 'H', self.samples), ('ok', 'B', self.samples)]
+        for name, _ in self.ROLLUPS:
+            size = self.rollup_sizes[name]
+            layout += [(f'{name}_start', 'd', size), (f'{name}_lat_sum', 'd', size),
+                       (f'{name}_count', 'I', size), (f'{name}_failures', 'I', size),
+                       (f'{name}_lat_max', 'f', size)]
+        self._layout = {}
+        offset = self.REGION_HEADER_SIZE
+        for name, fmt, size in layout:
+            self._layout[name] = (offset, fmt, size)
+            offset += struct.calcsize(fmt) * size
+            offset = (offset + 7) & ~7
+        self.region_size = offset
+        self._messages_offset = self.HEADER_SIZE
+        self._regions_offset = self.HEADER_SIZE + self.MESSAGE_CAPACITY * self.MESSAGE.size
     
-    logger.info("Thread de monitoring démarré")
+    def _size(self):
+        return self._regions_offset + self.capacity * self.region_size
     
-    while True:
-        try:
-            logger.debug(f"Début du cycle de monitoring pour {len(MONITORED_APIS)} API(s)")
-            for api in MONITORED_APIS:
-                api_url = api['url']
-                api_name = api['name']
-                
-                if not api_url.strip():
-                    continue
-                    
-                clean_url = api_url.strip()
-                is_healthy, message = check_api_health(clean_url)
-                current_time = datetime.now()
-                
-                # Initialiser le statut si c'est la première vérification
-                if clean_url not in api_status:
-                    api_status[clean_url] = {
-                        'name': api_name,
-                        'status': 'unknown',
-                        'last_check': current_time,
-                        'consecutive_failures': 0,
-                        'last_ticket_created': None
-                    }
-                
-                # Mettre à jour le statut
-                api_status[clean_url]['last_check'] = current_time
-                
-                if is_healthy:
-                    # API est UP
-                    if api_status[clean_url]['status'] == 'down':
-                        logger.info(f"🟢 API {api_name} ({clean_url}) est revenue UP")
-                    api_status[clean_url]['status'] = 'up'
-                    api_status[clean_url]['consecutive_failures'] = 0
-                else:
-                    # API est DOWN
-                    api_status[clean_url]['consecutive_failures'] += 1
-                    
-                    # Créer un ticket seulement si c'est la première fois ou après plusieurs échecs
-                    should_create_ticket = (
-                        api_status[clean_url]['status'] != 'down' or  # Premier échec
-                        api_status[clean_url]['consecutive_failures'] >= RETRY_ATTEMPTS  # Échecs consécutifs
-                    )
-                    
-                    if should_create_ticket and api_status[clean_url]['last_ticket_created'] is None:
-                        logger.warning(f"🔴 API {api_name} ({clean_url}) est DOWN: {message}")
-                        result = create_jira_ticket('api_down', api_url=clean_url, api_name=api_name, error_message=message)
-                        if result['success']:
-                            api_status[clean_url]['last_ticket_created'] = current_time
-                            logger.info(f"🎫 Ticket créé pour API DOWN {api_name}: {result['ticket_key']}")
-                        else:
-                            logger.error(f"❌ Échec création ticket pour {api_name}: {result['error']}")
-                    
-                    api_status[clean_url]['status'] = 'down'
-                
-                # Log de chaque vérification
-                status_icon = "✅" if is_healthy else "❌"
-                logger.info(f"{status_icon} {api_name} ({clean_url}): {message}")
+    def open_writer(self):
+        """
+        Ouvre (ou crée) l'historique en écriture. Appelé uniquement par le leader.
+        """
+        size = self._size()
+        if not LEADER_ELECTION:
+            mm = mmap.mmap(-1, size)
+        else:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size != size:
+                    os.ftruncate(fd, size)
+                mm = mmap.mmap(fd, size)
+                self._inode = os.fstat(fd).st_ino
+            finally:
+                os.close(fd)
+        self._mm = mm
+        self._writer = True
+        self._slots.clear()
+        self._free_slots.clear()
+        self._used = 0
+        self._messages.clear()
+        # L'historique du leader précédent n'est pas repris: les régions sont réinitialisées à l'allocation
+        self.HEADER.pack_into(mm, 0, self.MAGIC, self.capacity, self.samples,
+                              self.rollup_sizes['1m'], self.rollup_sizes['1h'], 0)
+    
+    def _view(self, mm, slot, name):
+        offset, fmt, size = self._layout[name]
+        start = self._regions_offset + slot * self.region_size + offset
+        return memoryview(mm)[start:start + struct.calcsize(fmt) * size].cast(fmt)
+    
+    def _region_offset(self, slot):
+        return self._regions_offset + slot * self.region_size
+    
+    def _message_index(self, message):
+        index = self._messages.get(message)
+        if index is None:
+            if len(self._messages) >= self.MESSAGE_CAPACITY:
+                return self.NO_MESSAGE
+            index = len(self._messages)
+            encoded = message.encode()[:63]
+            self.MESSAGE.pack_into(self._mm, self._messages_offset + index * self.MESSAGE.size, len(encoded), encoded)
+            self._messages[message] = index
+            self.HEADER.pack_into(self._mm, 0, self.MAGIC, self.capacity, self.samples,
+                                  self.rollup_sizes['1m'], self.rollup_sizes['1h'], len(self._messages))
+        return index
+    
+    def _allocate(self, url):
+        slot = self._slots.get(url)
+        if slot is not None:
+            return slot
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        elif self._used < self.capacity:
+            slot = self._used
+            self._used += 1
+        else:
+            return None
+        self._slots[url] = slot
+        url_bytes = url.encode()[:256]
+        offset = self._region_offset(slot)
+        seq = self.SEQ.unpack_from(self._mm, offset)[0]
+        seq += 2 if seq % 2 else 1
+        self.REGION_HEADER.pack_into(self._mm, offset, seq, len(url_bytes), 0, 0, 0, 0, 0, 0, url_bytes)
+        self.SEQ.pack_into(self._mm, offset, seq + 1)
+        return slot
+    
+    def record(self, url, timestamp, is_healthy, message, http_code, latency_ms):
+        """
+        Ajoute le résultat d'un health check (appelé par le leader)
+        """
+        if not self._writer:
+            return
+        with self._lock:
+            slot = self._allocate(url)
+            if slot is None:
+                return
+            mm = self._mm
+            offset = self._region_offset(slot)
+            seq, url_len, head, count, min_head, min_count, hour_head, hour_count, url_bytes = \
+                self.REGION_HEADER.unpack_from(mm, offset)
+            self.SEQ.pack_into(mm, offset, seq + 1)  # écriture en cours
             
-            # Attendre avant la prochaine vérification
-            logger.info(f"⏳ Attente de {HEALTH_CHECK_INTERVAL}s avant la prochaine vérification...")
-            time.sleep(HEALTH_CHECK_INTERVAL)
+            latency = latency_ms if latency_ms is not None else float('nan')
+            self._view(mm, slot, 'ts')[head] = timestamp
+            self._view(mm, slot, 'latency')[head] = latency
+            self._view(mm, slot, 'code')[head] = http_code
+            self._view(mm, slot, 'message')[head] = self._message_index(message)
+            self._view(mm, slot, 'ok')[head] = 1 if is_healthy else 0
+            head = (head + 1) % self.samples
+            count = min(count + 1, self.samples)
             
-        except Exception as e:
-            logger.error(f"Erreur dans le monitoring worker: {str(e)}")
-            time.sleep(HEALTH_CHECK_INTERVAL)
+            rollup_state = {'1m': [min_head, min_count], '1h': [hour_head, hour_count]}
+            for name, period in self.ROLLUPS:
+                rollup_head, rollup_count = rollup_state[name]
+                size = self.rollup_sizes[name]
+                starts = self._view(mm, slot, f'{name}_start')
+                bucket = timestamp - timestamp % period
+                last = (rollup_head - 1) % size
+                if rollup_count == 0 or starts[last] != bucket:
+                    last = rollup_head
+                    starts[last] = bucket
+                    self._view(mm, slot, f'{name}_count')[last] = 0
+                    self._view(mm, slot, f'{name}_failures')[last] = 0
+                    self._view(mm, slot, f'{name}_lat_sum')[last] = 0.0
+                    self._view(mm, slot, f'{name}_lat_max')[last] = 0.0
+                    rollup_state[name] = [(rollup_head + 1) % size, min(rollup_count + 1, size)]
+                self._view(mm, slot, f'{name}_count')[last] += 1
+                if not is_healthy:
+                    self._view(mm, slot, f'{name}_failures')[last] += 1
+                if latency_ms is not None:
+                    self._view(mm, slot, f'{name}_lat_sum')[last] += latency_ms
+                    lat_max = self._view(mm, slot, f'{name}_lat_max')
+                    lat_max[last] = max(lat_max[last], latency_ms)
+            
+            self.REGION_HEADER.pack_into(mm, offset, seq + 1, url_len, head, count,
+                                         rollup_state['1m'][0], rollup_state['1m'][1],
+                                         rollup_state['1h'][0], rollup_state['1h'][1], url_bytes)
+            self.SEQ.pack_into(mm, offset, seq + 2)
+    
+    def remove(self, url):
+        """
+        Libère la région d'une API qui n'est plus monitorée
+        """
+        if not self._writer:
+            return
+        with self._lock:
+            slot = self._slots.pop(url, None)
+            if slot is None:
+                return
+            offset = self._region_offset(slot)
+            seq = self.SEQ.unpack_from(self._mm, offset)[0]
+            seq += 2 if seq % 2 else 1
+            self.REGION_HEADER.pack_into(self._mm, offset, seq + 1, 0, 0, 0, 0, 0, 0, 0, b'')
+            self._free_slots.append(slot)
+    
+    def _reader_map(self):
+        if self._writer:
+            return self._mm
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        if self._mm is None or st.st_ino != self._inode or st.st_size != len(self._mm):
+            if st.st_size < self.HEADER_SIZE:
+                return None
+            with open(self.path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ)
+            magic, capacity, samples, minutes, hours, _ = self.HEADER.unpack_from(mm, 0)
+            if (magic != self.MAGIC or (capacity, samples, minutes, hours) !=
+                    (self.capacity, self.samples, self.rollup_sizes['1m'], self.rollup_sizes['1h'])):
+                return None
+            self._mm = mm
+            self._inode = st.st_ino
+            self._reader_slots = {}
+        return self._mm
+    
+    def _find_slot(self, mm, url):
+        if self._writer:
+            return self._slots.get(url)
+        url_bytes = url.encode()[:256]
+        slot = self._reader_slots.get(url)
+        if slot is not None:
+            _, url_len, *_, stored = self.REGION_HEADER.unpack_from(mm, self._region_offset(slot))
+            if stored[:url_len] == url_bytes:
+                return slot
+        for slot in range(self.capacity):
+            _, url_len, *_, stored = self.REGION_HEADER.unpack_from(mm, self._region_offset(slot))
+            if url_len and stored[:url_len] == url_bytes:
+                self._reader_slots[url] = slot
+                return slot
+        return None
+    
+    def _message(self, mm, index):
+        if index == self.NO_MESSAGE:
+            return None
+        length, data = self.MESSAGE.unpack_from(mm, self._messages_offset + index * self.MESSAGE.size)
+        return data[:length].decode(errors='replace')
+    
+    @staticmethod
+    def _bisect(view, first, count, size, value):
+        # Premier index logique dont le timestamp est >= value (buffer trié dans le temps)
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if view[(first + mid) % size] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def query(self, url, start, end, resolution='raw'):
+        """
+        Résultats (ou agrégats '1m' / '1h') d'une API entre start et end (timestamps)
+        
+        Returns:
+            Liste de dicts, ou None si l'API n'a pas d'historique
+        """
+        mm = self._reader_map()
+        if mm is None:
+            return None
+        slot = self._find_slot(mm, url)
+        if slot is None:
+            return None
+        offset = self._region_offset(slot)
+        
+        for _ in range(100):
+            seq = self.SEQ.unpack_from(mm, offset)[0]
+            if seq % 2:
+                continue
+            result = self._read_region(mm, slot, offset, resolution, start, end)
+            if self.SEQ.unpack_from(mm, offset)[0] == seq:
+                return result
+        # Écriture interrompue (leader arrêté en pleine écriture): dernière valeur lue
+        return self._read_region(mm, slot, offset, resolution, start, end)
+    
+    def _read_region(self, mm, slot, offset, resolution, start, end):
+        _, _, head, count, min_head, min_count, hour_head, hour_count, _ = self.REGION_HEADER.unpack_from(mm, offset)
+        if resolution == 'raw':
+            return self._read_raw(mm, slot, head, count, start, end)
+        rollup_head, rollup_count = (min_head, min_count) if resolution == '1m' else (hour_head, hour_count)
+        return self._read_rollup(mm, slot, resolution, rollup_head, rollup_count, start, end)
+    
+    def _read_raw(self, mm, slot, head, count, start, end):
+        size = self.samples
+        first = (head - count) % size
+        ts = self._view(mm, slot, 'ts')
+        lo = self._bisect(ts, first, count, size, start)
+        hi = self._bisect(ts, first, count, size, end + 1e-6)
+        latency = self._view(mm, slot, 'latency')
+        code = self._view(mm, slot, 'code')
+        message = self._view(mm, slot, 'message')
+        ok = self._view(mm, slot, 'ok')
+        samples = []
+        for i in range(lo, hi):
+            index = (first + i) % size
+            lat = latency[index]
+            samples.append({
+                'timestamp': ts[index],
+                'latency_ms': None if lat != lat else round(lat, 2),
+                'http_code': code[index],
+                'healthy': bool(ok[index]),
+                'message': self._message(mm, message[index])
+            })
+        return samples
+    
+    def _read_rollup(self, mm, slot, name, head, count, start, end):
+        size = self.rollup_sizes[name]
+        first = (head - count) % size
+        period = dict(self.ROLLUPS)[name]
+        starts = self._view(mm, slot, f'{name}_start')
+        lo = self._bisect(starts, first, count, size, start - period + 1e-6)
+        hi = self._bisect(starts, first, count, size, end + 1e-6)
+        counts = self._view(mm, slot, f'{name}_count')
+        failures = self._view(mm, slot, f'{name}_failures')
+        lat_sum = self._view(mm, slot, f'{name}_lat_sum')
+        lat_max = self._view(mm, slot, f'{name}_lat_max')
+        buckets = []
+        for i in range(lo, hi):
+            index = (first + i) % size
+            bucket_count = counts[index]
+            buckets.append({
+                'timestamp': starts[index],
+                'count': bucket_count,
+                'failures': failures[index],
+                'latency_avg_ms': round(lat_sum[index] / bucket_count, 2) if bucket_count else None,
+                'latency_max_ms': round(lat_max[index], 2)
+            })
+        return buckets
 
-def start_monitoring():
+def summarize_history(samples):
     """
-    Démarre le thread de monitoring
+    Résumé d'une liste de résultats bruts: disponibilité et percentiles de latence
     """
-    global monitoring_thread
+    latencies = sorted(s['latency_ms'] for s in samples if s['healthy'] and s['latency_ms'] is not None)
+    failures = sum(1 for s in samples if not s['healthy'])
     
-    logger.info(f"Tentative de démarrage du monitoring...")
-    logger.info(f"APIs configurées: {MONITORED_APIS}")
+    def percentile(p):
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(round(p / 100 * (len(latencies) - 1))))]
     
-    if not MONITORED_APIS:
-        logger.warning("Aucune API à monitorer configurée")
-        return
+    return {
+        'count': len(samples),
+        'failures': failures,
+        'availability': round(1 - failures / len(samples), 4) if samples else None,
+        'latency_ms': {
+            'min': latencies[0] if latencies else None,
+            'avg': round(sum(latencies) / len(latencies), 2) if latencies else None,
+            'p50': percentile(50),
+            'p90': percentile(90),
+            'p99': percentile(99),
+            'max': latencies[-1] if latencies else None
+        }
+    }
+
+class EventStore:
+    """
+    Buffer circulaire des derniers changements d'état, partagé entre workers
+    (fichier mappé en mémoire, écrit par le leader comme le StatusStore).
+    Chaque événement a un identifiant croissant et occupe un slot de taille fixe
+    (identifiant % capacité): un lecteur reprend après son dernier identifiant
+    tant que l'événement suivant n'a pas été écrasé. Les identifiants continuent
+    d'un leader à l'autre.
+    """
+    MAGIC = b'JWEVENTS'
+    # magic, capacité, dernier identifiant, date de mise à jour
+    HEADER = struct.Struct('<8sIxxxxQd')
+    HEADER_SIZE = 64
+    RECORD_SIZE = 512
+    # identifiant (0: écriture en cours), longueur du JSON
+    RECORD_HEADER = struct.Struct('<QH')
+    ID = struct.Struct('<Q')
     
-    if monitoring_thread is None or not monitoring_thread.is_alive():
+    def __init__(self, path, capacity):
+        self.path = path
+        self.capacity = capacity
+        self._mm = None
+        self._inode = None
+        self._writer = False
+        self._lock = threading.Lock()
+        self._last_id = 0
+    
+    def _size(self, capacity):
+        return self.HEADER_SIZE + capacity * self.RECORD_SIZE
+    
+    def open_writer(self):
+        """
+        Ouvre (ou crée) le buffer en écriture. Appelé uniquement par le leader.
+        """
+        size = self._size(self.capacity)
+        last_id = 0
+        if not LEADER_ELECTION:
+            mm = mmap.mmap(-1, size)
+        else:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                current_size = os.fstat(fd).st_size
+                if current_size >= self.HEADER_SIZE:
+                    # Reprendre la numérotation du leader précédent
+                    magic, _, last_id, _ = self.HEADER.unpack(os.pread(fd, self.HEADER.size, 0))
+                    last_id = last_id if magic == self.MAGIC else 0
+                if current_size != size:
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, size)
+                mm = mmap.mmap(fd, size)
+                self._inode = os.fstat(fd).st_ino
+            finally:
+                os.close(fd)
+        self._mm = mm
+        self._writer = True
+        self._last_id = last_id
+        self.HEADER.pack_into(mm, 0, self.MAGIC, self.capacity, last_id, time.time())
+    
+    def append(self, event):
+        """
+        Ajoute un événement (dict JSON) au buffer
+        
+        Returns:
+            Identifiant de l'événement
+        """
+        if not self._writer:
+            return None
+        data = json.dumps(event, default=str).encode()
+        max_len = self.RECORD_SIZE - self.RECORD_HEADER.size
+        if len(data) > max_len:
+            # Message tronqué pour tenir dans un slot
+            overflow = len(data) - max_len
+            message = str(event.get('message', ''))
+            data = json.dumps(dict(event, message=message[:max(0, len(message) - overflow - 8)] + '…'), default=str).encode()
+            if len(data) > max_len:
+                data = json.dumps(dict(event, message=None), default=str).encode()[:max_len]
+        with self._lock:
+            self._last_id += 1
+            event_id = self._last_id
+            offset = self.HEADER_SIZE + (event_id % self.capacity) * self.RECORD_SIZE
+            self.RECORD_HEADER.pack_into(self._mm, offset, 0, len(data))
+            start = offset + self.RECORD_HEADER.size
+            self._mm[start:start + len(data)] = data
+            self.ID.pack_into(self._mm, offset, event_id)
+            self.HEADER.pack_into(self._mm, 0, self.MAGIC, self.capacity, event_id, time.time())
+        return event_id
+    
+    def _reader_map(self):
+        if self._writer:
+            return self._mm
         try:
-            monitoring_thread = threading.Thread(target=monitoring_worker, daemon=True)
-            monitoring_thread.start()
-            api_names = [api['name'] for api in MONITORED_APIS]
-            logger.info(f"Monitoring démarré pour {len(MONITORED_APIS)} API(s): {', '.join(api_names)}")
-        except Exception as e:
-            logger.error(f"Erreur lors du démarrage du monitoring: {str(e)}")
-    else:
-        logger.info("Monitoring déjà actif")
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        if self._mm is None or st.st_ino != self._inode or st.st_size != len(self._mm):
+            if st.st_size < self.HEADER_SIZE:
+                return None
+            with open(self.path, 'rb') as f:
+                self._mm = mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ)
+            self._inode = st.st_ino
+        return self._mm
+    
+    def last_id(self):
+        """
+        Identifiant du dernier événement publié (0 si aucun)
+        """
+        mm = self._reader_map()
+        if mm is None:
+            return 0
+        magic, capacity, last_id, _ = self.HEADER.unpack_from(mm, 0)
+        if magic != self.MAGIC or len(mm) < self._size(capacity):
+            return 0
+        return last_id
+    
+    def read_since(self, after_id, limit=500):
+        """
+        Lit les événements postérieurs à after_id, sans verrou
+        
+        Returns:
+            (events, last_id, complete) - complete vaut False si des événements
+            ont été perdus (écrasés dans le buffer, ou identifiant inconnu du leader):
+            le client doit alors relire l'état complet
+        """
+        mm = self._reader_map()
+        if mm is None:
+            return [], 0, after_id == 0
+        magic, capacity, last_id, _ = self.HEADER.unpack_from(mm, 0)
+        if magic != self.MAGIC or len(mm) < self._size(capacity):
+            return [], 0, after_id == 0
+        if after_id > last_id:
+            return [], last_id, False
+        
+        complete = last_id - after_id <= capacity
+        events = []
+        upper = min(last_id, after_id + limit) if complete else last_id
+        for event_id in range(max(after_id + 1, last_id - capacity + 1), upper + 1):
+            offset = self.HEADER_SIZE + (event_id % capacity) * self.RECORD_SIZE
+            if self.ID.unpack_from(mm, offset)[0] != event_id:
+                complete = False
+                continue
+            length = self.RECORD_HEADER.unpack_from(mm, offset)[1]
+            start = offset + self.RECORD_HEADER.size
+            data = mm[start:start + length]
+            # Slot réécrit pendant la lecture: l'événement est perdu
+            if self.ID.unpack_from(mm, offset)[0] != event_id:
+                complete = False
+                continue
+            try:
+                events.append((event_id, json.loads(data)))
+            except ValueError:
+                complete = False
+        return events, upper, complete
 
-@app.route('/health', methods=['GET'])
-def health_check():
+class StateJournal:
     """
-    Endpoint de santé pour vérifier que le service fonctionne
+    Journal append-only des transitions d'état, compacté périodiquement en snapshot.
+    Chaque transition est une ligne JSON écrite sans fsync (le cache du système
+    suffit à survivre à un redémarrage du processus); seul le snapshot est
+    synchronisé sur disque lors de la compaction.
     """
-    return jsonify({
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "jira_configured": bool(JIRA_URL and JIRA_USERNAME and JIRA_API_TOKEN and JIRA_PROJECT_KEY),
-        "monitoring_active": monitoring_thread is not None and monitoring_thread.is_alive(),
-        "monitored_apis": len(MONITORED_APIS),
-        "api_status": api_status
-    })
+    
+    def __init__(self, path):
+        self.path = path
+        self.snapshot_path = f"{path}.snapshot" if path else None
+        self._file = None
+        self._lock = threading.Lock()
+        self.entries = 0
+        self.last_compaction = time.monotonic()
+    
+    @staticmethod
+    def _encode(url, state):
+        return {
+            'url': url,
+            'name': state.name,
+            'status': state.status,
+            'since': state.since.timestamp() if state.since else None,
+            'last_check': state.last_check.timestamp(),
+            'consecutive_failures': state.consecutive_failures,
+            'consecutive_successes': state.consecutive_successes,
+            'results': state.results,
+            'results_count': state.results_count,
+            'last_ticket_created': state.last_ticket_created.timestamp() if state.last_ticket_created else None,
+            'ticket_key': state.ticket_key,
+            'latency_avg': round(state.latency_avg, 3),
+            'latency_dev': round(state.latency_dev, 3),
+            'latency_samples': state.latency_samples,
+            'failing_since': state.failing_since.timestamp() if state.failing_since else None
+        }
+    
+    @staticmethod
+    def _decode(entry):
+        last_ticket = entry.get('last_ticket_created')
+        since = entry.get('since')
+        return ApiState(
+            entry.get('name', ''),
+            status=entry['status'] if entry['status'] in STATUS_CODES else 'unknown',
+            since=datetime.fromtimestamp(since) if since else None,
+            last_check=datetime.fromtimestamp(entry['last_check']),
+            consecutive_failures=entry['consecutive_failures'],
+            consecutive_successes=entry.get('consecutive_successes', 0),
+            results=entry.get('results', 0) & ((1 << FLAP_WINDOW) - 1),
+            results_count=min(entry.get('results_count', 0), FLAP_WINDOW),
+            last_ticket_created=datetime.fromtimestamp(last_ticket) if last_ticket else None,
+            ticket_key=entry.get('ticket_key'),
+            latency_avg=entry.get('latency_avg', 0.0),
+            latency_dev=entry.get('latency_dev', 0.0),
+            latency_samples=entry.get('latency_samples', 0),
+            failing_since=datetime.fromtimestamp(entry['failing_since']) if entry.get('failing_since') else None
+        )
+    
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self._file
+    
+    def recover(self):
+        """
+        Relit le snapshot puis rejoue le journal.
+        Une dernière ligne tronquée (arrêt brutal) est ignorée.
+        
+        Returns:
+            {url: état} tel qu'il était avant l'arrêt
+        """
+        if not self.path:
+            return {}
+        states = {}
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as f:
+                for url, entry in json.load(f).items():
+                    states[url] = self._decode(entry)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Snapshot d'état illisible ({self.snapshot_path}): {str(e)}")
+        
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get('removed'):
+                        states.pop(entry['url'], None)
+                    else:
+                        states[entry['url']] = self._decode(entry)
+                    self.entries += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Journal d'état illisible ({self.path}): {str(e)}")
+        return states
+    
+    def record(self, url, state):
+        """
+        Ajoute une transition au journal (sans fsync)
+        """
+        if not self.path:
+            return
+        line = json.dumps(self._encode(url, state)) + '\n'
+        with self._lock:
+            try:
+                f = self._open()
+                f.write(line)
+                f.flush()
+                self.entries += 1
+            except OSError as e:
+                logger.error(f"Erreur d'écriture du journal d'état: {str(e)}")
+    
+    def compact(self, states):
+        """
+        Écrit un snapshot complet (fsync + rename atomique) puis vide le journal
+        
+        Args:
+            states: {url: état} courant, copié par l'appelant
+        """
+        if not self.path:
+            return
+        snapshot = {url: self._encode(url, state) for url, state in states.items()}
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.snapshot_path)
+                if self._file is not None:
+                    self._file.close()
+                self._file = open(self.path, 'w', encoding='utf-8')
+                self.entries = 0
+            except OSError as e:
+                logger.error(f"Erreur de compaction du journal d'état: {str(e)}")
+            self.last_compaction = time.monotonic()
+    
+    def compact_if_due(self, states_provider):
+        if self.path and time.monotonic() - self.last_compaction >= STATE_SNAPSHOT_INTERVAL:
+            self.compact(states_provider())
 
-@app.route('/', methods=['GET'])
-def home():
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class MetricsRegistry:
     """
-    Page d'accueil avec des informations sur le service
+    Compteurs et histogrammes au format Prometheus, conçus pour le chemin critique.
+    Chaque thread incrémente son propre shard sans verrou; les shards ne sont
+    fusionnés qu'au moment de l'export.
     """
-    return jsonify({
-        "service": "Jira Webhook for API Monitoring",
-        "version": "1.0.0",
-        "endpoints": {
-            "health": "/health",
-            "monitoring_status": "/monitoring/status",
-            "start_monitoring": "/monitoring/start"
-        },
-        "status": "running",
-        "monitoring_active": monitoring_thread is not None and monitoring_thread.is_alive()
-    })
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []  # [(compteurs, histogrammes)] un par thread
+        self._lock = threading.Lock()
+        self._definitions = {}  # {nom: (type, aide, labels, buckets)}
+    
+    def counter(self, name, help_text, labels=()):
+        self._definitions[name] = ('counter', help_text, labels, None)
+    
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self._definitions[name] = ('histogram', help_text, labels, buckets)
+    
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = ({}, {})
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+    
+    def inc(self, name, labels=(), amount=1):
+        counters = self._shard()[0]
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+    
+    def observe(self, name, labels, value):
+        histograms = self._shard()[1]
+        key = (name, labels)
+        buckets = self._definitions[name][3]
+        values = histograms.get(key)
+        if values is None:
+            # Un compteur par bucket (+Inf inclus) puis la somme des valeurs
+            values = histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+        values[bisect.bisect_left(buckets, value)] += 1
+        values[-1] += value
+    
+    def _merge(self):
+        with self._lock:
+            shards = list(self._shards)
+        counters = {}
+        histograms = {}
+        for shard_counters, shard_histograms in shards:
+            for key, value in dict(shard_counters).items():
+                counters[key] = counters.get(key, 0) + value
+            for key, values in dict(shard_histograms).items():
+                merged = histograms.get(key)
+                if merged is None:
+                    histograms[key] = list(values)
+                else:
+                    for i, value in enumerate(values):
+                        merged[i] += value
+        return counters, histograms
+    
+    @staticmethod
+    def _labels(names, values, extra=None):
+        pairs = [f'{n}="{escape_label_value(v)}"' for n, v in zip(names, values)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+    
+    def render(self):
+        """
+        Exposition texte Prometheus de toutes les métriques de ce processus
+        """
+        counters, histograms = self._merge()
+        lines = []
+        for name, (metric_type, help_text, label_names, buckets) in self._definitions.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if metric_type == 'counter':
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{self._labels(label_names, labels)} {value}")
+            else:
+                for (metric, labels), values in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(buckets + (float('inf'),), values):
+                        cumulative += count
+                        le = 'le="+Inf"' if bound == float('inf') else f'le="{bound}"'
+                        lines.append(f"{name}_bucket{self._labels(label_names, labels, le)} {cumulative}")
+                    lines.append(f"{name}_sum{self._labels(label_names, labels)} {values[-1]}")
+                    lines.append(f"{name}_count{self._labels(label_names, labels)} {cumulative}")
+        return '\n'.join(lines) + '\n'
 
-@app.route('/monitoring/status', methods=['GET'])
-def monitoring_status():
+metrics = MetricsRegistry()
+metrics.histogram('jira_webhook_probe_duration_seconds', "Durée des health checks", ('api',))
+metrics.counter('jira_webhook_probes_total', "Nombre de health checks", ('api', 'result'))
+metrics.counter('jira_webhook_api_transitions_total', "Changements d'état des APIs", ('api', 'from', 'to'))
+metrics.counter('jira_webhook_tickets_suppressed_total', "Pannes sans ticket (fenêtre de maintenance), une fois par panne", ('api',))
+metrics.counter('jira_webhook_vantage_confirmations_total', "Pannes soumises aux autres points de vue", ('api', 'result'))
+metrics.histogram('jira_webhook_jira_request_duration_seconds', "Durée des appels à Jira", ('endpoint',))
+metrics.counter('jira_webhook_jira_errors_total', "Erreurs des appels à Jira", ('endpoint', 'reason'))
+metrics.histogram('jira_webhook_cycle_duration_seconds', "Durée d'une vague de health checks (lancement jusqu'au dernier résultat)", (), LAG_BUCKETS)
+metrics.histogram('jira_webhook_scheduler_lag_seconds', "Retard des health checks par rapport à leur échéance", (), LAG_BUCKETS)
+
+class ProbeScheduler:
     """
-    Endpoint pour voir le statut du monitoring des APIs
+    Planification des health checks par API, sur un tas (heap) trié par échéance.
+    Chaque API a sa propre échéance: ajout, suppression et replanification
+    coûtent O(log n). Les entrées supprimées ou replanifiées restent dans le tas
+    et sont ignorées à leur sortie (suppression paresseuse).
     """
-    return jsonify({
-        "monitoring_active": monitoring_thread is not None and monitoring_thread.is_alive(),
-        "monitored_apis": MONITORED_APIS,
-        "api_status": api_status,
-        "config": {
-            "health_check_interval": HEALTH_CHECK_INTERVAL,
-            "timeout": TIMEOUT,
-            "retry_attempts": RETRY_ATTEMPTS,
-            "ticket_summary_prefix": TICKET_SUMMARY_PREFIX,
-            "ticket_description_message": TICKET_DESCRIPTION_MESSAGE
-        }
-    })
+    
+    def __init__(self):
+        self._heap = []  # [(échéance monotonic, jeton, url)]
+        self._entries = {}  # {url: (jeton, api)}
+        self._counter = 0
+        self.condition = threading.Condition()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def schedule(self, api, delay):
+        """
+        Planifie (ou replanifie) le prochain health check d'une API
+        """
+        url = api['url'].strip()
+        with self.condition:
+            self._counter += 1
+            self._entries[url] = (self._counter, api)
+            heapq.heappush(self._heap, (time.monotonic() + delay, self._counter, url))
+            self.condition.notify()
+    
+    def remove(self, url):
+        with self.condition:
+            self._entries.pop(url, None)
+    
+    def update(self, api, delay):
+        """
+        Remplace la configuration d'une API déjà planifiée.
+        Si un probe est en cours, il sera replanifié avec la nouvelle configuration à sa fin.
+        """
+        url = api['url'].strip()
+        with self.condition:
+            entry = self._entries.get(url)
+            if entry is not None and entry[0] is None:
+                self._entries[url] = (None, api)
+                return
+        self.schedule(api, delay)
+    
+    def contains(self, url):
+        return url in self._entries
+    
+    def urls(self):
+        with self.condition:
+            return list(self._entries)
+    
+    def get(self, url):
+        """Configuration courante d'une API planifiée (None si elle n'est plus monitorée)"""
+        entry = self._entries.get(url)
+        return entry[1] if entry is not None else None
+    
+    def pop_due(self, now, limit):
+        """
+        Retire jusqu'à limit APIs dont l'échéance est passée
+        
+        Returns:
+            Liste de (échéance, api)
+        """
+        due = []
+        with self.condition:
+            while self._heap and len(due) < limit:
+                deadline, token, url = self._heap[0]
+                entry = self._entries.get(url)
+                if entry is None or entry[0] != token:
+                    heapq.heappop(self._heap)  # entrée obsolète
+                    continue
+                if deadline > now:
+                    break
+                heapq.heappop(self._heap)
+                # L'API reste connue du scheduler mais n'a plus d'échéance tant que le probe est en cours
+                self._entries[url] = (None, entry[1])
+                due.append((deadline, entry[1]))
+        return due
+    
+    def next_deadline(self):
+        with self.condition:
+            while self._heap:
+                deadline, token, url = self._heap[0]
+                entry = self._entries.get(url)
+                if entry is not None and entry[0] == token:
+                    return deadline
+                heapq.heappop(self._heap)
+        return None
+
+class HashRing:
+    """
+    Anneau de hachage cohérent: chaque instance y place CLUSTER_VNODES points,
+    une API appartient à l'instance du premier point qui suit son hash.
+    L'ajout ou le retrait d'une instance ne déplace qu'environ 1/N des APIs.
+    """
+    
+    def __init__(self, nodes, vnodes):
+        points = sorted((self.hash(f"{node}#{index}"), node) for node in nodes for index in range(vnodes))
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+    
+    @staticmethod
+    def hash(key):
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+    
+    def owner(self, key):
+        if not self._nodes:
+            return None
+        index = bisect.bisect(self._hashes, self.hash(key)) % len(self._nodes)
+        return self._nodes[index]
+
+class ClusterMembership:
+    """
+    Membres du cluster (CLUSTER_PEERS ou CLUSTER_MEMBERS_FILE) et répartition des APIs.
+    Le leader vérifie périodiquement /livez des autres instances: un pair injoignable
+    CLUSTER_PEER_FAILURES fois de suite sort de l'anneau et ses APIs sont reprises.
+    """
+    
+    def __init__(self, node_id):
+        self.node_id = node_id
+        self.members = {}  # {id: url}
+        self.alive = set()
+        self.version = 0
+        self._failures = {}
+        self._members_mtime = None
+        self._lock = threading.Lock()
+        self._ring = HashRing([node_id], CLUSTER_VNODES) if node_id else None
+        if node_id:
+            self.load_members()
+            self._rebuild(set(self.members))
+    
+    @property
+    def enabled(self):
+        return bool(self.node_id)
+    
+    def load_members(self):
+        """
+        Charge la liste des instances
+        
+        Returns:
+            True si elle a changé
+        """
+        members = {}
+        if CLUSTER_MEMBERS_FILE:
+            try:
+                mtime = os.stat(CLUSTER_MEMBERS_FILE).st_mtime_ns
+                if mtime == self._members_mtime:
+                    return False
+                with open(CLUSTER_MEMBERS_FILE, encoding='utf-8') as f:
+                    data = json.load(f)
+                data = data.get('members', data) if isinstance(data, dict) else data
+                if isinstance(data, list):
+                    data = {member['id']: member.get('url') for member in data}
+                members = {str(node): (url or '').rstrip('/') for node, url in data.items()}
+                self._members_mtime = mtime
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.error(f"Fichier des membres du cluster invalide ({CLUSTER_MEMBERS_FILE}): {str(e)}")
+                return False
+        else:
+            for peer in CLUSTER_PEERS.split(','):
+                if '=' in peer:
+                    node, url = peer.split('=', 1)
+                    members[node.strip()] = url.strip().rstrip('/')
+        members.setdefault(self.node_id, '')
+        if members == self.members:
+            return False
+        self.members = members
+        self._failures = {node: self._failures.get(node, 0) for node in members}
+        return True
+    
+    def _rebuild(self, alive):
+        alive.add(self.node_id)
+        with self._lock:
+            self.alive = alive
+            self._ring = HashRing(sorted(alive), CLUSTER_VNODES)
+            self.version += 1
+    
+    def owns(self, url):
+        """
+        Indique si cette instance doit monitorer l'API (toujours vrai sans sharding)
+        """
+        if not self.enabled:
+            return True
+        return self._ring.owner(url.strip()) == self.node_id
+    
+    def owner(self, url):
+        return self._ring.owner(url.strip()) if self.enabled else None
+    
+    def refresh(self):
+        """
+        Recharge les membres et vérifie les pairs
+        
+        Returns:
+            True si l'anneau a changé
+        """
+        changed = self.load_members()
+        for node, url in self.members.items():
+            if node == self.node_id:
+                continue
+            try:
+                response = http_pool.get(url).get(f"{url}/livez", timeout=CLUSTER_PEER_TIMEOUT)
+                reachable = response.status_code == 200
+            except requests.exceptions.RequestException:
+                reachable = False
+            self._failures[node] = 0 if reachable else self._failures.get(node, 0) + 1
+        
+        alive = {node for node in self.members if self._failures.get(node, 0) < CLUSTER_PEER_FAILURES}
+        if changed or alive | {self.node_id} != self.alive:
+            lost, joined = self.alive - alive, alive - self.alive
+            self._rebuild(alive)
+            logger.info(f"Anneau du cluster mis à jour: {len(self.alive)} instance(s) active(s)"
+                        + (f", perdues: {', '.join(sorted(lost))}" if lost else "")
+                        + (f", nouvelles: {', '.join(sorted(joined))}" if joined else ""))
+            return True
+        return False
+    
+    def stats(self):
+        return {
+            "node_id": self.node_id,
+            "ring_version": self.version,
+            "members": {node: {"url": url, "alive": node in self.alive} for node, url in self.members.items()}
+        }
+
+CRON_FIELDS = (('minute', 0, 59), ('heure', 0, 23), ('jour', 1, 31), ('mois', 1, 12), ('jour de la semaine', 0, 7))
+
+@lru_cache(maxsize=256)
+def parse_cron(expression):
+    """
+    Parse une expression cron à 5 champs (minute heure jour mois jour-de-semaine),
+    avec *, listes (1,15), plages (1-5) et pas (*/10, 8-18/2). Dimanche vaut 0 ou 7.
+    
+    Returns:
+        Tuple de 5 ensembles de valeurs, plus deux booléens (jour du mois et jour
+        de la semaine restreints): si les deux le sont, l'un ou l'autre suffit (comme cron)
+    """
+    parts = expression.split()
+    if len(parts) != 5:
+        raise ValueError(f"Expression cron invalide (5 champs attendus): {expression}")
+    fields = []
+    for part, (label, low, high) in zip(parts, CRON_FIELDS):
+        values = set()
+        for item in part.split(','):
+            value_range, _, step = item.partition('/')
+            if value_range == '*':
+                first, last = low, high
+            elif '-' in value_range:
+                first, last = (int(value) for value in value_range.split('-', 1))
+            else:
+                first = last = int(value_range)
+            step = int(step) if step else 1
+            if first < low or last > high or first > last or step < 1:
+                raise ValueError(f"Champ {label} invalide dans l'expression cron: {item}")
+            values.update(range(first, last + 1, step))
+        fields.append(frozenset(values))
+    if 7 in fields[4]:
+        fields[4] = fields[4] | {0}
+    return (*fields, parts[2] != '*', parts[4] != '*')
+
+def cron_occurrences(expression, start, end):
+    """
+    Instants de déclenchement (timestamps, heure locale) d'une expression cron entre start et end
+    """
+    minutes, hours, days, months, weekdays, day_restricted, weekday_restricted = parse_cron(expression)
+    day = datetime.fromtimestamp(start).replace(hour=0, minute=0, second=0, microsecond=0)
+    while day.timestamp() < end:
+        cron_weekday = (day.weekday() + 1) % 7
+        if day_restricted and weekday_restricted:
+            day_matches = day.day in days or cron_weekday in weekdays
+        else:
+            day_matches = day.day in days and cron_weekday in weekdays
+        if day.month in months and day_matches:
+            for hour in sorted(hours):
+                for minute in sorted(minutes):
+                    timestamp = day.replace(hour=hour, minute=minute).timestamp()
+                    if start <= timestamp < end:
+                        yield timestamp
+        day += timedelta(days=1)
+
+def parse_window_time(value):
+    """
+    Date d'une fenêtre de maintenance: ISO 8601 (heure locale si sans fuseau) ou timestamp
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(str(value)).timestamp()
+
+def normalize_window(config):
+    """
+    Valide et normalise une fenêtre de maintenance
+    
+    Champs: api, tag ou glob (au moins un; api désigne un nom ou une URL, glob s'applique
+    aux deux), puis start/end (fenêtre ponctuelle) ou cron + duration en secondes
+    (fenêtre récurrente, éventuellement bornée par start/end), reason
+    """
+    if not isinstance(config, dict):
+        raise ValueError(f"Fenêtre de maintenance invalide: {config}")
+    window = {'id': str(config.get('id') or uuid.uuid4().hex[:12])}
+    for key in ('api', 'tag', 'glob'):
+        if config.get(key):
+            window[key] = str(config[key])
+    if not any(key in window for key in ('api', 'tag', 'glob')):
+        raise ValueError("Fenêtre de maintenance sans cible (api, tag ou glob)")
+    
+    for key in ('start', 'end'):
+        if config.get(key) is not None:
+            window[key] = datetime.fromtimestamp(parse_window_time(config[key])).isoformat()
+    if config.get('cron'):
+        parse_cron(str(config['cron']))
+        window['cron'] = str(config['cron'])
+        duration = float(config.get('duration') or 0)
+        if duration <= 0:
+            raise ValueError("Une fenêtre récurrente (cron) exige une durée positive (duration, secondes)")
+        window['duration'] = duration
+    elif 'start' not in window or 'end' not in window:
+        raise ValueError("Une fenêtre ponctuelle exige start et end")
+    if 'start' in window and 'end' in window and parse_window_time(window['start']) >= parse_window_time(window['end']):
+        raise ValueError("La fin de la fenêtre doit suivre son début")
+    if config.get('reason'):
+        window['reason'] = str(config['reason'])
+    window['created_at'] = str(config.get('created_at') or datetime.now().isoformat(timespec='seconds'))
+    return window
+
+class MaintenanceWindows:
+    """
+    Fenêtres de maintenance, persistées dans MAINTENANCE_FILE (partagé entre workers,
+    rechargé à chaud) et indexées par API: chaque fenêtre est résolue vers les URLs
+    qu'elle couvre, ses occurrences sur MAINTENANCE_HORIZON sont fusionnées en
+    intervalles disjoints triés. "Cette API est-elle en maintenance ?" se résout
+    alors par une recherche dichotomique, quel que soit le nombre de fenêtres.
+    L'index est reconstruit quand les fenêtres ou les APIs changent, et à mi-horizon.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.windows = []
+        self.version = 0
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._index = {}  # {url: (débuts, fins)}
+        self._index_key = None
+        self._rebuild_at = 0.0
+        self.reload(force=True)
+    
+    def reload(self, force=False):
+        """
+        Recharge le fichier s'il a changé (vérifié au plus une fois par TARGETS_RELOAD_INTERVAL secondes)
+        """
+        if not self.path:
+            return
+        now = time.monotonic()
+        if not force and now - self._checked_at < TARGETS_RELOAD_INTERVAL:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime == self._mtime and not force:
+                return
+            windows = []
+            if mtime is not None:
+                try:
+                    with open(self.path, encoding='utf-8') as f:
+                        data = json.load(f)
+                    windows = [normalize_window(window) for window in data.get('windows', [])]
+                except (OSError, ValueError, AttributeError) as e:
+                    logger.error(f"Fichier des fenêtres de maintenance invalide ({self.path}), fenêtres conservées: {str(e)}")
+                    return
+            self._mtime = mtime
+            self.windows = windows
+            self.version += 1
+    
+    def save(self, windows):
+        """
+        Écrit les fenêtres dans MAINTENANCE_FILE (écriture atomique) puis les recharge
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'windows': windows}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.reload(force=True)
+    
+    def _update(self, change):
+        """
+        Modifie les fenêtres sous un verrou exclusif partagé entre workers (fichier .lock
+        à côté de MAINTENANCE_FILE): le fichier est relu avant d'appliquer change(fenêtres),
+        pour qu'une écriture d'un autre worker ne soit pas écrasée
+        
+        Returns:
+            Les nouvelles fenêtres, ou None si change n'a rien modifié
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._write_lock, open(f"{self.path}.lock", 'a', encoding='utf-8') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            self.reload(force=True)
+            with self._lock:
+                windows = change(list(self.windows))
+            if windows is not None:
+                self.save(windows)
+            return windows
+    
+    def add(self, window):
+        self._update(lambda windows: [existing for existing in windows if existing['id'] != window['id']] + [window])
+    
+    def remove(self, window_id):
+        """
+        Returns:
+            True si la fenêtre existait
+        """
+        def without(windows):
+            remaining = [window for window in windows if window['id'] != window_id]
+            return remaining if len(remaining) != len(windows) else None
+        return self._update(without) is not None
+    
+    @staticmethod
+    def matches(window, api):
+        url = api['url'].strip()
+        if 'api' in window and window['api'] not in (api['name'], url):
+            return False
+        if 'tag' in window and window['tag'] not in api.get('tags', ()):
+            return False
+        if 'glob' in window and not (fnmatch.fnmatchcase(api['name'], window['glob'])
+                                     or fnmatch.fnmatchcase(url, window['glob'])):
+            return False
+        return True
+    
+    @staticmethod
+    def occurrences(window, start, end):
+        """
+        Intervalles (début, fin) de la fenêtre qui chevauchent [start, end]
+        """
+        bound_start = parse_window_time(window['start']) if 'start' in window else None
+        bound_end = parse_window_time(window['end']) if 'end' in window else None
+        if 'cron' not in window:
+            if bound_start < end and bound_end > start:
+                yield bound_start, bound_end
+            return
+        duration = window['duration']
+        for occurrence in cron_occurrences(window['cron'], start - duration, end):
+            interval_start, interval_end = occurrence, occurrence + duration
+            if bound_start is not None:
+                interval_start = max(interval_start, bound_start)
+            if bound_end is not None:
+                interval_end = min(interval_end, bound_end)
+            if interval_start < interval_end and interval_end > start:
+                yield interval_start, interval_end
+    
+    def _build_index(self, now):
+        # APIs candidates par nom, URL et tag: seules les fenêtres glob parcourent toutes les APIs
+        by_key, by_tag = {}, {}
+        for api in MONITORED_APIS:
+            by_key.setdefault(api['name'], []).append(api)
+            by_key.setdefault(api['url'].strip(), []).append(api)
+            for tag in api.get('tags', ()):
+                by_tag.setdefault(tag, []).append(api)
+        
+        intervals = {}
+        schedules = {}  # occurrences calculées une fois par planification identique
+        for window in self.windows:
+            if 'api' in window:
+                candidates = by_key.get(window['api'], ())
+            elif 'tag' in window:
+                candidates = by_tag.get(window['tag'], ())
+            else:
+                candidates = MONITORED_APIS
+            urls = {api['url'].strip() for api in candidates if self.matches(window, api)}
+            if not urls:
+                continue
+            schedule = tuple(window.get(key) for key in ('start', 'end', 'cron', 'duration'))
+            if schedule not in schedules:
+                schedules[schedule] = list(self.occurrences(window, now, now + MAINTENANCE_HORIZON))
+            for url in urls:
+                intervals.setdefault(url, []).extend(schedules[schedule])
+        index = {}
+        for url, spans in intervals.items():
+            spans.sort()
+            starts, ends = [], []
+            for start, end in spans:
+                if ends and start <= ends[-1]:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            index[url] = (starts, ends)
+        return index
+    
+    def _current_index(self, now):
+        key = (self.version, targets_state['version'])
+        if key != self._index_key or now >= self._rebuild_at:
+            with self._lock:
+                if key != self._index_key or now >= self._rebuild_at:
+                    self._index = self._build_index(now)
+                    self._index_key = key
+                    self._rebuild_at = now + MAINTENANCE_HORIZON / 2
+        return self._index
+    
+    def silenced(self, url, now=None):
+        """
+        Indique si l'API est couverte par une fenêtre de maintenance en cours
+        
+        Returns:
+            Fin de la fenêtre (timestamp) ou None
+        """
+        if not self.path:
+            return None
+        self.reload()
+        now = time.time() if now is None else now
+        spans = self._current_index(now).get(url.strip())
+        if spans is None:
+            return None
+        starts, ends = spans
+        position = bisect.bisect_right(starts, now) - 1
+        if position >= 0 and now < ends[position]:
+            return ends[position]
+        return None
+    
+    def describe(self, now=None):
+        """
+        Fenêtres avec leur prochaine occurrence et les APIs couvertes
+        """
+        now = time.time() if now is None else now
+        result = []
+        for window in self.windows:
+            upcoming = next(self.occurrences(window, now, now + MAINTENANCE_HORIZON), None)
+            result.append(dict(
+                window,
+                active=upcoming is not None and upcoming[0] <= now,
+                next_start=datetime.fromtimestamp(upcoming[0]).isoformat(timespec='seconds') if upcoming else None,
+                next_end=datetime.fromtimestamp(upcoming[1]).isoformat(timespec='seconds') if upcoming else None,
+                apis=[api['name'] for api in MONITORED_APIS if self.matches(window, api)]
+            ))
+        return result
+    
+    def stats(self):
+        now = time.time()
+        return {
+            "windows": len(self.windows),
+            "silenced_apis": sum(1 for url in self._current_index(now) if self.silenced(url, now))
+        }
+
+http_pool = HttpSessionPool(HTTP_POOL_MAXSIZE, HTTP_KEEP_ALIVE)
+cluster = ClusterMembership(CLUSTER_NODE_ID)
+status_store = StatusStore(STATUS_STORE_PATH, STATUS_STORE_CAPACITY)
+probe_scheduler = ProbeScheduler()
+probes_in_flight = 0
+state_journal = StateJournal(STATE_JOURNAL_PATH)
+history_store = HistoryStore(HISTORY_STORE_PATH, STATUS_STORE_CAPACITY, HISTORY_SAMPLES, HISTORY_MINUTES, HISTORY_HOURS)
+event_store = EventStore(EVENT_STORE_PATH, EVENT_BUFFER_SIZE)
+maintenance = MaintenanceWindows(MAINTENANCE_FILE)
+jira_session = None
+jira_headers = None
+
+# Headers pour l'authentification Jira
+def get_jira_headers():
+    # Utiliser l'authentification Basic avec username:password (calculée une seule fois)
+    global jira_headers
+    if jira_headers is None:
+        credentials = f"{JIRA_USERNAME}:{JIRA_API_TOKEN}"
+        encoded_credentials = base64.b64encode(credentials.encode()).decode()
+        jira_headers = {
+            'Authorization': f'Basic {encoded_credentials}',
+            'Content-Type': 'application/json'
+        }
+    return jira_headers
+
+def get_jira_session():
+    """
+    Retourne la session dédiée à Jira, avec les headers d'authentification pré-calculés
+    """
+    global jira_session
+    if jira_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(get_jira_headers())
+        session.verify = False  # Certificats auto-signés
+        jira_session = session
+    return jira_session
+
+PROBE_TYPES = {}  # {type: fonction(api, timeout) -> (is_healthy, message, http_code)}
+PROBE_SCHEMES = {'tcp': 'tcp', 'dns': 'dns', 'tls': 'tls'}  # type déduit du schéma de l'URL
+ACTUATOR_STATUS_PATTERN = re.compile(rb'"status"\s*:\s*"([^"]*)"')
+JSON_PATH_TOKEN = re.compile(r'\.([^.\[\]]+)|\[(\d+)\]')
+tls_context = ssl.create_default_context()
+
+def register_probe(probe_type):
+    """
+    Enregistre un type de probe (décorateur).
+    La fonction reçoit la configuration de l'API et le timeout et retourne
+    (is_healthy, message, http_code). Les exceptions réseau sont traduites
+    par run_health_check.
+    """
+    def decorator(func):
+        PROBE_TYPES[probe_type] = func
+        return func
+    return decorator
+
+@lru_cache(maxsize=256)
+def parse_json_path(path):
+    """
+    Compile un chemin JSONPath simple ($.a.b[0].c) en tuple de clés/index
+    """
+    expression = path[1:] if path.startswith('$') else '.' + path
+    tokens, position = [], 0
+    for match in JSON_PATH_TOKEN.finditer(expression):
+        if match.start() != position:
+            break
+        tokens.append(match.group(1) if match.group(1) is not None else int(match.group(2)))
+        position = match.end()
+    if position != len(expression):
+        raise ValueError(f"JSONPath non supporté: {path} (format: $.cle.sous_cle[0])")
+    return tuple(tokens)
+
+def extract_json_path(data, path):
+    """
+    Valeur désignée par un chemin JSONPath simple (None si absente)
+    """
+    for token in parse_json_path(path):
+        try:
+            data = data[token]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return data
+
+def read_capped_body(response, limit):
+    """
+    Lit au plus limit octets d'une réponse en streaming
+    
+    Returns:
+        (body, truncated) - une réponse tronquée n'est pas lue au-delà de la limite
+    """
+    chunks, size = [], 0
+    for chunk in response.iter_content(chunk_size=8192):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            return b''.join(chunks)[:limit], True
+    return b''.join(chunks), False
+
+def probe_address(api, default_port):
+    """
+    (hôte, port) d'une API, l'URL pouvant être donnée sans schéma (hôte:port)
+    """
+    url = api['url'].strip()
+    parsed = urlparse(url if '://' in url else f"//{url}")
+    return parsed.hostname, parsed.port or default_port
+
+@register_probe('http')
+def http_probe(api, timeout):
+    """
+    Requête HTTP sur le chemin du health check (défaut: /actuator/health).
+    Le corps est lu en streaming et plafonné à PROBE_MAX_BODY_BYTES.
+    """
+    url = api['url'].strip()
+    health_path = api.get('health_path', DEFAULT_HEALTH_PATH)
+    if health_path and not url.endswith(health_path):
+        url = url.rstrip('/') + '/' + health_path.lstrip('/')
+    
+    with http_pool.get(url).request(api.get('method', 'GET'), url, timeout=timeout, stream=True) as response:
+        body, truncated = read_capped_body(response, PROBE_MAX_BODY_BYTES)
+    http_code = response.status_code
+    
+    if http_code not in api.get('expected_status', (200,)):
+        return False, f"HTTP {http_code}", http_code
+    
+    json_path = api.get('json_path')
+    expected_value = api.get('expected_value', 'UP')
+    if json_path is None:
+        # Statut Spring Boot Actuator: une réponse trop volumineuse est lue sur son début seulement
+        if truncated:
+            match = ACTUATOR_STATUS_PATTERN.search(body)
+            if match is None:
+                return True, "API UP (réponse tronquée)", http_code
+            status = match.group(1).decode('utf-8', 'replace')
+        else:
+            try:
+                health_data = json.loads(body)
+            except ValueError:
+                # Si ce n'est pas du JSON, considérer que c'est OK si le code HTTP est attendu
+                return True, "API UP (non-JSON response)", http_code
+            status = health_data.get('status') if isinstance(health_data, dict) else None
+    else:
+        if truncated:
+            return False, f"Réponse trop volumineuse (> {PROBE_MAX_BODY_BYTES} octets) pour {json_path}", http_code
+        try:
+            status = extract_json_path(json.loads(body), json_path)
+        except ValueError:
+            return False, "Réponse non JSON", http_code
+    
+    if status is not None and str(status) == expected_value:
+        return True, "API UP", http_code
+    return False, f"API DOWN - Status: {status}", http_code
+
+@register_probe('tcp')
+def tcp_probe(api, timeout):
+    """
+    Ouverture d'une connexion TCP (tcp://hôte:port)
+    """
+    host, port = probe_address(api, None)
+    if port is None:
+        raise ValueError("Port manquant (format: tcp://hôte:port)")
+    with socket.create_connection((host, port), timeout=timeout):
+        pass
+    return True, f"Port {port} ouvert", 0
+
+@register_probe('dns')
+def dns_probe(api, timeout):
+    """
+    Résolution DNS du nom d'hôte (dns://hôte).
+    Le timeout est celui du résolveur système (getaddrinfo n'en accepte pas).
+    """
+    host, _ = probe_address(api, None)
+    try:
+        infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    except socket.gaierror as e:
+        return False, f"Résolution DNS impossible: {e.strerror}", 0
+    addresses = sorted({info[4][0] for info in infos})
+    return True, f"{host} résolu ({', '.join(addresses[:3])})", 0
+
+@register_probe('tls')
+def tls_probe(api, timeout):
+    """
+    Validité et date d'expiration du certificat TLS (tls://hôte[:port], port 443 par défaut)
+    """
+    host, port = probe_address(api, 443)
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        with tls_context.wrap_socket(sock, server_hostname=host) as tls_sock:
+            certificate = tls_sock.getpeercert()
+    
+    days_left = (ssl.cert_time_to_seconds(certificate['notAfter']) - time.time()) / 86400
+    if days_left < api.get('min_days', TLS_EXPIRY_MIN_DAYS):
+        return False, f"Certificat expirant dans {days_left:.0f} jour(s) ({certificate['notAfter']})", 0
+    return True, f"Certificat valide encore {days_left:.0f} jour(s)", 0
+
+def run_health_check(api, timeout=None):
+    """
+    Effectue le health check d'une API selon son type de probe et mesure sa durée
+    (timeout: timeout adaptatif calculé par le scheduler, sinon celui de l'API)
+    
+    Returns:
+        (is_healthy, message, http_code, latency_ms) - http_code vaut 0 sans réponse HTTP
+    """
+    start = time.perf_counter()
+    http_code = 0
+    if not api['url'].strip():
+        return False, "URL vide", 0, 0.0
+    
+    try:
+        probe = PROBE_TYPES[api.get('type', 'http')]
+        is_healthy, message, http_code = probe(api, timeout or api.get('timeout') or TIMEOUT)
+    except (requests.exceptions.Timeout, socket.timeout):
+        is_healthy, message = False, "Timeout"
+    except ssl.SSLCertVerificationError as e:
+        is_healthy, message = False, f"Certificat invalide: {e.verify_message}"
+    except ssl.SSLError as e:
+        is_healthy, message = False, f"Erreur TLS: {e.reason or str(e)}"
+    except (requests.exceptions.ConnectionError, ConnectionError):
+        is_healthy, message = False, "Connection Error"
+    except Exception as e:
+        is_healthy, message = False, f"Error: {str(e)}"
+    
+    return is_healthy, message, http_code, (time.perf_counter() - start) * 1000
+
+def check_api_health(api_url):
+    """
+    Vérifie la santé d'une API en effectuant un health check
+    """
+    is_healthy, message, _, _ = run_health_check({'url': api_url})
+    return is_healthy, message
+
+# Chargé après l'enregistrement des types de probe, utilisés pour valider la configuration
+MONITORED_APIS = load_monitored_apis()
+
+DEFAULT_TICKET_TEMPLATES = {
+    'description': (
+        "${message}\n\n"
+        "API: ${api_name}\n"
+        "URL: ${api_url}\n"
+        "Erreur: ${error}\n"
+        "Première erreur: ${first_failure}\n"
+        "Échecs consécutifs: ${failure_count}\n\n"
+        "Derniers health checks:\n${samples}"
+    ),
+    'recovery': (
+        "✅ L'API ${api_name} (${api_url}) répond de nouveau aux health checks "
+        "après ${duration} d'indisponibilité (première erreur: ${first_failure})."
+    )
+}
+TICKET_TEMPLATE_FIELDS = {
+    'description': {'message', 'prefix', 'api_name', 'api_url', 'error', 'first_failure', 'failure_count',
+                    'samples', 'detected_at'},
+    'recovery': {'api_name', 'api_url', 'first_failure', 'recovered_at', 'duration'}
+}
+
+def compile_ticket_templates():
+    """
+    Compile les gabarits de tickets (une fois, au démarrage). Un gabarit invalide
+    est remplacé par le gabarit par défaut, un champ inconnu est signalé.
+    """
+    configured = {'description': TICKET_DESCRIPTION_TEMPLATE, 'recovery': TICKET_RECOVERY_TEMPLATE}
+    templates = {}
+    for name, text in configured.items():
+        template = string.Template(text.replace('\\n', '\n') or DEFAULT_TICKET_TEMPLATES[name])
+        if not template.is_valid():
+            logger.error(f"Gabarit de ticket '{name}' invalide, gabarit par défaut utilisé")
+            template = string.Template(DEFAULT_TICKET_TEMPLATES[name])
+        unknown = set(template.get_identifiers()) - TICKET_TEMPLATE_FIELDS[name]
+        if unknown:
+            logger.warning(f"Gabarit de ticket '{name}': champ(s) inconnu(s) {', '.join(sorted(unknown))}")
+        templates[name] = template
+    return templates
+
+TICKET_TEMPLATES = compile_ticket_templates()
+
+def format_duration(start, end):
+    """
+    Durée lisible entre deux dates (ou timestamps)
+    """
+    if start is None or end is None:
+        return "durée inconnue"
+    if isinstance(start, datetime):
+        start = start.timestamp()
+    if isinstance(end, datetime):
+        end = end.timestamp()
+    seconds = max(0, int(end - start))
+    if seconds < 60:
+        return f"{seconds} s"
+    if seconds < 3600:
+        return f"{seconds // 60} min {seconds % 60:02d} s"
+    if seconds < 86400:
+        return f"{seconds // 3600} h {seconds % 3600 // 60:02d} min"
+    return f"{seconds // 86400} j {seconds % 86400 // 3600} h"
+
+def format_time(value):
+    if value is None:
+        return "inconnue"
+    if not isinstance(value, datetime):
+        value = datetime.fromtimestamp(value)
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+def ticket_evidence(api_url):
+    """
+    Éléments de diagnostic d'une API en panne, lus localement (état et historique
+    mappé en mémoire, sans appel réseau): premier échec, nombre d'échecs, derniers health checks
+    """
+    with api_status_lock:
+        state = api_status.get(api_url)
+        failing_since = state.failing_since if state else None
+        failure_count = state.consecutive_failures if state else 0
+    
+    now = time.time()
+    samples = history_store.query(api_url, now - 3600, now) or []
+    lines = []
+    for sample in samples[-TICKET_LATENCY_SAMPLES:] if TICKET_LATENCY_SAMPLES > 0 else []:
+        latency = f"{sample['latency_ms']:.0f} ms" if sample['latency_ms'] is not None else "-"
+        code = f"HTTP {sample['http_code']}" if sample['http_code'] else "sans réponse"
+        lines.append(f"- {format_time(sample['timestamp'])} {'OK' if sample['healthy'] else 'KO'} "
+                     f"{code}, {latency}: {sample['message']}")
+    return {
+        'first_failure': format_time(failing_since),
+        'failure_count': failure_count,
+        'samples': "\n".join(lines) or "- aucun health check récent"
+    }
+
+def render_recovery_comment(api_name, api_url, failing_since=None, recovered_at=None):
+    """
+    Commentaire de retour d'une API, avec la durée de la panne
+    """
+    return TICKET_TEMPLATES['recovery'].safe_substitute(
+        api_name=api_name,
+        api_url=api_url,
+        first_failure=format_time(failing_since),
+        recovered_at=format_time(recovered_at),
+        duration=format_duration(failing_since, recovered_at)
+    )
+
+def render_ticket_description(api_name, api_url='', error_message='', **kwargs):
+    """
+    Description d'une API DOWN, avec les éléments de diagnostic déjà connus localement
+    """
+    return TICKET_TEMPLATES['description'].safe_substitute(
+        message=TICKET_DESCRIPTION_MESSAGE,
+        prefix=TICKET_SUMMARY_PREFIX,
+        api_name=api_name,
+        api_url=api_url,
+        error=error_message,
+        detected_at=format_time(datetime.now()),
+        **ticket_evidence(api_url)
+    )
+
+def build_ticket_fields(ticket_type, **kwargs):
+    """
+    Construit les champs Jira d'un ticket
+    
+    Args:
+        ticket_type: 'api_down' ou 'incident'
+        **kwargs: Données spécifiques (api_url, api_name, error_message),
+                  ou pour un incident: apis (liste de ces données) et reason
+    """
+    if ticket_type == 'incident':
+        # Incident parent regroupant les APIs tombées ensemble
+        apis = kwargs['apis']
+        affected = "\n".join(
+            f"- {api['api_name']} ({api['api_url']}): {api['error_message']} "
+            f"(première erreur: {ticket_evidence(api['api_url'])['first_failure']})"
+            for api in apis
+        )
+        
+        return {
+            "project": {"key": JIRA_PROJECT_KEY},
+            "summary": f"{TICKET_SUMMARY_PREFIX} - Incident corrélé: {len(apis)} APIs ({kwargs['reason']})",
+            "description": f"{TICKET_DESCRIPTION_MESSAGE}\n\nPanne commune ({kwargs['reason']}), APIs impactées:\n{affected}",
+            "issuetype": {"name": JIRA_ISSUE_TYPE}
+        }
+    
+    if ticket_type == 'api_down':
+        # Le résumé reste fixe: il sert à retrouver les tickets ouverts (déduplication)
+        return {
+            "project": {"key": JIRA_PROJECT_KEY},
+            "summary": f"{TICKET_SUMMARY_PREFIX} - {kwargs['api_name']}",
+            "description": render_ticket_description(**kwargs),
+            "issuetype": {"name": JIRA_ISSUE_TYPE}
+        }
+    
+    raise ValueError(f"Type de ticket non supporté: {ticket_type}. Types supportés: 'api_down', 'incident'.")
+
+def get_retry_delay(response, attempt):
+    """
+    Délai avant une nouvelle tentative: Retry-After si fourni par Jira (respecté
+    au-delà de JIRA_BACKOFF_MAX, borné par JIRA_RETRY_AFTER_MAX), sinon backoff
+    exponentiel borné avec jitter
+    """
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            return min(JIRA_RETRY_AFTER_MAX, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                return min(JIRA_RETRY_AFTER_MAX, max(0.0, delay))
+            except (TypeError, ValueError):
+                pass
+    delay = min(JIRA_BACKOFF_MAX, JIRA_BACKOFF_BASE * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.0)
+
+JIRA_ISSUE_KEY_PATTERN = re.compile(r'/[A-Z][A-Z0-9_]*-\d+')
+JIRA_IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+JIRA_CREATED_LOOKBACK = '-30m'  # recherche des tickets créés malgré une réponse perdue
+
+class JiraOutcomeUnknown(requests.exceptions.RequestException):
+    """
+    Appel non idempotent (POST) dont on ne sait pas s'il a été traité par Jira
+    (timeout de lecture, connexion coupée, 502/504): il n'est pas rejoué
+    """
+
+def jira_request_sent(error):
+    """
+    Indique si une requête en erreur réseau a pu être reçue par Jira
+    (faux seulement si la connexion n'a jamais été établie)
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return False
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return not isinstance(reason, urllib3.exceptions.ConnectTimeoutError)
+
+def jira_request(method, path, on_retry=None, **kwargs):
+    """
+    Appel à l'API Jira avec timeout, et nouvelles tentatives sur 429/5xx
+    ou erreur réseau (backoff exponentiel borné, respect de Retry-After).
+    Un POST n'est rejoué que si Jira ne l'a pas traité (429, 503, connexion
+    impossible); sinon JiraOutcomeUnknown est levée pour éviter les doublons.
+    """
+    url = f"{JIRA_URL}{path}"
+    endpoint = JIRA_ISSUE_KEY_PATTERN.sub('{key}', path.split('?', 1)[0])
+    idempotent = method.upper() in JIRA_IDEMPOTENT_METHODS
+    attempt = 0
+    while True:
+        response = None
+        start = time.perf_counter()
+        try:
+            response = get_jira_session().request(method, url, timeout=JIRA_TIMEOUT, **kwargs)
+            metrics.observe('jira_webhook_jira_request_duration_seconds', (endpoint,), time.perf_counter() - start)
+            if response.status_code >= 400:
+                metrics.inc('jira_webhook_jira_errors_total', (endpoint, str(response.status_code)))
+            if response.status_code != 429 and response.status_code < 500:
+                return response
+            if not idempotent and response.status_code in (502, 504):
+                raise JiraOutcomeUnknown(f"Jira {method} {path}: HTTP {response.status_code}, ticket peut-être créé")
+            if not idempotent and response.status_code not in (429, 503):
+                return response
+            error = f"HTTP {response.status_code}"
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            metrics.observe('jira_webhook_jira_request_duration_seconds', (endpoint,), time.perf_counter() - start)
+            metrics.inc('jira_webhook_jira_errors_total', (endpoint, type(e).__name__))
+            if not idempotent and jira_request_sent(e):
+                raise JiraOutcomeUnknown(f"Jira {method} {path}: {str(e)}") from e
+            error = str(e)
+        
+        if attempt >= JIRA_MAX_RETRIES:
+            if response is not None:
+                return response
+            raise requests.exceptions.RetryError(f"Jira injoignable après {attempt + 1} tentative(s): {error}")
+        
+        delay = get_retry_delay(response, attempt)
+        attempt += 1
+        if on_retry:
+            on_retry()
+        logger.warning(f"Jira {method} {path}: {error}, nouvelle tentative {attempt}/{JIRA_MAX_RETRIES} dans {delay:.1f}s")
+        time.sleep(delay)
+
+def find_created_tickets(summaries, on_retry=None):
+    """
+    Retrouve des tickets créés récemment à partir de leur résumé, après un
+    appel de création dont la réponse a été perdue (JiraOutcomeUnknown)
+    
+    Returns:
+        {résumé: clé du ticket}, le plus récent ticket par résumé
+    """
+    summaries = set(summaries)
+    response = jira_request('GET', "/rest/api/2/search", on_retry=on_retry, params={
+        'jql': f'project = "{JIRA_PROJECT_KEY}" AND created >= "{JIRA_CREATED_LOOKBACK}" ORDER BY created DESC',
+        'fields': 'summary',
+        'maxResults': 100
+    })
+    if response.status_code != 200:
+        raise requests.exceptions.RequestException(f"Erreur Jira: {response.status_code} - {response.text}")
+    found = {}
+    for issue in response.json().get('issues', []):
+        summary = issue.get('fields', {}).get('summary', '')
+        if summary in summaries:
+            found.setdefault(summary, issue['key'])
+    return found
+
+def create_jira_ticket(ticket_type, on_retry=None, **kwargs):
+    """
+    Crée un ticket Jira pour les APIs down
+    
+    Args:
+        ticket_type: 'api_down' ou 'incident'
+        **kwargs: Données spécifiques (voir build_ticket_fields)
+    """
+    try:
+        fields = build_ticket_fields(ticket_type, **kwargs)
+        
+        # Envoi de la requête à Jira
+        jira_ticket = {"fields": fields}
+        try:
+            response = jira_request('POST', "/rest/api/2/issue", on_retry=on_retry, json=jira_ticket)
+        except JiraOutcomeUnknown as e:
+            # Réponse perdue: le ticket est recherché plutôt que recréé
+            ticket_key = find_created_tickets([fields['summary']], on_retry=on_retry).get(fields['summary'])
+            if ticket_key is None:
+                raise
+            logger.warning(f"Ticket Jira {ticket_key} retrouvé après une réponse perdue ({str(e)})")
+            return {"success": True, "ticket_key": ticket_key, "ticket_url": f"{JIRA_URL}/browse/{ticket_key}"}
+        
+        if response.status_code == 201:
+            ticket_data = response.json()
+            logger.info(f"Ticket Jira créé ({ticket_type}): {ticket_data['key']}")
+            return {
+                "success": True,
+                "ticket_key": ticket_data['key'],
+                "ticket_url": f"{JIRA_URL}/browse/{ticket_data['key']}"
+            }
+        else:
+            logger.error(f"Erreur création ticket Jira: {response.status_code} - {response.text}")
+            return {
+                "success": False,
+                "error": f"Erreur Jira: {response.status_code} - {response.text}"
+            }
+            
+    except Exception as e:
+        logger.error(f"Erreur création ticket: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+def create_jira_tickets_bulk(tickets, on_retry=None):
+    """
+    Crée plusieurs tickets en un seul appel à /rest/api/2/issue/bulk
+    
+    Args:
+        tickets: liste de (ticket_type, kwargs)
+    
+    Returns:
+        Liste de résultats, dans l'ordre des tickets
+    """
+    try:
+        issue_updates = [{"fields": build_ticket_fields(ticket_type, **kwargs)} for ticket_type, kwargs in tickets]
+        try:
+            response = jira_request('POST', "/rest/api/2/issue/bulk", on_retry=on_retry, json={"issueUpdates": issue_updates})
+        except JiraOutcomeUnknown as e:
+            # Réponse perdue: les tickets créés sont recherchés, les autres seront redemandés
+            summaries = [update['fields']['summary'] for update in issue_updates]
+            found = find_created_tickets(summaries, on_retry=on_retry)
+            logger.warning(f"Tickets Jira retrouvés après une réponse perdue: {len(found)}/{len(tickets)} ({str(e)})")
+            return [
+                {"success": True, "ticket_key": found[summary], "ticket_url": f"{JIRA_URL}/browse/{found[summary]}"}
+                if summary in found else {"success": False, "error": str(e)}
+                for summary in summaries
+            ]
+        
+        if response.status_code not in (200, 201, 400):
+            error = f"Erreur Jira: {response.status_code} - {response.text}"
+            logger.error(f"Erreur création tickets Jira (bulk): {error}")
+            return [{"success": False, "error": error}] * len(tickets)
+        
+        data = response.json()
+        # Les tickets créés sont renvoyés dans l'ordre, sans les éléments en erreur
+        errors = {err.get('failedElementNumber'): err for err in data.get('errors', [])}
+        created = iter(data.get('issues', []))
+        results = []
+        for index in range(len(tickets)):
+            if index in errors:
+                results.append({"success": False, "error": f"Erreur Jira: {json.dumps(errors[index].get('elementErrors', {}))}"})
+                continue
+            issue = next(created, None)
+            if issue is None:
+                results.append({"success": False, "error": "Erreur Jira: ticket absent de la réponse bulk"})
+                continue
+            results.append({
+                "success": True,
+                "ticket_key": issue['key'],
+                "ticket_url": f"{JIRA_URL}/browse/{issue['key']}"
+            })
+        logger.info(f"Tickets Jira créés (bulk): {sum(1 for r in results if r['success'])}/{len(tickets)}")
+        return results
+    
+    except Exception as e:
+        logger.error(f"Erreur création tickets (bulk): {str(e)}")
+        return [{"success": False, "error": str(e)}] * len(tickets)
+
+class OpenTicketIndex:
+    """
+    Index local des tickets de monitoring ouverts dans Jira, par nom d'API.
+    Initialisé par une recherche JQL au démarrage puis tenu à jour à chaque
+    création ou résolution: la déduplication est une simple lecture de dict,
+    sans appel à Jira sur le chemin critique.
+    """
+    
+    def __init__(self):
+        self._tickets = {}  # {api_name: {'key': str, 'url': str}}
+        self._lock = threading.Lock()
+        self.last_sync = None
+    
+    def __len__(self):
+        return len(self._tickets)
+    
+    def get(self, api_name):
+        return self._tickets.get(api_name)
+    
+    def add(self, api_name, key):
+        with self._lock:
+            self._tickets[api_name] = {'key': key, 'url': f"{JIRA_URL}/browse/{key}"}
+    
+    def remove(self, api_name):
+        with self._lock:
+            return self._tickets.pop(api_name, None)
+    
+    def items(self):
+        with self._lock:
+            return [(name, entry['key']) for name, entry in self._tickets.items()]
+    
+    def ticket_keys(self):
+        """Clés des tickets ouverts (un incident corrélé est partagé par plusieurs APIs)"""
+        with self._lock:
+            return {entry['key'] for entry in self._tickets.values()}
+    
+    def replace_all(self, tickets):
+        with self._lock:
+            self._tickets = {name: {'key': key, 'url': f"{JIRA_URL}/browse/{key}"} for name, key in tickets.items()}
+            self.last_sync = datetime.now()
+    
+    def stats(self):
+        return {
+            "open_tickets": len(self._tickets),
+            "last_sync": self.last_sync.isoformat() if self.last_sync else None
+        }
+
+open_tickets = OpenTicketIndex()
+
+def open_tickets_jql():
+    if JIRA_OPEN_TICKETS_JQL:
+        return JIRA_OPEN_TICKETS_JQL
+    prefix = TICKET_SUMMARY_PREFIX.replace('\\', '\\\\').replace('"', '\\"')
+    return f'project = "{JIRA_PROJECT_KEY}" AND statusCategory != Done AND summary ~ "\\"{prefix}\\""'
+
+def refresh_open_tickets(on_retry=None):
+    """
+    Recharge l'index des tickets ouverts (recherche JQL paginée)
+    """
+    summary_prefix = f"{TICKET_SUMMARY_PREFIX} - "
+    tickets = {}
+    open_keys = set()
+    start_at = 0
+    while True:
+        response = jira_request('GET', "/rest/api/2/search", on_retry=on_retry, params={
+            'jql': open_tickets_jql(),
+            'fields': 'summary',
+            'startAt': start_at,
+            'maxResults': 100
+        })
+        if response.status_code != 200:
+            return {"success": False, "error": f"Erreur Jira: {response.status_code} - {response.text}"}
+        data = response.json()
+        issues = data.get('issues', [])
+        for issue in issues:
+            open_keys.add(issue['key'])
+            summary = issue.get('fields', {}).get('summary', '')
+            if summary.startswith(summary_prefix):
+                # En cas de doublons existants, le plus ancien ticket est conservé
+                tickets.setdefault(summary[len(summary_prefix):], issue['key'])
+        start_at += len(issues)
+        if not issues or start_at >= data.get('total', 0):
+            break
+    
+    # Les APIs rattachées à un incident corrélé n'apparaissent pas dans son résumé:
+    # leur association est conservée tant que l'incident est ouvert
+    for api_name, ticket_key in open_tickets.items():
+        if ticket_key in open_keys:
+            tickets.setdefault(api_name, ticket_key)
+    
+    open_tickets.replace_all(tickets)
+    logger.info(f"Index des tickets ouverts synchronisé: {len(tickets)} ticket(s)")
+    return {"success": True, "open_tickets": len(tickets)}
+
+def comment_jira_ticket(ticket_key, body, on_retry=None):
+    """
+    Ajoute un commentaire à un ticket
+    """
+    try:
+        response = jira_request('POST', f"/rest/api/2/issue/{ticket_key}/comment", on_retry=on_retry, json={"body": body})
+    except requests.exceptions.RequestException as e:
+        return {"success": False, "error": str(e)}
+    if response.status_code != 201:
+        return {"success": False, "error": f"Erreur Jira: {response.status_code} - {response.text}"}
+    return {"success": True, "ticket_key": ticket_key, "ticket_url": f"{JIRA_URL}/browse/{ticket_key}"}
+
+def resolve_jira_ticket(ticket_key, apis, resolve=True, on_retry=None):
+    """
+    Signale le retour d'APIs sur leur ticket ouvert: un commentaire, puis
+    transition JIRA_RESOLVE_TRANSITION si configurée
+    
+    Args:
+        apis: liste de (api_name, api_url, failing_since, recovered_at) revenues UP
+        resolve: False si d'autres APIs de l'incident sont encore DOWN (commentaire seul)
+    """
+    names = ', '.join(api[0] for api in apis)
+    try:
+        if len(apis) == 1:
+            comment = render_recovery_comment(*apis[0])
+        else:
+            comment = "✅ Ces APIs répondent de nouveau aux health checks:\n" + "\n".join(
+                f"- {name} ({url}), indisponible {format_duration(failing_since, recovered_at)}"
+                for name, url, failing_since, recovered_at in apis
+            )
+        result = comment_jira_ticket(ticket_key, comment, on_retry=on_retry)
+        if not result['success'] or not resolve:
+            return result
+        
+        if JIRA_RESOLVE_TRANSITION:
+            transition_id = None
+            response = jira_request('GET', f"/rest/api/2/issue/{ticket_key}/transitions", on_retry=on_retry)
+            if response.status_code == 200:
+                for transition in response.json().get('transitions', []):
+                    if transition.get('name', '').lower() == JIRA_RESOLVE_TRANSITION.lower():
+                        transition_id = transition['id']
+            if transition_id is None:
+                logger.warning(f"Transition '{JIRA_RESOLVE_TRANSITION}' indisponible pour {ticket_key}")
+                return {"success": True, "ticket_key": ticket_key}
+            response = jira_request('POST', f"/rest/api/2/issue/{ticket_key}/transitions", on_retry=on_retry,
+                                    json={"transition": {"id": transition_id}})
+            if response.status_code != 204:
+                return {"success": False, "error": f"Erreur Jira: {response.status_code} - {response.text}"}
+        
+        logger.info(f"Ticket Jira {ticket_key} mis à jour: API(s) {names} revenue(s) UP")
+        return {"success": True, "ticket_key": ticket_key}
+    
+    except Exception as e:
+        logger.error(f"Erreur mise à jour ticket {ticket_key}: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+host_addresses = {}  # {hôte: adresse IP}, seules les résolutions réussies sont conservées
+
+def resolve_host_address(hostname):
+    """
+    Adresse IP d'un hôte (pour la corrélation par segment réseau)
+    """
+    address = host_addresses.get(hostname)
+    if address is None:
+        try:
+            address = ipaddress.ip_address(hostname)
+        except ValueError:
+            try:
+                address = ipaddress.ip_address(socket.gethostbyname(hostname))
+            except (OSError, ValueError):
+                return None
+        host_addresses[hostname] = address
+    return address
+
+class OutageCorrelator:
+    """
+    Regroupe les pannes apparues dans la même fenêtre et partageant un hôte,
+    un port, un segment réseau ou une dépendance déclarée (union-find sur les
+    clés de corrélation). Un groupe d'au moins OUTAGE_MIN_APIS APIs donne un
+    seul incident parent; les pannes suivantes qui partagent une clé avec un
+    incident encore ouvert y sont rattachées.
+    """
+    
+    def __init__(self):
+        self._incidents = {}  # {clé de corrélation: clé du ticket parent}
+    
+    def keys(self, api_url):
+        """
+        Clés de corrélation d'une API: (type, valeur)
+        """
+        url = api_url.strip()
+        parsed = urlparse(url if '://' in url else f"//{url}")
+        keys = []
+        if parsed.hostname:
+            if 'host' in OUTAGE_CORRELATION_KEYS:
+                keys.append(('hôte', parsed.hostname))
+            if 'port' in OUTAGE_CORRELATION_KEYS:
+                port = parsed.port or {'https': 443, 'tls': 443}.get(parsed.scheme, 80)
+                keys.append(('port', f"{parsed.hostname}:{port}"))
+            if 'subnet' in OUTAGE_CORRELATION_KEYS:
+                address = resolve_host_address(parsed.hostname)
+                if address is not None:
+                    prefix = OUTAGE_SUBNET_PREFIX if address.version == 4 else 64
+                    keys.append(('réseau', str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))))
+        if 'dependency' in OUTAGE_CORRELATION_KEYS:
+            api = probe_scheduler.get(url) or {}
+            keys.extend(('dépendance', dependency) for dependency in api.get('depends_on', ()))
+        return keys
+    
+    def group(self, items):
+        """
+        Répartit des créations de tickets (éléments de la file Jira)
+        
+        Returns:
+            (rattachements {clé du ticket parent: éléments}, groupes [(éléments, motif, clés)], éléments isolés)
+        """
+        open_keys = open_tickets.ticket_keys()
+        self._incidents = {key: ticket_key for key, ticket_key in self._incidents.items() if ticket_key in open_keys}
+        
+        attachments, remaining, item_keys = {}, [], []
+        for item in items:
+            keys = self.keys(item[2]['api_url'])
+            incident = next((self._incidents[key] for key in keys if key in self._incidents), None)
+            if incident is not None:
+                attachments.setdefault(incident, []).append(item)
+            else:
+                remaining.append(item)
+                item_keys.append(keys)
+        
+        parent = list(range(len(remaining)))
+        
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+        
+        first_with_key = {}
+        for index, keys in enumerate(item_keys):
+            for key in keys:
+                root, other = find(index), find(first_with_key.setdefault(key, index))
+                if root != other:
+                    parent[root] = other
+        
+        members = {}
+        for index in range(len(remaining)):
+            members.setdefault(find(index), []).append(index)
+        
+        groups, singles = [], []
+        for indexes in members.values():
+            if len(indexes) < OUTAGE_MIN_APIS:
+                singles.extend(remaining[index] for index in indexes)
+                continue
+            counts = Counter(key for index in indexes for key in item_keys[index])
+            kind, value = counts.most_common(1)[0][0]
+            groups.append(([remaining[index] for index in indexes], f"{kind} {value}", set(counts)))
+        return attachments, groups, singles
+    
+    def register(self, keys, ticket_key):
+        for key in keys:
+            self._incidents[key] = ticket_key
+    
+    def stats(self):
+        return {"active_incidents": len(set(self._incidents.values()))}
+
+outage_correlator = OutageCorrelator()
+
+class JiraDispatcher:
+    """
+    File d'envoi des tickets Jira, vidée par un thread dédié.
+    Le monitoring se contente d'ajouter des tickets dans la file: un Jira lent
+    ou indisponible ne bloque plus les health checks. Les créations de tickets
+    sont retenues OUTAGE_CORRELATION_WINDOW secondes puis corrélées: une panne
+    commune donne un seul incident parent, les autres tickets sont envoyés
+    en appels bulk.
+    """
+    
+    def __init__(self, maxsize):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.dispatched = 0
+        self.failed = 0
+        self.retries = 0
+        self.bulk_calls = 0
+        self.incidents = 0
+        self.correlated = 0
+        self._held = []  # créations de tickets en attente de corrélation
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.last_latency = None
+    
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='jira-dispatcher', daemon=True)
+                self._thread.start()
+    
+    def enqueue(self, ticket_type, callback=None, **kwargs):
+        """
+        Ajoute un ticket à la file (non bloquant).
+        callback(result) est appelé depuis le dispatcher une fois le ticket traité.
+        """
+        self.start()
+        try:
+            self._queue.put_nowait((time.monotonic(), ticket_type, kwargs, callback))
+        except queue.Full:
+            self.dropped += 1
+            logger.error(f"File Jira pleine ({self._queue.maxsize}), ticket {ticket_type} ignoré")
+            return False
+        self.enqueued += 1
+        return True
+    
+    def _count_retry(self):
+        self.retries += 1
+    
+    def _next_batch(self):
+        timeout = None
+        if self._held:
+            timeout = max(0.0, self._held[0][0] + OUTAGE_CORRELATION_WINDOW - time.monotonic())
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + JIRA_BATCH_WINDOW
+        while len(batch) < JIRA_BULK_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _process(self, batch):
+        """
+        Traite un lot: les créations de tickets sont mises en attente de corrélation,
+        les retours d'API sont regroupés par ticket, les autres actions traitées une par une
+        
+        Returns:
+            Liste de (élément, résultat) des éléments terminés
+        """
+        completed = []
+        recoveries = {}
+        for item in batch:
+            _, ticket_type, kwargs, _ = item
+            if ticket_type == 'api_down':
+                self._held.append(item)
+            elif ticket_type == 'api_recovered':
+                recoveries.setdefault(kwargs['ticket_key'], []).append(item)
+            elif ticket_type == 'refresh_index':
+                completed.append((item, refresh_open_tickets(on_retry=self._count_retry)))
+            else:
+                completed.append((item, {"success": False, "error": f"Action Jira inconnue: {ticket_type}"}))
+        
+        if recoveries:
+            open_keys = open_tickets.ticket_keys()
+            for ticket_key, items in recoveries.items():
+                # Un incident corrélé n'est résolu qu'au retour de sa dernière API
+                apis = [(kwargs['api_name'], kwargs['api_url'], kwargs.get('failing_since'), kwargs.get('recovered_at'))
+                        for _, _, kwargs, _ in items]
+                result = resolve_jira_ticket(ticket_key, apis, resolve=ticket_key not in open_keys, on_retry=self._count_retry)
+                completed.extend((item, result) for item in items)
+        
+        if self._held and time.monotonic() >= self._held[0][0] + OUTAGE_CORRELATION_WINDOW:
+            held, self._held = self._held, []
+            completed.extend(self._create_tickets(held))
+        return completed
+    
+    def _create_tickets(self, items):
+        """
+        Crée les tickets d'un ensemble de pannes: rattachement aux incidents ouverts,
+        incidents parents pour les pannes corrélées, tickets individuels (bulk) pour le reste
+        """
+        completed, pending = [], []
+        for item in items:
+            # Revérifier l'index: un ticket a pu être créé ou découvert depuis la mise en file
+            existing = open_tickets.get(item[2]['api_name'])
+            with api_status_lock:
+                state = api_status.get(item[2]['api_url'])
+                recovered = state is None or state.status not in ('down', 'flapping')
+            if not cluster.owns(item[2]['api_url']):
+                # Mode cluster: seule l'instance propriétaire de l'API crée son ticket. Elle a
+                # resynchronisé l'index (JQL) en reprenant l'API, avant tout health check
+                completed.append((item, {"success": False, "cancelled": True, "error": "API reprise par une autre instance du cluster"}))
+            elif recovered:
+                completed.append((item, {"success": False, "cancelled": True, "error": "API revenue UP avant l'envoi du ticket"}))
+            elif existing:
+                # Ticket encore ouvert (panne précédente sans JIRA_RESOLVE_TRANSITION, ou créé
+                # par l'instance qui monitorait l'API avant un rééquilibrage): la panne y est commentée
+                comment = f"🔴 API DOWN alors que ce ticket est encore ouvert\n\n{render_ticket_description(**item[2])}"
+                result = comment_jira_ticket(existing['key'], comment, on_retry=self._count_retry)
+                completed.append((item, dict(result, existing=True)))
+            else:
+                pending.append(item)
+        
+        if OUTAGE_CORRELATION_WINDOW > 0:
+            attachments, groups, singles = outage_correlator.group(pending)
+        else:
+            attachments, groups, singles = {}, [], pending
+        
+        for ticket_key, attached in attachments.items():
+            affected = "\n".join(f"- {kwargs['api_name']} ({kwargs['api_url']}): {kwargs['error_message']}" for _, _, kwargs, _ in attached)
+            result = comment_jira_ticket(ticket_key, f"🔴 APIs également impactées:\n{affected}", on_retry=self._count_retry)
+            completed.extend((item, dict(result, incident=True)) for item in attached)
+        
+        for grouped, reason, keys in groups:
+            result = create_jira_ticket('incident', on_retry=self._count_retry, apis=[item[2] for item in grouped], reason=reason)
+            if result['success']:
+                self.incidents += 1
+                self.correlated += len(grouped)
+                outage_correlator.register(keys, result['ticket_key'])
+                logger.warning(f"🧩 Incident corrélé {result['ticket_key']} ({reason}): {len(grouped)} APIs")
+            completed.extend((item, dict(result, incident=True)) for item in grouped)
+        
+        for start in range(0, len(singles), JIRA_BULK_MAX):
+            chunk = singles[start:start + JIRA_BULK_MAX]
+            if len(chunk) == 1:
+                results = [create_jira_ticket('api_down', on_retry=self._count_retry, **chunk[0][2])]
+            else:
+                results = create_jira_tickets_bulk([('api_down', item[2]) for item in chunk], on_retry=self._count_retry)
+                self.bulk_calls += 1
+            completed.extend(zip(chunk, results))
+        
+        for item, result in completed:
+            if result['success'] and not result.get('existing'):
+                open_tickets.add(item[2]['api_name'], result['ticket_key'])
+        return completed
+    
+    def _run(self):
+        logger.info("Dispatcher Jira démarré")
+        while True:
+            batch = self._next_batch()
+            try:
+                completed = self._process(batch)
+            except Exception as e:
+                held, self._held = self._held, []
+                completed = [(item, {"success": False, "error": str(e)}) for item in held + [item for item in batch if item not in held]]
+            
+            now = time.monotonic()
+            for (enqueued_at, _, _, callback), result in completed:
+                latency = now - enqueued_at
+                self.latency_total += latency
+                self.latency_max = max(self.latency_max, latency)
+                self.last_latency = latency
+                if result['success']:
+                    self.dispatched += 1
+                elif not result.get('cancelled'):
+                    self.failed += 1
+                if callback:
+                    try:
+                        callback(result)
+                    except Exception as e:
+                        logger.error(f"Erreur dans le callback du dispatcher Jira: {str(e)}")
+            if completed:
+                status_store.publish_stats(collect_runtime_stats())
+    
+    def stats(self):
+        processed = self.dispatched + self.failed
+        return {
+            "queue_depth": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "dispatched": self.dispatched,
+            "failed": self.failed,
+            "retries": self.retries,
+            "bulk_calls": self.bulk_calls,
+            "held_for_correlation": len(self._held),
+            "incidents": self.incidents,
+            "correlated_apis": self.correlated,
+            "dispatch_latency_avg": round(self.latency_total / processed, 3) if processed else None,
+            "dispatch_latency_max": round(self.latency_max, 3),
+            "dispatch_latency_last": round(self.last_latency, 3) if self.last_latency is not None else None
+        }
+
+jira_dispatcher = JiraDispatcher(JIRA_QUEUE_MAXSIZE)
+
+def collect_runtime_stats():
+    """
+    Statistiques d'exécution du leader, publiées dans le status store
+    """
+    return {
+        "http_pool": http_pool.stats(),
+        "jira_queue": jira_dispatcher.stats(),
+        "jira_index": dict(open_tickets.stats(), **outage_correlator.stats()),
+        **({"cluster": cluster.stats()} if cluster.enabled else {}),
+        "scheduler": {
+            "targets": len(probe_scheduler),
+            "in_flight": probes_in_flight
+        },
+        "maintenance": maintenance.stats(),
+        **({"logging": {
+            "queued": log_queue_handler.queue.qsize(),
+            "dropped": log_queue_handler.dropped
+        }} if log_queue_handler else {})
+    }
+
+def get_probe_executor():
+    """
+    Retourne le pool de threads des health checks (créé à la demande)
+    """
+    global probe_executor
+    if probe_executor is None:
+        probe_executor = ThreadPoolExecutor(max_workers=PROBE_CONCURRENCY, thread_name_prefix='probe')
+    return probe_executor
+
+def get_vantage_executor():
+    """
+    Retourne le pool de threads des probes de confirmation (créé à la demande)
+    """
+    global vantage_executor
+    if vantage_executor is None:
+        vantage_executor = ThreadPoolExecutor(max_workers=PROBE_CONCURRENCY, thread_name_prefix='vantage')
+    return vantage_executor
+
+def vantage_points():
+    """
+    Points de vue de confirmation: VANTAGE_POINTS, sinon les autres instances actives du cluster
+    
+    Returns:
+        {id: url}
+    """
+    if VANTAGE_POINTS:
+        return dict(
+            (node.strip(), url.strip().rstrip('/'))
+            for node, url in (point.split('=', 1) for point in VANTAGE_POINTS.split(',') if '=' in point)
+        )
+    if cluster.enabled:
+        return {node: url for node, url in cluster.members.items() if node != cluster.node_id and node in cluster.alive}
+    return {}
+
+def probe_from_vantage(url, api, timeout):
+    """
+    Demande à un autre point de vue d'exécuter le health check d'une API
+    
+    Returns:
+        True (UP), False (DOWN) ou None si le point de vue n'a pas répondu
+    """
+    try:
+        response = http_pool.get(url).post(
+            f"{url}/monitoring/probe", json=api, timeout=timeout,
+            headers={'Authorization': f"Bearer {VANTAGE_TOKEN}"} if VANTAGE_TOKEN else None
+        )
+        if response.status_code != 200:
+            logger.warning(f"Point de vue {url} indisponible pour {api['name']}: HTTP {response.status_code}")
+            return None
+        return bool(response.json()['healthy'])
+    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+        logger.warning(f"Point de vue {url} injoignable pour {api['name']}: {str(e)}")
+        return None
+
+def needs_confirmation(api_url, api_name):
+    """
+    Indique si un échec ferait passer l'API DOWN (seul cas soumis aux autres points de vue)
+    """
+    with api_status_lock:
+        state = api_status.get(api_url)
+        state = state.copy() if state is not None else ApiState(api_name)
+    previous_status = state.status
+    return previous_status != 'down' and advance_state(state, False) == 'down'
+
+def confirm_failure(api, message):
+    """
+    Re-teste en parallèle une API en échec depuis les autres points de vue.
+    La panne est confirmée si les votes DOWN (point de vue local compris) atteignent
+    VANTAGE_QUORUM, ou la majorité des points de vue ayant répondu si VANTAGE_QUORUM vaut 0.
+    Les probes partent en même temps: la confirmation coûte au plus un timeout.
+    
+    Returns:
+        (confirmed, message)
+    """
+    points = vantage_points()
+    if not points:
+        return True, message
+    
+    timeout = (api.get('timeout') or TIMEOUT) + CLUSTER_PEER_TIMEOUT
+    executor = get_vantage_executor()
+    futures = [executor.submit(probe_from_vantage, url, api, timeout) for url in points.values()]
+    # Un point de vue qui ne répond pas dans le délai ne vote pas
+    done, _ = wait(futures, timeout=timeout)
+    votes = [future.result() for future in futures if future in done]
+    
+    down = 1 + votes.count(False)
+    responses = down + votes.count(True)
+    quorum = VANTAGE_QUORUM or responses // 2 + 1
+    confirmed = down >= quorum
+    metrics.inc('jira_webhook_vantage_confirmations_total', (api['name'], 'confirmed' if confirmed else 'rejected'))
+    summary = f"DOWN depuis {down}/{responses} point(s) de vue"
+    if not confirmed:
+        logger.warning(f"⚠️ Échec de {api['name']} non confirmé par les autres points de vue ({summary}): {message}")
+    return confirmed, f"{message} ({summary})"
+
+class StateTransition:
+    """
+    Changement d'état d'une API, transmis aux abonnés (tickets, métriques, logs)
+    """
+    __slots__ = ('api_url', 'api_name', 'previous', 'current', 'message', 'timestamp', 'latency_ms', 'failing_since')
+    
+    def __init__(self, api_url, api_name, previous, current, message, timestamp, latency_ms=None, failing_since=None):
+        self.api_url = api_url
+        self.api_name = api_name
+        self.previous = previous
+        self.current = current
+        self.message = message
+        self.timestamp = timestamp
+        self.latency_ms = latency_ms
+        self.failing_since = failing_since
+
+transition_subscribers = []
+
+def subscribe_transitions(callback):
+    """
+    Abonne callback(transition) aux changements d'état des APIs (utilisable comme décorateur).
+    Les abonnés sont appelés depuis le thread du health check, hors verrou.
+    """
+    transition_subscribers.append(callback)
+    return callback
+
+def advance_state(state, is_healthy, slow=False):
+    """
+    Machine à états d'une API:
+    - UP -> DEGRADED au premier échec, DEGRADED -> DOWN après RETRY_ATTEMPTS échecs consécutifs
+    - DEGRADED après SLOW_RESPONSE_ATTEMPTS réponses lentes consécutives (slow), jusqu'à
+      SLOW_RECOVERY_ATTEMPTS réponses rapides consécutives
+    - DOWN -> RECOVERING au premier succès, RECOVERING -> UP après RECOVERY_ATTEMPTS succès
+      (un échec pendant RECOVERING ramène directement à DOWN)
+    - FLAPPING quand la part de changements de résultat sur les FLAP_WINDOW derniers
+      health checks dépasse FLAP_HIGH_THRESHOLD, jusqu'à repasser sous FLAP_LOW_THRESHOLD
+    
+    Returns:
+        Nouveau statut
+    """
+    state.record_result(is_healthy, slow)
+    status = state.status
+    
+    if status == 'flapping':
+        if state.flap_ratio() >= FLAP_LOW_THRESHOLD:
+            return 'flapping'
+        # Sortie du flapping selon les derniers résultats
+        if state.consecutive_failures:
+            return 'down' if state.consecutive_failures >= RETRY_ATTEMPTS else 'degraded'
+        if state.consecutive_successes < RECOVERY_ATTEMPTS:
+            return 'recovering'
+        return responsive_status(state, status)
+    
+    if state.results_count >= FLAP_WINDOW and state.flap_ratio() >= FLAP_HIGH_THRESHOLD:
+        return 'flapping'
+    
+    if is_healthy:
+        if status in ('down', 'recovering') and state.consecutive_successes < RECOVERY_ATTEMPTS:
+            return 'recovering'
+        return responsive_status(state, status)
+    if status in ('down', 'recovering'):
+        return 'down'
+    return 'down' if state.consecutive_failures >= RETRY_ATTEMPTS else 'degraded'
+
+def responsive_status(state, previous):
+    """
+    Statut d'une API qui répond, avec hystérésis sur la lenteur: une latence qui oscille
+    autour du seuil ne fait pas alterner UP et DEGRADED à chaque health check
+    """
+    if state.consecutive_slow >= SLOW_RESPONSE_ATTEMPTS:
+        return 'degraded'
+    # DEGRADED pour lenteur (le health check précédent avait répondu): maintenu
+    # jusqu'à SLOW_RECOVERY_ATTEMPTS réponses rapides consécutives
+    slow_degraded = previous == 'degraded' and state.results_count >= 2 and state.results & 2
+    if slow_degraded and state.consecutive_fast < SLOW_RECOVERY_ATTEMPTS:
+        return 'degraded'
+    return 'up'
+
+def is_recovery(previous, current):
+    """
+    Fin de panne: retour en UP, ou en DEGRADED (joignable mais lente) depuis DOWN ou RECOVERING
+    """
+    return current == 'up' or (current == 'degraded' and previous in ('down', 'recovering'))
+
+def apply_check_result(api_url, api_name, is_healthy, message, http_code=0, latency_ms=None, confirmed=True, slow_ms=None):
+    """
+    Applique le résultat d'un health check à la machine à états de l'API
+    et notifie les abonnés en cas de changement d'état
+    (confirmed=False: échec non confirmé par les autres points de vue, l'API ne passe pas DOWN;
+    slow_ms: seuil de réponse lente propre à l'API)
+    """
+    current_time = datetime.now()
+    transition = None
+    history_store.record(api_url, current_time.timestamp(), is_healthy, message, http_code, latency_ms)
+    
+    with api_status_lock:
+        # Initialiser le statut si c'est la première vérification
+        state = api_status.get(api_url)
+        if state is None:
+            state = api_status[api_url] = ApiState(api_name, since=current_time)
+        state.last_check = current_time
+        
+        previous_status = state.status
+        slow = False
+        if is_healthy and latency_ms is not None:
+            slow = state.is_slow(latency_ms, slow_ms)
+            if slow:
+                message = f"{message} (réponse lente: {latency_ms:.0f} ms, habituellement {state.latency_avg:.0f} ms)"
+            state.record_latency(latency_ms)
+        state.status = advance_state(state, is_healthy, slow)
+        check_counts['slow' if slow else 'ok' if is_healthy else 'failed'] += 1
+        if state.status == 'down' and previous_status != 'down' and not confirmed:
+            state.status = previous_status if previous_status in ('recovering', 'flapping') else 'degraded'
+        failing_since = state.failing_since
+        if not is_healthy and failing_since is None:
+            state.failing_since = current_time
+        elif is_healthy and state.status in ('up', 'degraded'):
+            # Panne terminée (ou simple lenteur): la transition garde le début de la panne
+            state.failing_since = None
+        if state.status != previous_status:
+            state.since = current_time
+            transition = StateTransition(api_url, api_name, previous_status, state.status, message, current_time,
+                                         latency_ms, failing_since or state.failing_since)
+            if is_recovery(previous_status, state.status):
+                # Panne terminée: le ticket est détaché avant la publication et la journalisation de l'état
+                state.last_ticket_created = None
+                state.ticket_key = None
+                state.ticket_suppressed = False
+        
+        # API toujours DOWN sans ticket (création précédente en échec): nouvelle demande
+        retry_ticket = (
+            transition is None and state.status == 'down' and state.ticket_key is None and not state.ticket_pending
+        )
+        
+        status_store.write(api_url, state)
+        # Journaliser les transitions et les échecs (pas les health checks OK répétés)
+        if transition or not is_healthy:
+            state_journal.record(api_url, state)
+    
+    if transition:
+        for subscriber in transition_subscribers:
+            try:
+                subscriber(transition)
+            except Exception as e:
+                logger.error(f"Erreur d'un abonné aux transitions ({api_name}): {str(e)}")
+    elif retry_ticket:
+        request_ticket(api_url, api_name, message)
+    
+    # Log de chaque vérification (LOG_CHECKS=summary: résumé périodique seulement)
+    if LOG_CHECKS == 'all' and logger.isEnabledFor(logging.INFO):
+        status_icon = ("🐢" if slow else "✅") if is_healthy else "❌"
+        logger.info("%s %s (%s): %s", status_icon, api_name, api_url, message,
+                    extra={'event': 'check', 'api': api_url, 'api_name': api_name,
+                           'healthy': is_healthy, 'latency_ms': None if latency_ms is None else round(latency_ms, 1)})
+
+def request_ticket(api_url, api_name, message):
+    """
+    Met en file la création du ticket d'une API DOWN, sauf si la panne a déjà
+    son ticket ou si sa création est en cours. Si un ticket d'une panne précédente
+    est encore ouvert (index local), le dispatcher y ajoute un commentaire.
+    Pendant une fenêtre de maintenance, aucun ticket n'est demandé: si l'API
+    est toujours DOWN à la fin de la fenêtre, le ticket est créé au health check suivant.
+    La suppression n'est comptée (et journalisée) qu'une fois par panne.
+    """
+    silenced_until = maintenance.silenced(api_url)
+    if silenced_until:
+        with api_status_lock:
+            state = api_status.get(api_url)
+            first_suppression = state is not None and not state.ticket_suppressed
+            if first_suppression:
+                state.ticket_suppressed = True
+        if first_suppression:
+            metrics.inc('jira_webhook_tickets_suppressed_total', (api_name,))
+            logger.info("🔧 Pas de ticket pour %s: maintenance en cours jusqu'à %s", api_name,
+                        datetime.fromtimestamp(silenced_until).strftime('%Y-%m-%d %H:%M:%S'))
+        return
+    
+    with api_status_lock:
+        state = api_status.get(api_url)
+        if state is None or state.ticket_pending or state.ticket_key is not None:
+            return
+        state.ticket_pending = True
+        state.ticket_suppressed = False
+        failing_since = state.failing_since
+    
+    def on_ticket_result(result):
+        recovered_at = None
+        with api_status_lock:
+            state = api_status.get(api_url)
+            if state is None:
+                return
+            state.ticket_pending = False
+            if result['success'] and state.status in ('down', 'flapping'):
+                state.last_ticket_created = state.last_ticket_created or datetime.now()
+                state.ticket_key = result['ticket_key']
+                status_store.write(api_url, state)
+                state_journal.record(api_url, state)
+            elif result['success']:
+                # API revenue UP pendant la création: le ticket n'est pas rattaché à l'état
+                recovered_at = state.since
+        if recovered_at is not None:
+            # Ticket arrivé après la fin de la panne: il suit directement le chemin du retour
+            # (commentaire, résolution) pour ne pas bloquer le ticket de la panne suivante
+            indexed = open_tickets.get(api_name)
+            if indexed and indexed['key'] == result['ticket_key']:
+                open_tickets.remove(api_name)
+            jira_dispatcher.enqueue('api_recovered', ticket_key=result['ticket_key'], api_url=api_url, api_name=api_name,
+                                    failing_since=failing_since, recovered_at=recovered_at)
+            logger.info(f"🟢 Ticket {result['ticket_key']} reçu après le retour de {api_name}, clôturé")
+        elif result.get('existing') and result['success']:
+            logger.info(f"🎫 Ticket déjà ouvert pour API DOWN {api_name}, panne ajoutée en commentaire: {result['ticket_key']}")
+        elif result.get('cancelled'):
+            logger.info(f"🟢 Ticket annulé pour {api_name}: {result['error']}")
+        elif result['success'] and result.get('incident'):
+            logger.info(f"🧩 API DOWN {api_name} rattachée à l'incident {result['ticket_key']}")
+        elif result['success']:
+            logger.info(f"🎫 Ticket créé pour API DOWN {api_name}: {result['ticket_key']}")
+        else:
+            logger.error(f"❌ Échec création ticket pour {api_name}: {result['error']}")
+    
+    # Le ticket est envoyé par le dispatcher Jira, le monitoring continue sans attendre
+    if not jira_dispatcher.enqueue('api_down', callback=on_ticket_result,
+                                   api_url=api_url, api_name=api_name, error_message=message):
+        with api_status_lock:
+            state = api_status.get(api_url)
+            if state is not None:
+                state.ticket_pending = False
+
+@subscribe_transitions
+def log_transition(transition):
+    name, url = transition.api_name, transition.api_url
+    latency_ms = None if transition.latency_ms is None else round(transition.latency_ms, 1)
+    extra = {'event': 'transition', 'api': url, 'api_name': name, 'previous': transition.previous,
+             'state': transition.current, 'latency_ms': latency_ms}
+    if transition.current == 'down':
+        logger.warning("🔴 API %s (%s) est DOWN: %s", name, url, transition.message, extra=extra)
+    elif transition.current == 'flapping':
+        logger.warning("🟠 API %s (%s) est instable (FLAPPING): %s", name, url, transition.message, extra=extra)
+    elif transition.current == 'up':
+        logger.info("🟢 API %s (%s) est %s", name, url, 'UP' if transition.previous == 'unknown' else 'revenue UP', extra=extra)
+    else:
+        logger.info("🟡 API %s (%s): %s -> %s (%s)", name, url, transition.previous.upper(), transition.current.upper(),
+                    transition.message, extra=extra)
+
+def log_check_summary(elapsed):
+    """
+    Résumé des health checks depuis le précédent résumé (LOG_CHECKS=summary)
+    """
+    with api_status_lock:
+        counts = dict(check_counts)
+        check_counts.clear()
+        states = Counter(state.status for state in api_status.values())
+    total = sum(counts.values())
+    logger.info(
+        "📊 %d health check(s) en %.0f s (%.1f/s): %d OK, %d lent(s), %d échec(s) | %s",
+        total, elapsed, total / elapsed if elapsed else 0.0,
+        counts.get('ok', 0), counts.get('slow', 0), counts.get('failed', 0),
+        ', '.join(f"{status.upper()}: {count}" for status, count in sorted(states.items())),
+        extra={'event': 'summary', 'checks': counts, 'states': dict(states)}
+    )
+
+@subscribe_transitions
+def count_transition(transition):
+    metrics.inc('jira_webhook_api_transitions_total', (transition.api_name, transition.previous, transition.current))
+
+@subscribe_transitions
+def publish_transition(transition):
+    """
+    Publie la transition dans le buffer d'événements lu par /monitoring/stream
+    """
+    event_store.append({
+        'api': transition.api_url,
+        'name': transition.api_name,
+        'from': transition.previous,
+        'to': transition.current,
+        'message': transition.message,
+        'latency_ms': None if transition.latency_ms is None else round(transition.latency_ms, 1),
+        'timestamp': transition.timestamp.isoformat()
+    })
+
+@subscribe_transitions
+def ticket_on_transition(transition):
+    """
+    Ticket à l'entrée en DOWN; au retour en UP (ou DEGRADED: joignable mais lente), le ticket ouvert
+    est mis à jour et retiré de l'index
+    """
+    if transition.current == 'down':
+        request_ticket(transition.api_url, transition.api_name, transition.message)
+    elif is_recovery(transition.previous, transition.current):
+        # ticket_key et last_ticket_created sont déjà remis à zéro par apply_check_result
+        recovered_ticket = open_tickets.remove(transition.api_name)
+        if recovered_ticket:
+            jira_dispatcher.enqueue('api_recovered', ticket_key=recovered_ticket['key'],
+                                    api_url=transition.api_url, api_name=transition.api_name,
+                                    failing_since=transition.failing_since, recovered_at=transition.timestamp)
+
+def next_probe_delay(api, consecutive_failures, confirming=False):
+    """
+    Délai avant le prochain health check d'une API:
+    - intervalle propre à l'API (ou HEALTH_CHECK_INTERVAL)
+    - probes rapprochés tant que la panne (ou le retour, confirming) n'est pas confirmé
+    - backoff exponentiel (borné) pour une API DOWN depuis longtemps
+    avec un jitter pour étaler les probes sur la période
+    """
+    interval = api.get('interval') or HEALTH_CHECK_INTERVAL
+    if 0 < consecutive_failures < RETRY_ATTEMPTS or confirming:
+        delay = min(interval, HEALTH_CHECK_RETRY_INTERVAL)
+    elif consecutive_failures > RETRY_ATTEMPTS:
+        backoff = interval * (2 ** min(consecutive_failures - RETRY_ATTEMPTS, 16))
+        delay = min(backoff, max(interval, HEALTH_CHECK_MAX_BACKOFF))
+    else:
+        delay = interval
+    return delay * random.uniform(1 - HEALTH_CHECK_JITTER, 1 + HEALTH_CHECK_JITTER)
+
+def on_probe_done(api, future, cycle):
+    """
+    Callback de fin de health check (exécuté dans le thread du probe):
+    applique le résultat puis replanifie l'API
+    
+    Args:
+        cycle: [probes restants, début] de la vague de health checks du probe
+    """
+    global probes_in_flight
+    api_url = api['url'].strip()
+    try:
+        is_healthy, message, http_code, latency_ms = future.result()
+    except Exception as e:
+        is_healthy, message, http_code, latency_ms = False, f"Error: {str(e)}", 0, None
+    
+    labels = (api['name'],)
+    if latency_ms is not None:
+        metrics.observe('jira_webhook_probe_duration_seconds', labels, latency_ms / 1000)
+    metrics.inc('jira_webhook_probes_total', (api['name'], 'success' if is_healthy else 'failure'))
+    
+    try:
+        # Ignorer le résultat d'une API retirée de la configuration pendant le probe
+        if probe_scheduler.contains(api_url):
+            confirmed = True
+            if not is_healthy and needs_confirmation(api_url, api['name']):
+                confirmed, message = confirm_failure(api, message)
+            apply_check_result(api_url, api['name'], is_healthy, message, http_code, latency_ms, confirmed, api.get('slow_ms'))
+    except Exception as e:
+        logger.error(f"Erreur lors du traitement du résultat pour {api['name']}: {str(e)}")
+    
+    with probe_scheduler.condition:
+        probes_in_flight -= 1
+        # Replanifier seulement si l'API est toujours monitorée, avec sa configuration courante
+        current = probe_scheduler.get(api_url)
+        if current is not None:
+            with api_status_lock:
+                state = api_status.get(api_url)
+                failures = state.consecutive_failures if state else 0
+                confirming = state is not None and state.status == 'recovering'
+            probe_scheduler.schedule(current, next_probe_delay(current, failures, confirming))
+        cycle[0] -= 1
+        if not cycle[0]:
+            metrics.observe('jira_webhook_cycle_duration_seconds', (), time.monotonic() - cycle[1])
+        probe_scheduler.condition.notify()
+
+def dispatch_due_probes():
+    """
+    Lance les health checks arrivés à échéance, dans la limite de
+    HEALTH_CHECK_CONCURRENCY probes simultanés
+    
+    Returns:
+        Nombre de probes lancés
+    """
+    global probes_in_flight
+    executor = get_probe_executor()
+    start = time.monotonic()
+    with probe_scheduler.condition:
+        due = probe_scheduler.pop_due(start, PROBE_CONCURRENCY - probes_in_flight)
+        probes_in_flight += len(due)
+    
+    timeouts = [None] * len(due)
+    if ADAPTIVE_TIMEOUT and due:
+        with api_status_lock:
+            for index, (_, api) in enumerate(due):
+                state = api_status.get(api['url'].strip())
+                if state is not None and not api.get('timeout'):
+                    timeouts[index] = state.probe_timeout()
+    
+    # La vague est mesurée jusqu'au dernier résultat (décompte sous probe_scheduler.condition)
+    cycle = [len(due), start]
+    for (deadline, api), timeout in zip(due, timeouts):
+        metrics.observe('jira_webhook_scheduler_lag_seconds', (), max(0.0, start - deadline))
+        future = executor.submit(run_health_check, api, timeout)
+        future.add_done_callback(lambda f, api=api: on_probe_done(api, f, cycle))
+    return len(due)
+
+def wait_for_due_probes(max_wait):
+    """
+    Attend la prochaine échéance, une fin de probe ou une replanification
+    """
+    with probe_scheduler.condition:
+        deadline = probe_scheduler.next_deadline()
+        if probes_in_flight >= PROBE_CONCURRENCY or deadline is None:
+            timeout = max_wait
+        else:
+            timeout = min(max_wait, max(0.0, deadline - time.monotonic()))
+        if timeout > 0:
+            probe_scheduler.condition.wait(timeout)
+
+def schedule_monitored_apis():
+    """
+    Planifie toutes les APIs monitorées, réparties aléatoirement sur leur intervalle
+    """
+    for api in MONITORED_APIS:
+        # En mode cluster, seules les APIs attribuées à cette instance sont planifiées
+        if not api['url'].strip() or not cluster.owns(api['url']):
+            continue
+        interval = api.get('interval') or HEALTH_CHECK_INTERVAL
+        probe_scheduler.schedule(api, random.uniform(0, interval))
+
+def copy_api_status():
+    """
+    Copie de api_status prise sous verrou
+    """
+    with api_status_lock:
+        return {url: state.copy() for url, state in api_status.items()}
+
+def recover_state():
+    """
+    Restaure api_status depuis le journal d'état (tickets déjà créés,
+    échecs consécutifs) pour ne pas recréer de ticket après un redémarrage
+    """
+    start = time.monotonic()
+    states = state_journal.recover()
+    monitored_urls = {api['url'].strip() for api in MONITORED_APIS if cluster.owns(api['url'])}
+    with api_status_lock:
+        for url, state in states.items():
+            if url not in monitored_urls:
+                continue
+            api_status[url] = state
+            status_store.write(url, state)
+            # Tickets connus du journal: disponibles avant la synchronisation avec Jira
+            if state.ticket_key:
+                open_tickets.add(state.name, state.ticket_key)
+        restored = len(api_status)
+    # Repartir d'un journal compact
+    state_journal.compact(copy_api_status())
+    if states:
+        logger.info(f"État restauré pour {restored} API(s) en {(time.monotonic() - start) * 1000:.1f}ms")
+
+def apply_targets(new_targets):
+    """
+    Applique une nouvelle liste d'APIs en ne touchant qu'aux APIs ajoutées,
+    supprimées ou modifiées (comparaison par URL)
+    
+    Returns:
+        (ajoutées, supprimées, modifiées)
+    """
+    global MONITORED_APIS
+    old = {api['url']: api for api in MONITORED_APIS}
+    new = {api['url']: api for api in new_targets}
+    added = [url for url in new if url not in old]
+    removed = [url for url in old if url not in new]
+    changed = [url for url in new if url in old and new[url] != old[url]]
+    MONITORED_APIS = list(new_targets)
+    targets_state['version'] += 1
+    
+    # Seul le leader planifie les health checks et publie l'état
+    if is_leader():
+        for url in removed:
+            forget_api(url)
+        for url in added:
+            api = new[url]
+            if cluster.owns(url):
+                probe_scheduler.schedule(api, random.uniform(0, api.get('interval') or HEALTH_CHECK_INTERVAL))
+        for url in changed:
+            api = new[url]
+            if not cluster.owns(url):
+                continue
+            probe_scheduler.update(api, random.uniform(0, api.get('interval') or HEALTH_CHECK_INTERVAL))
+            with api_status_lock:
+                if url in api_status and api_status[url].name != api['name']:
+                    api_status[url].name = api['name']
+                    status_store.write(url, api_status[url])
+    return added, removed, changed
+
+def reload_targets(force=False):
+    """
+    Recharge MONITORED_APIS_FILE s'il a changé (vérifié au plus une fois
+    par TARGETS_RELOAD_INTERVAL secondes)
+    """
+    if not MONITORED_APIS_FILE:
+        return
+    now = time.monotonic()
+    if not force and now - targets_state['checked_at'] < TARGETS_RELOAD_INTERVAL:
+        return
+    with targets_lock:
+        targets_state['checked_at'] = now
+        try:
+            mtime = os.stat(MONITORED_APIS_FILE).st_mtime_ns
+        except OSError:
+            return
+        if mtime == targets_state['mtime'] and not force:
+            return
+        targets_state['mtime'] = mtime
+        start = time.perf_counter()
+        try:
+            new_targets = parse_targets_file(MONITORED_APIS_FILE)
+        except (OSError, ValueError) as e:
+            logger.error(f"Fichier des APIs invalide ({MONITORED_APIS_FILE}), configuration conservée: {str(e)}")
+            return
+        added, removed, changed = apply_targets(new_targets)
+        if added or removed or changed:
+            logger.info(f"APIs rechargées en {(time.perf_counter() - start) * 1000:.1f}ms: "
+                        f"{len(added)} ajoutée(s), {len(removed)} supprimée(s), {len(changed)} modifiée(s)")
+
+def save_targets(targets):
+    """
+    Écrit la liste des APIs dans MONITORED_APIS_FILE (écriture atomique)
+    """
+    directory = os.path.dirname(MONITORED_APIS_FILE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{MONITORED_APIS_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if MONITORED_APIS_FILE.endswith(('.yml', '.yaml')) and yaml is not None:
+            yaml.safe_dump({'targets': targets}, f, allow_unicode=True)
+        else:
+            json.dump({'targets': targets}, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, MONITORED_APIS_FILE)
+
+def forget_api(url):
+    """
+    Oublie une API qui n'est plus monitorée par cette instance
+    """
+    probe_scheduler.remove(url)
+    with api_status_lock:
+        api_status.pop(url, None)
+    status_store.remove(url)
+    history_store.remove(url)
+
+def rebalance_targets():
+    """
+    Aligne les APIs planifiées sur l'anneau du cluster après un changement de membres
+    
+    Returns:
+        (reprises, cédées)
+    """
+    owned = {api['url'].strip(): api for api in MONITORED_APIS if api['url'].strip() and cluster.owns(api['url'])}
+    scheduled = set(probe_scheduler.urls())
+    acquired = [url for url in owned if url not in scheduled]
+    released = [url for url in scheduled if url not in owned]
+    for url in released:
+        forget_api(url)
+    if acquired:
+        # Resynchroniser l'index avant tout ticket: l'instance précédente a pu en créer
+        jira_dispatcher.enqueue('refresh_index')
+        for url in acquired:
+            api = owned[url]
+            probe_scheduler.schedule(api, random.uniform(0, api.get('interval') or HEALTH_CHECK_INTERVAL))
+    if acquired or released:
+        logger.info(f"Rééquilibrage du cluster: {len(acquired)} API(s) reprise(s), {len(released)} cédée(s)")
+    return acquired, released
+
+def cluster_worker():
+    """
+    Thread du leader en mode cluster: suit les membres et rééquilibre les APIs
+    """
+    while True:
+        time.sleep(CLUSTER_REFRESH_INTERVAL)
+        try:
+            if cluster.refresh():
+                rebalance_targets()
+        except Exception as e:
+            logger.error(f"Erreur de suivi du cluster: {str(e)}")
+
+def monitoring_worker():
+    """
+    Thread de monitoring: lance les health checks selon leur planification
+    """
+    logger.info(f"Thread de monitoring démarré (concurrence: {PROBE_CONCURRENCY})")
+    # Synchronisation de l'index des tickets ouverts, traitée par le dispatcher avant tout ticket
+    jira_dispatcher.enqueue('refresh_index')
+    last_index_refresh = time.monotonic()
+    schedule_monitored_apis()
+    last_housekeeping = 0.0
+    last_summary = time.monotonic()
+    
+    while True:
+        try:
+            dispatch_due_probes()
+            
+            # Tâches périodiques: heartbeat du leader, statistiques, compaction du journal
+            now = time.monotonic()
+            if now - last_housekeeping >= HOUSEKEEPING_INTERVAL:
+                last_housekeeping = now
+                status_store.heartbeat()
+                status_store.publish_stats(collect_runtime_stats())
+                export_leader_metrics()
+                state_journal.compact_if_due(copy_api_status)
+                reload_targets()
+                if LOG_CHECKS == 'summary' and now - last_summary >= LOG_SUMMARY_INTERVAL:
+                    log_check_summary(now - last_summary)
+                    last_summary = now
+                if now - last_index_refresh >= JIRA_INDEX_REFRESH_INTERVAL:
+                    last_index_refresh = now
+                    jira_dispatcher.enqueue('refresh_index')
+            
+            wait_for_due_probes(HOUSEKEEPING_INTERVAL)
+        except Exception as e:
+            logger.error(f"Erreur dans le monitoring worker: {str(e)}")
+            time.sleep(1)
+
+def is_leader():
+    """
+    Indique si ce worker exécute le monitoring
+    """
+    return leader_lock_fd is not None
+
+def try_acquire_leadership():
+    """
+    Tente de prendre le verrou de leader (non bloquant).
+    Le verrou est libéré automatiquement par le noyau si le worker meurt,
+    ce qui permet à un autre worker de reprendre le monitoring.
+    """
+    global leader_lock_fd
+    if leader_lock_fd is not None:
+        return True
+    if not LEADER_ELECTION or fcntl is None:
+        leader_lock_fd = -1  # Mode mono-processus: ce worker est toujours leader
+        return True
+    
+    fd = os.open(MONITORING_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    
+    os.ftruncate(fd, 0)
+    os.write(fd, str(os.getpid()).encode())
+    leader_lock_fd = fd
+    return True
+
+def is_monitoring_active(header):
+    """
+    Le monitoring est actif si le leader a publié un heartbeat récent
+    """
+    if header is None:
+        return False
+    max_age = 3 * HOUSEKEEPING_INTERVAL + TIMEOUT
+    monitoring_active = time.time() - header['updated_at'] < max_age
+    if is_leader():
+        monitoring_active = monitoring_active and monitoring_thread is not None and monitoring_thread.is_alive()
+    return monitoring_active
+
+CACHED_STATUS_FIELDS = ('name', 'status', 'last_ticket_created')
+
+def get_shared_status(details=True):
+    """
+    Retourne (monitoring_active, api_status) vus depuis n'importe quel worker,
+    lus dans le status store publié par le leader.
+    Sans details, seuls les champs qui changent avec l'état (CACHED_STATUS_FIELDS)
+    sont retournés: last_check et les échecs consécutifs changent à chaque health check.
+    """
+    header = status_store.read_header()
+    if header is None:
+        return False, {}
+    api_status = status_store.read_all()
+    if not details:
+        api_status = {url: {field: status[field] for field in CACHED_STATUS_FIELDS} for url, status in api_status.items()}
+    return is_monitoring_active(header), api_status
+
+def monitoring_supervisor():
+    """
+    Attend d'être élu leader puis exécute le monitoring.
+    Les autres workers restent en attente et prennent le relais si le leader disparaît.
+    """
+    while not try_acquire_leadership():
+        time.sleep(LEADER_RETRY_INTERVAL)
+    logger.info(f"Worker {os.getpid()} élu leader du monitoring")
+    status_store.open_writer()
+    history_store.open_writer()
+    event_store.open_writer()
+    recover_state()
+    if cluster.enabled:
+        threading.Thread(target=cluster_worker, name='cluster', daemon=True).start()
+    monitoring_worker()
+
+def start_monitoring():
+    """
+    Démarre le thread de monitoring
+    """
+    global monitoring_thread
+    
+    logger.info(f"Tentative de démarrage du monitoring...")
+    logger.info(f"APIs configurées: {MONITORED_APIS}")
+    
+    if not MONITORED_APIS:
+        logger.warning(f"Aucune API à monitorer configurée (ajout possible via {MONITORED_APIS_FILE or 'MONITORED_APIS'})")
+        if not MONITORED_APIS_FILE:
+            return
+    
+    if monitoring_thread is None or not monitoring_thread.is_alive():
+        try:
+            monitoring_thread = threading.Thread(target=monitoring_supervisor, daemon=True)
+            monitoring_thread.start()
+            api_names = [api['name'] for api in MONITORED_APIS]
+            logger.info(f"Monitoring démarré pour {len(MONITORED_APIS)} API(s): {', '.join(api_names)}")
+        except Exception as e:
+            logger.error(f"Erreur lors du démarrage du monitoring: {str(e)}")
+    else:
+        logger.info("Monitoring déjà actif")
+
+class CachedJsonResponse:
+    """
+    Réponse JSON pré-sérialisée, régénérée uniquement quand sa clé change
+    (génération du status store, leader, statistiques publiées...).
+    Les endpoints très sollicités servent ainsi des octets déjà encodés,
+    avec un ETag permettant de répondre 304 aux clients à jour.
+    """
+    
+    def __init__(self, render):
+        self._render = render
+        self._lock = threading.Lock()
+        self._key = None
+        self._body = None
+        self._etag = None
+    
+    def response(self, key):
+        with self._lock:
+            if self._body is None or key != self._key:
+                self._body = app.json.dumps(self._render()).encode()
+                self._etag = hashlib.blake2b(self._body, digest_size=12).hexdigest()
+                self._key = key
+            body, etag = self._body, self._etag
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
+metrics_cache = {'expires': 0.0, 'body': None}
+metrics_cache_lock = threading.Lock()
+
+def export_leader_metrics():
+    """
+    Publie les métriques du leader pour que n'importe quel worker puisse les servir
+    """
+    if not LEADER_ELECTION:
+        return
+    tmp_path = f"{METRICS_EXPORT_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(metrics.render())
+        os.replace(tmp_path, METRICS_EXPORT_PATH)
+    except OSError as e:
+        logger.error(f"Erreur d'export des métriques: {str(e)}")
+
+def render_status_metrics():
+    """
+    Jauges dérivées du status store et des statistiques publiées par le leader
+    """
+    monitoring_active, shared_api_status = get_shared_status()
+    stats = status_store.read_stats()
+    lines = [
+        "# HELP jira_webhook_monitoring_active Monitoring actif (leader présent)",
+        "# TYPE jira_webhook_monitoring_active gauge",
+        f"jira_webhook_monitoring_active {int(monitoring_active)}",
+        "# HELP jira_webhook_api_up API joignable (tout état sauf DOWN, détail dans jira_webhook_api_state)",
+        "# TYPE jira_webhook_api_up gauge"
+    ]
+    for state in shared_api_status.values():
+        if state['status'] != 'unknown':
+            lines.append(f'jira_webhook_api_up{{api="{escape_label_value(state["name"])}"}} {int(state["status"] != "down")}')
+    lines += [
+        "# HELP jira_webhook_api_consecutive_failures Échecs consécutifs par API",
+        "# TYPE jira_webhook_api_consecutive_failures gauge"
+    ]
+    for state in shared_api_status.values():
+        lines.append(f'jira_webhook_api_consecutive_failures{{api="{escape_label_value(state["name"])}"}} {state["consecutive_failures"]}')
+    lines += [
+        "# HELP jira_webhook_api_state État de chaque API (unknown, up, degraded, down, flapping, recovering)",
+        "# TYPE jira_webhook_api_state gauge"
+    ]
+    for state in shared_api_status.values():
+        lines.append(f'jira_webhook_api_state{{api="{escape_label_value(state["name"])}",state="{state["status"]}"}} 1')
+    
+    jira_queue = stats.get('jira_queue', {})
+    scheduler = stats.get('scheduler', {})
+    leader_metrics = [
+        ('jira_webhook_jira_queue_depth', 'gauge', "Tickets en attente d'envoi", jira_queue.get('queue_depth')),
+        ('jira_webhook_jira_retries_total', 'counter', "Nouvelles tentatives d'appel à Jira", jira_queue.get('retries')),
+        ('jira_webhook_scheduler_targets', 'gauge', "APIs planifiées", scheduler.get('targets')),
+        ('jira_webhook_probes_in_flight', 'gauge', "Health checks en cours", scheduler.get('in_flight'))
+    ]
+    for name, metric_type, help_text, value in leader_metrics:
+        if value is not None:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}", f"{name} {value}"]
+    return '\n'.join(lines) + '\n'
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """
+    Endpoint Prometheus/OpenMetrics (mis en cache METRICS_CACHE_TTL secondes)
+    """
+    with metrics_cache_lock:
+        now = time.monotonic()
+        if metrics_cache['body'] is None or now >= metrics_cache['expires']:
+            if is_leader() or not LEADER_ELECTION:
+                process_metrics = metrics.render()
+            else:
+                try:
+                    with open(METRICS_EXPORT_PATH, encoding='utf-8') as f:
+                        process_metrics = f.read()
+                except OSError:
+                    process_metrics = ''
+            metrics_cache['body'] = (render_status_metrics() + process_metrics).encode()
+            metrics_cache['expires'] = now + METRICS_CACHE_TTL
+        body = metrics_cache['body']
+    return Response(body, mimetype='text/plain', content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def render_health():
+    header = status_store.read_header()
+    monitoring_active, shared_api_status = get_shared_status(details=False)
+    return {
+        "status": "healthy",
+        # Dernier changement d'état publié (pas l'heure de la requête): corps et ETag
+        # identiques dans tous les workers tant que l'état ne change pas
+        "timestamp": datetime.fromtimestamp(header['changed_at']).isoformat() if header else None,
+        "jira_configured": bool(JIRA_URL and JIRA_USERNAME and JIRA_API_TOKEN and JIRA_PROJECT_KEY),
+        "monitoring_active": monitoring_active,
+        "monitored_apis": len(MONITORED_APIS),
+        "api_status": shared_api_status
+    }
+
+health_response = CachedJsonResponse(render_health)
+
+def status_cache_key(header):
+    if header is None:
+        return None
+    return (header['leader_pid'], header['generation'], is_monitoring_active(header), targets_state['version'])
+
+@app.route('/health', methods=['GET'])
+def health_check():
+    """
+    Endpoint de santé pour vérifier que le service fonctionne
+    (réponse mise en cache tant que l'état des APIs ne change pas)
+    """
+    return health_response.response(status_cache_key(status_store.read_header()))
+
+LIVENESS_BODY = b'{"status":"alive"}\n'
+
+@app.route('/livez', methods=['GET'])
+def liveness():
+    """
+    Endpoint de liveness minimal: ne lit ni ne sérialise l'état des APIs
+    """
+    return Response(LIVENESS_BODY, mimetype='application/json')
+
+@app.route('/', methods=['GET'])
+def home():
+    """
+    Page d'accueil avec des informations sur le service
+    """
+    return jsonify({
+        "service": "Jira Webhook for API Monitoring",
+        "version": "1.0.0",
+        "endpoints": {
+            "health": "/health",
+            "liveness": "/livez",
+            "metrics": "/metrics",
+            "monitoring_status": "/monitoring/status",
+            "monitoring_history": "/monitoring/history/<name>",
+            "monitoring_targets": "/monitoring/targets",
+            "monitoring_stream": "/monitoring/stream",
+            "monitoring_maintenance": "/monitoring/maintenance",
+            "monitoring_cluster": "/monitoring/cluster",
+            "monitoring_probe": "/monitoring/probe",
+            "start_monitoring": "/monitoring/start"
+        },
+        "status": "running",
+        "monitoring_active": get_shared_status()[0]
+    })
+
+def render_monitoring_status(details=False):
+    monitoring_active, shared_api_status = get_shared_status(details)
+    # Champs propres au worker (is_leader, worker_pid) seulement sans cache: la réponse
+    # mise en cache est identique dans tous les workers, avec le même ETag
+    worker = {"is_leader": is_leader(), "worker_pid": os.getpid()} if details else {}
+    return {
+        "monitoring_active": monitoring_active,
+        **worker,
+        "monitored_apis": MONITORED_APIS,
+        "api_status": shared_api_status,
+        "config": {
+            "health_check_interval": HEALTH_CHECK_INTERVAL,
+            "timeout": TIMEOUT,
+            "retry_attempts": RETRY_ATTEMPTS,
+            "retry_interval": HEALTH_CHECK_RETRY_INTERVAL,
+            "max_backoff": HEALTH_CHECK_MAX_BACKOFF,
+            "jitter": HEALTH_CHECK_JITTER,
+            "concurrency": PROBE_CONCURRENCY,
+            "ticket_summary_prefix": TICKET_SUMMARY_PREFIX,
+            "ticket_description_message": TICKET_DESCRIPTION_MESSAGE
+        },
+        # Statistiques d'exécution du leader: publiées toutes les HOUSEKEEPING_INTERVAL secondes
+        **(status_store.read_stats() if details else {})
+    }
+
+monitoring_status_response = CachedJsonResponse(render_monitoring_status)
+
+@app.route('/monitoring/status', methods=['GET'])
+def monitoring_status():
+    """
+    Endpoint pour voir le statut du monitoring des APIs
+    (réponse mise en cache tant que l'état des APIs ne change pas).
+    Avec ?details=true: dernier health check, échecs consécutifs et
+    statistiques d'exécution du leader, sans cache.
+    """
+    if request.args.get('details', 'false').lower() == 'true':
+        return jsonify(render_monitoring_status(details=True))
+    return monitoring_status_response.response(status_cache_key(status_store.read_header()))
+
+def stream_cursor():
+    """
+    Position de reprise d'un client: Last-Event-ID (reconnexion SSE) ou ?last_event_id=.
+    Sans position, le client ne reçoit que les événements à venir.
+    """
+    value = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        return max(0, int(value)) if value else None
+    except ValueError:
+        return None
+
+def format_sse(event_id, event, data):
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.route('/monitoring/stream', methods=['GET'])
+def monitoring_stream():
+    """
+    Flux des changements d'état des APIs (Server-Sent Events), reprise via Last-Event-ID.
+    Un événement "reset" signale que des événements ont été perdus: le client relit
+    /monitoring/status. La connexion est fermée après STREAM_MAX_DURATION secondes
+    (le navigateur se reconnecte seul là où il s'était arrêté).
+    Avec Accept autre que text/event-stream, ou ?mode=poll: long-poll JSON.
+    """
+    cursor = stream_cursor()
+    if request.args.get('mode') == 'poll' or 'text/event-stream' not in request.headers.get('Accept', ''):
+        return long_poll_events(cursor)
+    
+    def generate():
+        position = event_store.last_id() if cursor is None else cursor
+        deadline = time.monotonic() + STREAM_MAX_DURATION
+        last_sent = time.monotonic()
+        yield "retry: 3000\n\n"
+        while time.monotonic() < deadline:
+            events, last_id, complete = event_store.read_since(position)
+            if not complete:
+                yield format_sse(last_id, 'reset', {"last_event_id": last_id})
+            for event_id, event in events:
+                yield format_sse(event_id, 'transition', event)
+            if events or not complete:
+                position, last_sent = last_id, time.monotonic()
+            elif time.monotonic() - last_sent >= STREAM_KEEPALIVE:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            else:
+                time.sleep(STREAM_POLL_INTERVAL)
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def long_poll_events(cursor):
+    """
+    Long-poll: répond dès qu'un événement postérieur au curseur est disponible,
+    ou après ?timeout= secondes (LONG_POLL_TIMEOUT au plus) avec une liste vide
+    """
+    position = event_store.last_id() if cursor is None else cursor
+    try:
+        timeout = min(LONG_POLL_TIMEOUT, max(0.0, float(request.args.get('timeout', LONG_POLL_TIMEOUT))))
+    except ValueError:
+        timeout = LONG_POLL_TIMEOUT
+    deadline = time.monotonic() + timeout
+    while True:
+        events, last_id, complete = event_store.read_since(position)
+        if events or not complete or time.monotonic() >= deadline:
+            break
+        time.sleep(STREAM_POLL_INTERVAL)
+    return jsonify({
+        "events": [dict(event, id=event_id) for event_id, event in events],
+        "last_event_id": last_id,
+        "reset": not complete
+    })
+
+def parse_time_param(value, default):
+    """
+    Convertit un paramètre de requête (timestamp ou date ISO) en timestamp
+    """
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+@app.route('/monitoring/history/<name>', methods=['GET'])
+def monitoring_history(name):
+    """
+    Historique des health checks d'une API sur une plage de temps
+    
+    Paramètres: from / to (timestamp ou ISO, défaut: dernière heure),
+    resolution (raw, 1m, 1h), samples=false pour n'obtenir que le résumé
+    """
+    api = next((api for api in MONITORED_APIS if api['name'] == name), None)
+    if api is None:
+        return jsonify({"error": f"API inconnue: {name}"}), 404
+    
+    now = time.time()
+    try:
+        end = parse_time_param(request.args.get('to'), now)
+        start = parse_time_param(request.args.get('from'), end - 3600)
+    except ValueError:
+        return jsonify({"error": "Paramètres from/to invalides (timestamp ou date ISO attendus)"}), 400
+    resolution = request.args.get('resolution', 'raw')
+    if resolution not in ('raw', '1m', '1h'):
+        return jsonify({"error": "resolution doit valoir raw, 1m ou 1h"}), 400
+    
+    points = history_store.query(api['url'].strip(), start, end, resolution) or []
+    for point in points:
+        point['timestamp'] = datetime.fromtimestamp(point['timestamp']).isoformat()
+    
+    if resolution == 'raw':
+        summary = summarize_history(points)
+    else:
+        total = sum(p['count'] for p in points)
+        failures = sum(p['failures'] for p in points)
+        summary = {
+            'count': total,
+            'failures': failures,
+            'availability': round(1 - failures / total, 4) if total else None,
+            'latency_max_ms': max((p['latency_max_ms'] for p in points), default=None)
+        }
+    
+    response = {
+        "name": name,
+        "url": api['url'],
+        "from": datetime.fromtimestamp(start).isoformat(),
+        "to": datetime.fromtimestamp(end).isoformat(),
+        "resolution": resolution,
+        "summary": summary
+    }
+    if request.args.get('samples', 'true').lower() != 'false':
+        response["points"] = points
+    return jsonify(response)
+
+def fetch_shard_status(node, url):
+    """
+    Statut d'une instance du cluster (lecture locale pour cette instance)
+    """
+    if node == cluster.node_id:
+        return render_monitoring_status()
+    try:
+        response = http_pool.get(url).get(f"{url}/monitoring/status", timeout=CLUSTER_PEER_TIMEOUT)
+        if response.status_code != 200:
+            return {"error": f"HTTP {response.status_code}"}
+        return response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return {"error": str(e)}
+
+@app.route('/monitoring/cluster', methods=['GET'])
+def cluster_status():
+    """
+    Vue consolidée du cluster: statuts de toutes les instances fusionnés
+    (n'importe quelle instance peut servir de coordinateur)
+    """
+    if not cluster.enabled:
+        return jsonify({"error": "Sharding désactivé (CLUSTER_NODE_ID non défini)"}), 404
+    
+    # Membres vus par le leader de cette instance (sinon configuration locale)
+    members = status_store.read_stats().get('cluster', cluster.stats())['members']
+    nodes = [(node, member['url']) for node, member in members.items() if member['alive']]
+    with ThreadPoolExecutor(max_workers=min(8, len(nodes))) as executor:
+        statuses = list(executor.map(lambda member: fetch_shard_status(*member), nodes))
+    
+    merged, shards = {}, {}
+    for (node, url), status in zip(nodes, statuses):
+        api_statuses = status.get('api_status', {})
+        for api_url, state in api_statuses.items():
+            merged[api_url] = dict(state, shard=node)
+        shards[node] = {
+            "url": url,
+            "monitoring_active": status.get('monitoring_active', False),
+            "apis": len(api_statuses),
+            **({"error": status['error']} if 'error' in status else {})
+        }
+    for node, member in members.items():
+        if not member['alive']:
+            shards[node] = {"url": member['url'], "monitoring_active": False, "apis": 0, "error": "instance injoignable"}
+    
+    return jsonify({
+        "node_id": cluster.node_id,
+        "monitored_apis": len(MONITORED_APIS),
+        "shards": shards,
+        "api_status": merged
+    })
+
+def admin_request_error():
+    """
+    Refuse une écriture d'administration sans jeton valide.
+    Sans ADMIN_TOKEN, les écritures sont refusées sauf ADMIN_ALLOW_UNAUTHENTICATED=true.
+    
+    Returns:
+        None si la requête est autorisée, sinon la réponse d'erreur (corps, code)
+    """
+    if not ADMIN_TOKEN:
+        if ADMIN_ALLOW_UNAUTHENTICATED:
+            return None
+        return jsonify({"error": "ADMIN_TOKEN n'est pas configuré, modifications désactivées"}), 403
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {ADMIN_TOKEN}"):
+        return jsonify({"error": "Non autorisé"}), 401
+    return None
+
+@app.route('/monitoring/maintenance', methods=['GET'])
+def list_maintenance_windows():
+    """
+    Fenêtres de maintenance, avec leur prochaine occurrence et les APIs couvertes
+    """
+    if not MAINTENANCE_FILE:
+        return jsonify({"error": "MAINTENANCE_FILE n'est pas configuré"}), 400
+    maintenance.reload()
+    return jsonify({"windows": maintenance.describe()})
+
+@app.route('/monitoring/maintenance', methods=['POST'])
+def create_maintenance_window():
+    """
+    Crée (ou remplace, à id identique) une fenêtre de maintenance.
+    Les health checks continuent pendant la fenêtre, seuls les tickets sont suspendus.
+    """
+    error = admin_request_error()
+    if error:
+        return error
+    if not MAINTENANCE_FILE:
+        return jsonify({"error": "MAINTENANCE_FILE n'est pas configuré"}), 400
+    try:
+        window = normalize_window(request.get_json(force=True, silent=False))
+    except Exception as e:
+        return jsonify({"error": f"Fenêtre invalide: {str(e)}"}), 400
+    
+    try:
+        maintenance.add(window)
+    except OSError as e:
+        return jsonify({"error": f"Écriture de {MAINTENANCE_FILE} impossible: {str(e)}"}), 500
+    logger.info(f"🔧 Fenêtre de maintenance {window['id']} créée ({window.get('reason', 'sans motif')})")
+    return jsonify({"message": "Fenêtre de maintenance créée", "window": window}), 201
+
+@app.route('/monitoring/maintenance/<window_id>', methods=['DELETE'])
+def delete_maintenance_window(window_id):
+    """
+    Supprime une fenêtre de maintenance
+    """
+    error = admin_request_error()
+    if error:
+        return error
+    if not MAINTENANCE_FILE:
+        return jsonify({"error": "MAINTENANCE_FILE n'est pas configuré"}), 400
+    try:
+        if not maintenance.remove(window_id):
+            return jsonify({"error": f"Fenêtre {window_id} introuvable"}), 404
+    except OSError as e:
+        return jsonify({"error": f"Écriture de {MAINTENANCE_FILE} impossible: {str(e)}"}), 500
+    logger.info(f"🔧 Fenêtre de maintenance {window_id} supprimée")
+    return jsonify({"message": "Fenêtre de maintenance supprimée"})
+
+@app.route('/monitoring/probe', methods=['POST'])
+def probe_target():
+    """
+    Exécute un health check à la demande d'une autre instance (confirmation d'une panne).
+    Avec VANTAGE_TOKEN, la configuration envoyée est utilisée telle quelle. Sans jeton,
+    seules les APIs monitorées par cette instance peuvent être testées, avec leur
+    configuration locale (méthode, chemin... de l'appelant ignorés).
+    """
+    try:
+        api = normalize_target(request.get_json(force=True, silent=False))
+    except Exception as e:
+        return jsonify({"error": f"Configuration invalide: {str(e)}"}), 400
+    
+    if VANTAGE_TOKEN:
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {VANTAGE_TOKEN}"):
+            return jsonify({"error": "Non autorisé"}), 401
+    else:
+        configured = next((target for target in MONITORED_APIS if target['url'].strip() == api['url']), None)
+        if configured is None:
+            return jsonify({"error": "Non autorisé"}), 401
+        api = configured
+    
+    is_healthy, message, http_code, latency_ms = run_health_check(api)
+    return jsonify({
+        "node_id": CLUSTER_NODE_ID or socket.gethostname(),
+        "healthy": is_healthy,
+        "message": message,
+        "http_code": http_code,
+        "latency_ms": round(latency_ms, 1)
+    })
+
+@app.route('/monitoring/targets', methods=['GET'])
+def get_targets():
+    """
+    Liste des APIs monitorées
+    """
+    return jsonify({"targets": MONITORED_APIS, "source": MONITORED_APIS_FILE if targets_state['mtime'] else "MONITORED_APIS"})
+
+@app.route('/monitoring/targets', methods=['POST'])
+def update_targets():
+    """
+    Remplace la liste des APIs monitorées (liste JSON, ou {"targets": [...]}).
+    La liste est écrite dans MONITORED_APIS_FILE puis appliquée par différence:
+    seules les APIs ajoutées, supprimées ou modifiées sont replanifiées.
+    """
+    error = admin_request_error()
+    if error:
+        return error
+    if not MONITORED_APIS_FILE:
+        return jsonify({"error": "MONITORED_APIS_FILE n'est pas configuré"}), 400
+    try:
+        targets = parse_targets(request.get_json(force=True, silent=False))
+    except Exception as e:
+        return jsonify({"error": f"Configuration invalide: {str(e)}"}), 400
+    
+    try:
+        save_targets(targets)
+    except OSError as e:
+        return jsonify({"error": f"Écriture de {MONITORED_APIS_FILE} impossible: {str(e)}"}), 500
+    reload_targets(force=True)
+    return jsonify({"message": "APIs mises à jour", "monitored_apis": len(MONITORED_APIS)})
 
 @app.route('/monitoring/start', methods=['POST'])
 def start_monitoring_endpoint():
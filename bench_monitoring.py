@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Benchmark du monitoring des APIs
+
+Lance une flotte locale de N faux actuators (latence, taux d'échec, timeouts,
+APIs instables) et un faux Jira, puis exécute le monitoring de app.py dans un
+sous-processus par valeur de N. Les résultats sont écrits en JSON pour pouvoir
+comparer deux versions.
+
+Exemples:
+    python bench_monitoring.py
+    python bench_monitoring.py --sizes 10,100,1000,10000 --duration 90 --output bench.json
+    python bench_monitoring.py --app-dir ../version-precedente --output bench-old.json
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+API_NAME_PATTERN = re.compile(r'\bbench-api-\d+\b')
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Les health checks en timeout ferment la connexion avant la réponse
+        pass
+
+class FakeFleet:
+    """
+    Flotte de faux actuators Spring Boot, répartie sur plusieurs ports (un port = un hôte).
+    Chaque API a un comportement: ok, fail (échecs aléatoires), timeout, flap ou outage
+    (UP puis DOWN à partir de start_outage()).
+    """
+
+    def __init__(self, size, hosts, latency_ms, failure_rate, timeout_rate, flap_rate, flap_period,
+                 outage_rate, probe_timeout, seed):
+        self.size = size
+        self.latency = latency_ms / 1000
+        self.failure_rate = failure_rate
+        self.flap_period = flap_period
+        self.hang = probe_timeout + 1
+        self.rng = random.Random(seed)
+        self.outage_started = None
+        self.lock = threading.Lock()
+        self.hits = [0] * size
+        self.first_hit = [None] * size
+        self.last_hit = [None] * size
+        self.gaps = [[] for _ in range(size)]
+
+        kinds = ['ok'] * size
+        indexes = list(range(size))
+        self.rng.shuffle(indexes)
+        position = 0
+        # Les échecs ponctuels (failure_rate) concernent les APIs restées 'ok'
+        for kind, rate in (('outage', outage_rate), ('timeout', timeout_rate), ('flap', flap_rate)):
+            count = min(size - position, int(round(size * rate)))
+            for i in indexes[position:position + count]:
+                kinds[i] = kind
+            position += count
+        self.kinds = kinds
+
+        self.servers = []
+        for _ in range(max(1, min(hosts, size))):
+            server = QuietHTTPServer(('127.0.0.1', 0), ActuatorHandler)
+            server.fleet = self
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.servers.append(server)
+
+    def url(self, index):
+        server = self.servers[index % len(self.servers)]
+        return f"http://127.0.0.1:{server.server_address[1]}/api-{index}"
+
+    def start_outage(self):
+        self.outage_started = time.monotonic()
+
+    def outage_names(self):
+        return [f"bench-api-{i}" for i, kind in enumerate(self.kinds) if kind == 'outage']
+
+    def respond(self, index):
+        """
+        Enregistre le hit et retourne (code HTTP, statut) selon le comportement de l'API
+        """
+        now = time.monotonic()
+        with self.lock:
+            if self.last_hit[index] is not None:
+                self.gaps[index].append(now - self.last_hit[index])
+            else:
+                self.first_hit[index] = now
+            self.last_hit[index] = now
+            self.hits[index] += 1
+
+        if self.latency:
+            time.sleep(self.latency * self.rng.uniform(0.5, 1.5))
+        kind = self.kinds[index]
+        if kind == 'timeout':
+            time.sleep(self.hang)
+        elif kind == 'outage' and self.outage_started is not None:
+            return 503, 'DOWN'
+        elif kind == 'flap' and int(now / self.flap_period) % 2:
+            return 503, 'DOWN'
+        elif kind == 'ok' and self.rng.random() < self.failure_rate:
+            return 503, 'DOWN'
+        return 200, 'UP'
+
+    def close(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+class ActuatorHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        try:
+            index = int(self.path.split('/')[1].split('-')[1])
+        except (IndexError, ValueError):
+            index = -1
+        if not 0 <= index < self.server.fleet.size:
+            code, status = 404, 'UNKNOWN'
+        else:
+            code, status = self.server.fleet.respond(index)
+        body = json.dumps({'status': status}).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class FakeJira:
+    """
+    Faux serveur Jira REST: création (unitaire et bulk), recherche, commentaires et transitions.
+    Enregistre l'instant où chaque API est signalée pour la première fois: ticket à son nom,
+    incident corrélé qui la liste, ou commentaire de panne ajouté à un ticket ouvert.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.created = 0
+        self.tickets = {}  # {nom de l'API: instant du premier signalement}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.server = QuietHTTPServer(('127.0.0.1', 0), JiraHandler)
+        self.server.jira = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def create(self, fields):
+        # Un incident corrélé liste ses APIs dans la description, pas dans le résumé
+        self.report(f"{fields.get('summary', '')}\n{fields.get('description', '')}")
+        with self.lock:
+            self.created += 1
+            return f"BENCH-{next(self.ids)}"
+
+    def comment(self, body):
+        # Seuls les commentaires de panne (🔴) signalent des APIs, pas les retours UP
+        if body.startswith('🔴'):
+            self.report(body)
+
+    def report(self, text):
+        now = time.monotonic()
+        with self.lock:
+            for api_name in API_NAME_PATTERN.findall(text):
+                self.tickets.setdefault(api_name, now)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class JiraHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, payload):
+        body = json.dumps(payload).encode() if payload is not None else b''
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.jira.requests += 1
+        if self.path.startswith('/rest/api/2/search'):
+            return self._send(200, {'issues': [], 'total': 0, 'startAt': 0, 'maxResults': 50})
+        if self.path.endswith('/transitions'):
+            return self._send(200, {'transitions': []})
+        self._send(404, {})
+
+    def do_POST(self):
+        jira = self.server.jira
+        jira.requests += 1
+        length = int(self.headers.get('Content-Length', 0))
+        data = json.loads(self.rfile.read(length) or b'{}')
+        if self.path == '/rest/api/2/issue':
+            return self._send(201, {'id': '1', 'key': jira.create(data.get('fields', {}))})
+        if self.path == '/rest/api/2/issue/bulk':
+            issues = [{'id': '1', 'key': jira.create(update.get('fields', {}))} for update in data.get('issueUpdates', [])]
+            return self._send(201, {'issues': issues, 'errors': []})
+        if self.path.endswith('/comment'):
+            jira.comment(data.get('body', ''))
+            return self._send(201, {'id': '1'})
+        if self.path.endswith('/transitions'):
+            return self._send(204, None)
+        self._send(404, {})
+
+def raise_fd_limit():
+    """
+    Augmente la limite de descripteurs ouverts (une connexion par hôte et par probe)
+    """
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(fraction * len(values)))], 3)
+
+def run_monitor(args):
+    """
+    Sous-processus: importe app.py, exécute le monitoring pendant la durée demandée
+    puis écrit sa consommation CPU et mémoire en JSON sur la sortie standard
+    """
+    import logging
+    raise_fd_limit()
+    sys.path.insert(0, args.app_dir)
+    start = time.perf_counter()
+    import app
+    import_seconds = time.perf_counter() - start
+    logging.getLogger().setLevel(args.log_level)
+    logging.getLogger('app').setLevel(args.log_level)
+
+    usage_start = resource.getrusage(resource.RUSAGE_SELF)
+    wall_start = time.perf_counter()
+    app.start_monitoring()
+    time.sleep(args.duration)
+    wall = time.perf_counter() - wall_start
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+
+    cpu_seconds = (usage.ru_utime - usage_start.ru_utime) + (usage.ru_stime - usage_start.ru_stime)
+    rss_kb = None
+    try:
+        with open('/proc/self/status') as f:
+            rss_kb = next(int(line.split()[1]) for line in f if line.startswith('VmRSS:'))
+    except (OSError, StopIteration):
+        pass
+    print(json.dumps({
+        "import_seconds": round(import_seconds, 3),
+        "cpu_seconds": round(cpu_seconds, 3),
+        "cpu_percent": round(100 * cpu_seconds / wall, 1),
+        "max_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "rss_mb": round(rss_kb / 1024, 1) if rss_kb is not None else None,
+        "threads": threading.active_count()
+    }), flush=True)
+    os._exit(0)
+
+def bench_size(size, args):
+    """
+    Mesure le monitoring de size APIs: flotte et Jira dans ce processus, monitoring dans un sous-processus
+    """
+    fleet = FakeFleet(size, args.hosts, args.latency_ms, args.failure_rate, args.timeout_rate,
+                      args.flap_rate, args.flap_period, args.outage_rate, args.probe_timeout, args.seed)
+    jira = FakeJira()
+    workdir = tempfile.mkdtemp(prefix='bench-monitoring-')
+    targets_path = os.path.join(workdir, 'targets.json')
+    with open(targets_path, 'w') as f:
+        json.dump({'targets': [{'url': fleet.url(i), 'name': f"bench-api-{i}"} for i in range(size)]}, f)
+
+    env = dict(os.environ)
+    env.update({
+        'JIRA_URL': jira.url,
+        'JIRA_USERNAME': 'bench',
+        'JIRA_API_TOKEN': 'bench',
+        'JIRA_PROJECT_KEY': 'BENCH',
+        'MONITORED_APIS': '',
+        'MONITORED_APIS_FILE': targets_path,
+        'HEALTH_CHECK_INTERVAL': str(args.interval),
+        'HEALTH_CHECK_TIMEOUT': str(args.probe_timeout),
+        'MONITORING_LEADER_ELECTION': 'False',
+        'MONITORING_LOCK_FILE': os.path.join(workdir, 'monitor.lock'),
+        'STATUS_STORE_PATH': os.path.join(workdir, 'status.mmap'),
+        'STATUS_STORE_CAPACITY': str(max(4096, size)),
+        'HISTORY_STORE_PATH': os.path.join(workdir, 'history.mmap'),
+        'STATE_JOURNAL_PATH': os.path.join(workdir, 'state.journal'),
+        'METRICS_EXPORT_PATH': os.path.join(workdir, 'metrics.prom'),
+    })
+    command = [sys.executable, os.path.abspath(__file__), '--monitor', '--duration', str(args.duration),
+               '--app-dir', args.app_dir, '--log-level', args.log_level]
+
+    started = time.monotonic()
+    process = subprocess.Popen(command, env=env, stdout=subprocess.PIPE,
+                               stderr=None if args.verbose else subprocess.DEVNULL, text=True)
+    outage_timer = threading.Timer(args.outage_at, fleet.start_outage)
+    outage_timer.start()
+    try:
+        output, _ = process.communicate(timeout=args.duration + 120)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        output, _ = process.communicate()
+    finally:
+        outage_timer.cancel()
+    ended = time.monotonic()
+
+    try:
+        monitor = json.loads(output.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        monitor = {"error": f"le sous-processus s'est terminé avec le code {process.returncode}"}
+
+    # Détection: début de la panne -> création du ticket
+    detection = []
+    if fleet.outage_started is not None:
+        detection = [jira.tickets[name] - fleet.outage_started
+                     for name in fleet.outage_names() if name in jira.tickets]
+    expected = len(fleet.outage_names()) if fleet.outage_started is not None else 0
+
+    first_hits = [hit for hit in fleet.first_hit if hit is not None]
+    swept = len(first_hits) == size
+    steady_start = max(first_hits) if swept else started
+    steady_probes = sum(len(gaps) for gaps in fleet.gaps)
+    steady_window = max(ended - steady_start, 1e-9)
+    intervals = [gap for gaps, kind in zip(fleet.gaps, fleet.kinds) if kind == 'ok' for gap in gaps]
+
+    result = {
+        "apis": size,
+        "first_sweep_seconds": round(steady_start - started, 3) if swept else None,
+        "apis_probed": len(first_hits),
+        "probe_interval_avg_seconds": round(sum(intervals) / len(intervals), 3) if intervals else None,
+        "probe_interval_p95_seconds": percentile(intervals, 0.95),
+        "probes_total": sum(fleet.hits),
+        "probes_per_second": round(steady_probes / steady_window, 1) if swept else round(sum(fleet.hits) / (ended - started), 1),
+        "detection_latency_seconds": {
+            "p50": percentile(detection, 0.5),
+            "p95": percentile(detection, 0.95),
+            "max": round(max(detection), 3) if detection else None,
+            "detected": len(detection),
+            "expected": expected
+        },
+        "tickets_created": jira.created,
+        "apis_reported": len(jira.tickets),
+        "jira_requests": jira.requests,
+        "monitor": monitor
+    }
+    fleet.close()
+    jira.close()
+    return result
+
+def git_revision(path):
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=path, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du monitoring des APIs (flotte et Jira simulés)")
+    parser.add_argument('--sizes', default='10,100,1000,10000', help="nombres d'APIs, séparés par des virgules")
+    parser.add_argument('--duration', type=float, default=60, help="durée de chaque mesure (secondes)")
+    parser.add_argument('--interval', type=int, default=10, help="HEALTH_CHECK_INTERVAL (secondes)")
+    parser.add_argument('--probe-timeout', type=int, default=2, help="HEALTH_CHECK_TIMEOUT (secondes)")
+    parser.add_argument('--hosts', type=int, default=50, help="nombre d'hôtes (ports) de la flotte")
+    parser.add_argument('--latency-ms', type=float, default=20, help="latence moyenne d'un actuator")
+    parser.add_argument('--failure-rate', type=float, default=0.01, help="probabilité d'échec ponctuel d'un health check")
+    parser.add_argument('--timeout-rate', type=float, default=0.01, help="part des APIs qui ne répondent pas")
+    parser.add_argument('--flap-rate', type=float, default=0.02, help="part des APIs instables (UP/DOWN alternés)")
+    parser.add_argument('--flap-period', type=float, default=15, help="demi-période des APIs instables (secondes)")
+    parser.add_argument('--outage-rate', type=float, default=0.05, help="part des APIs qui tombent pendant la mesure")
+    parser.add_argument('--outage-at', type=float, default=20, help="début de la panne après le lancement (secondes)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--app-dir', default=SCRIPT_DIR, help="répertoire contenant l'app.py à mesurer")
+    parser.add_argument('--log-level', default='WARNING', help="niveau de log du monitoring mesuré")
+    parser.add_argument('--output', help="fichier JSON des résultats (défaut: sortie standard)")
+    parser.add_argument('--verbose', action='store_true', help="affiche les logs du monitoring")
+    parser.add_argument('--monitor', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.app_dir = os.path.abspath(args.app_dir)
+
+    if args.monitor:
+        return run_monitor(args)
+
+    raise_fd_limit()
+    results = []
+    for size in [int(value) for value in args.sizes.split(',') if value.strip()]:
+        print(f"⏱️  {size} API(s) pendant {args.duration:.0f}s...", file=sys.stderr)
+        result = bench_size(size, args)
+        latency = result['detection_latency_seconds']
+        print(f"   cycle {result['probe_interval_avg_seconds']}s, {result['probes_per_second']} probes/s, "
+              f"détection p50 {latency['p50']}s ({latency['detected']}/{latency['expected']}), "
+              f"CPU {result['monitor'].get('cpu_percent')}%, RSS max {result['monitor'].get('max_rss_mb')} Mo",
+              file=sys.stderr)
+        results.append(result)
+
+    report = {
+        "revision": git_revision(args.app_dir),
+        "python": sys.version.split()[0],
+        "date": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "config": {key: value for key, value in vars(args).items() if key not in ('monitor', 'output', 'verbose')},
+        "results": results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Résultats écrits dans {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Configuration des tests unitaires: app.py est importé sans leader, sans fichiers
+partagés ni Jira, puis chaque test reçoit un état de monitoring vierge.
+"""
+import os
+import sys
+
+os.environ.update({
+    'MONITORING_LEADER_ELECTION': 'False',
+    'MONITORED_APIS': '',
+    'MONITORED_APIS_FILE': '',
+    'MAINTENANCE_FILE': '',
+    'STATE_JOURNAL_PATH': '',
+    'CLUSTER_NODE_ID': '',
+    'VANTAGE_POINTS': '',
+    'JIRA_URL': 'http://jira.invalid',
+    'JIRA_PROJECT_KEY': 'MON',
+    'LOG_ASYNC': 'False',
+    'LOG_LEVEL': 'WARNING',
+    'HEALTH_CHECK_RETRY': '3',
+    'HEALTH_CHECK_RECOVERY': '2',
+    'FLAP_WINDOW': '10',
+    'FLAP_HIGH_THRESHOLD': '0.5',
+    'FLAP_LOW_THRESHOLD': '0.25',
+    'SLOW_RESPONSE_MS': '0',
+    'OUTAGE_MIN_APIS': '3',
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import app
+
+# Pas de démarrage automatique du monitoring à la première requête du client de test
+app.startup.monitoring_started = True
+
+
+class RecordingDispatcher:
+    """
+    Remplace le dispatcher Jira: enregistre les demandes au lieu de les envoyer
+    """
+
+    def __init__(self):
+        self.items = []
+
+    def enqueue(self, ticket_type, callback=None, **kwargs):
+        self.items.append((ticket_type, kwargs, callback))
+        return True
+
+    def of_type(self, ticket_type):
+        return [item for item in self.items if item[0] == ticket_type]
+
+
+@pytest.fixture
+def monitoring(monkeypatch, tmp_path):
+    """
+    État de monitoring vierge: statuts, index des tickets, stores et journal propres au test
+    """
+    status_store = app.StatusStore(str(tmp_path / 'status.mmap'), 16)
+    status_store.open_writer()
+    history_store = app.HistoryStore(str(tmp_path / 'history.mmap'), 16, 64, 10, 2)
+    history_store.open_writer()
+    dispatcher = RecordingDispatcher()
+    monkeypatch.setattr(app, 'api_status', {})
+    monkeypatch.setattr(app, 'open_tickets', app.OpenTicketIndex())
+    monkeypatch.setattr(app, 'status_store', status_store)
+    monkeypatch.setattr(app, 'history_store', history_store)
+    monkeypatch.setattr(app, 'event_store', app.EventStore(str(tmp_path / 'events.mmap'), 16))
+    monkeypatch.setattr(app, 'state_journal', app.StateJournal(str(tmp_path / 'state.journal')))
+    monkeypatch.setattr(app, 'maintenance', app.MaintenanceWindows(''))
+    monkeypatch.setattr(app, 'jira_dispatcher', dispatcher)
+    monkeypatch.setattr(app, 'MONITORED_APIS', [{'url': 'http://api1.test', 'name': 'User-Service'}])
+    return dispatcher
@@ -0,0 +1,53 @@
+"""
+Réponses pré-sérialisées de /health et /monitoring/status: même corps et même ETag
+dans tous les workers tant que l'état servi ne change pas
+"""
+from datetime import datetime
+import time
+
+import app
+
+URL = 'http://api1.test'
+
+
+def render_in_new_worker(render):
+    """
+    Rend la réponse comme un autre worker (cache vide), plus tard
+    """
+    time.sleep(0.01)
+    cache = app.CachedJsonResponse(render)
+    with app.app.test_request_context('/'):
+        response = cache.response(app.status_cache_key(app.status_store.read_header()))
+        return response.get_etag()[0], response.get_json()
+
+
+def test_health_is_identical_across_workers_until_state_changes(monitoring):
+    app.apply_check_result(URL, 'User-Service', True, 'OK', http_code=200)
+    etag, body = render_in_new_worker(app.render_health)
+    changed_at = app.status_store.read_header()['changed_at']
+    assert body['timestamp'] == datetime.fromtimestamp(changed_at).isoformat()
+
+    app.apply_check_result(URL, 'User-Service', True, 'OK', http_code=200)
+    assert render_in_new_worker(app.render_health) == (etag, body)
+
+    app.apply_check_result(URL, 'User-Service', False, 'HTTP 503')
+    new_etag, new_body = render_in_new_worker(app.render_health)
+    assert new_etag != etag
+    assert new_body['timestamp'] > body['timestamp']
+
+
+def test_cached_status_has_no_worker_fields(monitoring, monkeypatch):
+    app.apply_check_result(URL, 'User-Service', True, 'OK', http_code=200)
+    etag, body = render_in_new_worker(app.render_monitoring_status)
+    assert 'worker_pid' not in body and 'is_leader' not in body
+    monkeypatch.setattr(app.os, 'getpid', lambda: 424242)
+    assert render_in_new_worker(app.render_monitoring_status)[0] == etag
+    assert app.render_monitoring_status(details=True)['worker_pid'] == 424242
+
+
+def test_client_revalidation_returns_304(monitoring):
+    app.apply_check_result(URL, 'User-Service', True, 'OK', http_code=200)
+    client = app.app.test_client()
+    etag = client.get('/health').headers['ETag']
+    app.apply_check_result(URL, 'User-Service', True, 'OK', http_code=200)
+    assert client.get('/health', headers={'If-None-Match': etag}).status_code == 304
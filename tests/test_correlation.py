@@ -0,0 +1,130 @@
+"""
+Corrélation des pannes: regroupement par clés partagées et rattachement aux incidents ouverts
+"""
+import pytest
+
+import app
+
+
+def down(url):
+    return (0.0, 'api_down', {'api_url': url, 'api_name': url}, None)
+
+
+def urls(items):
+    return sorted(item[2]['api_url'] for item in items)
+
+
+class Scheduler:
+    def __init__(self, dependencies):
+        self.dependencies = dependencies
+
+    def get(self, url):
+        return {'url': url, 'depends_on': self.dependencies.get(url, ())}
+
+
+@pytest.fixture
+def correlator(monkeypatch):
+    monkeypatch.setattr(app, 'open_tickets', app.OpenTicketIndex())
+    monkeypatch.setattr(app, 'OUTAGE_MIN_APIS', 3)
+    return app.OutageCorrelator()
+
+
+def test_default_keys_ignore_host(correlator, monkeypatch):
+    monkeypatch.setattr(app, 'OUTAGE_CORRELATION_KEYS', {'dependency'})
+    monkeypatch.setattr(app, 'probe_scheduler', Scheduler({}))
+    items = [down(f'http://shared.test/api/{i}') for i in range(4)]
+    attachments, groups, singles = correlator.group(items)
+    assert (attachments, groups) == ({}, [])
+    assert urls(singles) == urls(items)
+
+
+def test_group_by_host_requires_min_apis(correlator, monkeypatch):
+    monkeypatch.setattr(app, 'OUTAGE_CORRELATION_KEYS', {'host'})
+    items = [down('http://db.test/a'), down('http://db.test/b'), down('http://db.test/c'),
+             down('http://cache.test/a'), down('http://cache.test/b'), down('http://other.test/')]
+    attachments, groups, singles = correlator.group(items)
+    assert attachments == {}
+    assert len(groups) == 1
+    members, reason, keys = groups[0]
+    assert urls(members) == ['http://db.test/a', 'http://db.test/b', 'http://db.test/c']
+    assert reason == 'hôte db.test'
+    assert keys == {('hôte', 'db.test')}
+    assert urls(singles) == ['http://cache.test/a', 'http://cache.test/b', 'http://other.test/']
+
+
+def test_group_is_transitive_across_keys(correlator, monkeypatch):
+    # a et b partagent postgres, b et c partagent redis: un seul groupe
+    monkeypatch.setattr(app, 'OUTAGE_CORRELATION_KEYS', {'dependency'})
+    monkeypatch.setattr(app, 'probe_scheduler', Scheduler({
+        'http://a.test': ['postgres'],
+        'http://b.test': ['postgres', 'redis'],
+        'http://c.test': ['redis'],
+    }))
+    attachments, groups, singles = correlator.group([down('http://a.test'), down('http://b.test'), down('http://c.test')])
+    assert singles == []
+    members, reason, keys = groups[0]
+    assert urls(members) == ['http://a.test', 'http://b.test', 'http://c.test']
+    assert reason == 'dépendance postgres'
+    assert keys == {('dépendance', 'postgres'), ('dépendance', 'redis')}
+
+
+def test_port_key_uses_scheme_default(correlator, monkeypatch):
+    monkeypatch.setattr(app, 'OUTAGE_CORRELATION_KEYS', {'port'})
+    assert correlator.keys('https://db.test/health') == [('port', 'db.test:443')]
+    assert correlator.keys('tcp://db.test:5432') == [('port', 'db.test:5432')]
+
+
+def test_later_outages_attach_to_open_incident(correlator, monkeypatch):
+    monkeypatch.setattr(app, 'OUTAGE_CORRELATION_KEYS', {'host'})
+    correlator.register({('hôte', 'db.test')}, 'MON-7')
+    app.open_tickets.add('db.test/a', 'MON-7')
+
+    attachments, groups, singles = correlator.group([down('http://db.test/d'), down('http://other.test/')])
+    assert list(attachments) == ['MON-7']
+    assert urls(attachments['MON-7']) == ['http://db.test/d']
+    assert groups == []
+    assert urls(singles) == ['http://other.test/']
+
+
+def test_resolved_incident_is_forgotten(correlator, monkeypatch):
+    monkeypatch.setattr(app, 'OUTAGE_CORRELATION_KEYS', {'host'})
+    correlator.register({('hôte', 'db.test')}, 'MON-7')
+    attachments, groups, singles = correlator.group([down('http://db.test/d')])
+    assert attachments == {}
+    assert urls(singles) == ['http://db.test/d']
+    assert correlator.stats() == {'active_incidents': 0}
+
+
+def test_dispatcher_opens_one_incident_then_attaches(monitoring, monkeypatch):
+    monkeypatch.setattr(app, 'OUTAGE_CORRELATION_KEYS', {'host'})
+    monkeypatch.setattr(app, 'outage_correlator', app.OutageCorrelator())
+    items = [down(f'http://db.test/{name}') for name in 'abcd']
+    for _, _, kwargs, _ in items:
+        kwargs['error_message'] = 'HTTP 503'
+        app.api_status[kwargs['api_url']] = app.ApiState(kwargs['api_name'], status='down')
+    created, comments = [], []
+
+    def create(ticket_type, on_retry=None, **kwargs):
+        created.append((ticket_type, kwargs))
+        return {'success': True, 'ticket_key': 'MON-7', 'ticket_url': f"{app.JIRA_URL}/browse/MON-7"}
+
+    def comment(ticket_key, body, on_retry=None):
+        comments.append(ticket_key)
+        return {'success': True, 'ticket_key': ticket_key, 'ticket_url': f"{app.JIRA_URL}/browse/{ticket_key}"}
+
+    monkeypatch.setattr(app, 'create_jira_ticket', create)
+    monkeypatch.setattr(app, 'comment_jira_ticket', comment)
+    dispatcher = app.JiraDispatcher(10)
+
+    completed = dispatcher._create_tickets(items[:3])
+    assert [ticket_type for ticket_type, _ in created] == ['incident']
+    assert sorted(api['api_url'] for api in created[0][1]['apis']) == ['http://db.test/a', 'http://db.test/b', 'http://db.test/c']
+    assert {result['ticket_key'] for _, result in completed} == {'MON-7'}
+    assert (dispatcher.incidents, dispatcher.correlated) == (1, 3)
+
+    # Panne suivante sur le même hôte: commentée sur l'incident, sans nouveau ticket
+    [(item, result)] = dispatcher._create_tickets(items[3:])
+    assert len(created) == 1
+    assert comments == ['MON-7']
+    assert result['incident'] and result['ticket_key'] == 'MON-7'
+    assert app.open_tickets.get('http://db.test/d')['key'] == 'MON-7'
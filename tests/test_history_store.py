@@ -0,0 +1,45 @@
+"""
+Historique des health checks (HistoryStore): requêtes par intervalle sur le ring buffer,
+agrégats et lecture de repli quand le seqlock reste impair
+"""
+import pytest
+
+import app
+
+
+@pytest.fixture
+def history_store(tmp_path):
+    store = app.HistoryStore(str(tmp_path / 'history.mmap'), 4, 16, 10, 2)
+    store.open_writer()
+    return store
+
+
+def stick_seq_odd(mm, offset):
+    seq = app.StatusStore.SEQ.unpack_from(mm, offset)[0]
+    app.StatusStore.SEQ.pack_into(mm, offset, seq | 1)
+
+
+def test_history_query_returns_range_in_order(history_store):
+    for second in range(20):
+        history_store.record('http://api1.test', 1000.0 + second, second % 5 != 0, 'OK', 200, 10.0 + second)
+    # Ring buffer de 16 résultats: les 4 plus anciens ont été écrasés
+    samples = history_store.query('http://api1.test', 0, 2000)
+    assert [sample['timestamp'] for sample in samples] == [1000.0 + second for second in range(4, 20)]
+    window = history_store.query('http://api1.test', 1010, 1012)
+    assert [(sample['timestamp'], sample['healthy'], sample['latency_ms']) for sample in window] == [
+        (1010.0, False, 20.0), (1011.0, True, 21.0), (1012.0, True, 22.0)
+    ]
+    assert history_store.query('http://unknown.test', 0, 2000) is None
+
+
+def test_history_rollup(history_store):
+    for second in range(0, 120, 10):
+        history_store.record('http://api1.test', 6000.0 + second, second != 30, 'OK', 200, 20.0)
+    buckets = history_store.query('http://api1.test', 6000, 6119, resolution='1m')
+    assert [(bucket['count'], bucket['failures']) for bucket in buckets] == [(6, 1), (6, 0)]
+
+
+def test_history_query_with_stuck_seqlock(history_store):
+    history_store.record('http://api1.test', 1000.0, True, 'OK', 200, 12.0)
+    stick_seq_odd(history_store._mm, history_store._region_offset(history_store._slots['http://api1.test']))
+    assert [sample['latency_ms'] for sample in history_store.query('http://api1.test', 0, 2000)] == [12.0]
@@ -0,0 +1,154 @@
+"""
+Appels Jira: nouvelles tentatives (Retry-After, backoff), POST jamais rejoué quand son
+résultat est inconnu (JiraOutcomeUnknown) et résultats de la création bulk
+"""
+from email.utils import formatdate
+import time
+
+import pytest
+import requests
+
+import app
+
+
+class Response:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self.data = data or {}
+        self.headers = headers or {}
+        self.text = ''
+
+    def json(self):
+        return self.data
+
+
+class Session:
+    """
+    Session Jira simulée: renvoie (ou lève) les réponses prévues, dans l'ordre
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls.append((method, url.replace(app.JIRA_URL, '')))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def jira(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(app.time, 'sleep', sleeps.append)
+    monkeypatch.setattr(app, 'JIRA_MAX_RETRIES', 3)
+
+    def install(*outcomes):
+        session = Session(*outcomes)
+        session.sleeps = sleeps
+        monkeypatch.setattr(app, 'get_jira_session', lambda: session)
+        return session
+    return install
+
+
+def summary(api_name):
+    return f"{app.TICKET_SUMMARY_PREFIX} - {api_name}"
+
+
+def test_retry_after_seconds_and_http_date():
+    assert app.get_retry_delay(Response(429, headers={'Retry-After': '7'}), 0) == 7
+    delay = app.get_retry_delay(Response(503, headers={'Retry-After': formatdate(time.time() + 20, usegmt=True)}), 0)
+    assert 18 <= delay <= 20
+
+
+def test_retry_after_beyond_backoff_max_is_honoured(monkeypatch):
+    monkeypatch.setattr(app, 'JIRA_BACKOFF_MAX', 60)
+    monkeypatch.setattr(app, 'JIRA_RETRY_AFTER_MAX', 900)
+    assert app.get_retry_delay(Response(429, headers={'Retry-After': '120'}), 0) == 120
+    assert app.get_retry_delay(Response(429, headers={'Retry-After': '86400'}), 0) == 900
+
+
+def test_backoff_without_retry_after(monkeypatch):
+    monkeypatch.setattr(app, 'JIRA_BACKOFF_BASE', 1)
+    monkeypatch.setattr(app, 'JIRA_BACKOFF_MAX', 60)
+    assert 2 <= app.get_retry_delay(Response(503), 2) <= 4
+    assert 30 <= app.get_retry_delay(Response(503), 10) <= 60
+    assert 0.5 <= app.get_retry_delay(None, 0) <= 1
+
+
+def test_post_retried_after_429_with_retry_after(jira):
+    session = jira(Response(429, headers={'Retry-After': '2'}), Response(201, {'key': 'MON-1'}))
+    retries = []
+    response = app.jira_request('POST', '/rest/api/2/issue', on_retry=lambda: retries.append(1), json={})
+    assert response.status_code == 201
+    assert len(session.calls) == 2
+    assert session.sleeps == [2]
+    assert retries == [1]
+
+
+def test_get_retried_after_read_timeout(jira):
+    session = jira(requests.exceptions.ReadTimeout('lent'), Response(200, {'issues': []}))
+    assert app.jira_request('GET', '/rest/api/2/search').status_code == 200
+    assert len(session.calls) == 2
+
+
+@pytest.mark.parametrize('outcome', [Response(504), requests.exceptions.ReadTimeout('réponse perdue')])
+def test_post_with_unknown_outcome_is_not_replayed(jira, outcome):
+    session = jira(outcome)
+    with pytest.raises(app.JiraOutcomeUnknown):
+        app.jira_request('POST', '/rest/api/2/issue', json={})
+    assert len(session.calls) == 1
+
+
+def test_post_retried_when_connection_never_established(jira):
+    session = jira(requests.exceptions.ConnectTimeout('injoignable'), Response(201, {'key': 'MON-1'}))
+    assert app.jira_request('POST', '/rest/api/2/issue', json={}).status_code == 201
+    assert len(session.calls) == 2
+
+
+def test_retries_exhausted(jira):
+    session = jira(*[Response(503)] * 4)
+    assert app.jira_request('GET', '/rest/api/2/search').status_code == 503
+    assert len(session.calls) == 4
+
+
+def test_lost_create_response_finds_ticket(jira):
+    session = jira(
+        requests.exceptions.ReadTimeout('réponse perdue'),
+        Response(200, {'issues': [{'key': 'MON-3', 'fields': {'summary': summary('User-Service')}}]})
+    )
+    result = app.create_jira_ticket('api_down', api_url='http://api1.test', api_name='User-Service', error_message='HTTP 503')
+    assert (result['success'], result['ticket_key']) == (True, 'MON-3')
+    assert [method for method, _ in session.calls] == ['POST', 'GET']
+
+
+def test_lost_create_response_without_ticket_fails(jira):
+    jira(requests.exceptions.ReadTimeout('réponse perdue'), Response(200, {'issues': []}))
+    result = app.create_jira_ticket('api_down', api_url='http://api1.test', api_name='User-Service', error_message='HTTP 503')
+    assert not result['success']
+
+
+def test_bulk_results_follow_ticket_order(jira):
+    jira(Response(201, {
+        'issues': [{'key': 'MON-1'}, {'key': 'MON-2'}],
+        'errors': [{'failedElementNumber': 1, 'elementErrors': {'errors': {'summary': 'trop long'}}}]
+    }))
+    tickets = [('api_down', {'api_url': f'http://api{index}.test', 'api_name': f'API-{index}', 'error_message': 'HTTP 503'})
+               for index in range(3)]
+    results = app.create_jira_tickets_bulk(tickets)
+    assert [result.get('ticket_key') for result in results] == ['MON-1', None, 'MON-2']
+    assert 'trop long' in results[1]['error']
+
+
+def test_lost_bulk_response_keeps_tickets_found(jira):
+    jira(
+        Response(502),
+        Response(200, {'issues': [{'key': 'MON-8', 'fields': {'summary': summary('API-1')}}]})
+    )
+    tickets = [('api_down', {'api_url': f'http://api{index}.test', 'api_name': f'API-{index}', 'error_message': 'HTTP 503'})
+               for index in range(2)]
+    results = app.create_jira_tickets_bulk(tickets)
+    assert [result['success'] for result in results] == [False, True]
+    assert results[1]['ticket_key'] == 'MON-8'
@@ -0,0 +1,138 @@
+"""
+Fenêtres de maintenance: expressions cron, fusion des fenêtres qui se chevauchent
+et suppression des tickets une seule fois par panne
+"""
+from datetime import datetime
+import threading
+
+import pytest
+
+import app
+
+
+def at(*args):
+    return datetime(*args).timestamp()
+
+
+def fire_times(expression, start, end):
+    return [datetime.fromtimestamp(t).strftime('%a %d %H:%M') for t in app.cron_occurrences(expression, at(*start), at(*end))]
+
+
+def test_parse_cron_lists_ranges_and_steps():
+    minutes, hours, days, months, weekdays, day_restricted, weekday_restricted = app.parse_cron('0,30 8-18/2 1 * 1-5')
+    assert minutes == {0, 30}
+    assert hours == {8, 10, 12, 14, 16, 18}
+    assert days == {1}
+    assert months == set(range(1, 13))
+    assert weekdays == {1, 2, 3, 4, 5}
+    assert (day_restricted, weekday_restricted) == (True, True)
+
+
+def test_parse_cron_sunday_is_0_or_7():
+    assert app.parse_cron('0 0 * * 7')[4] == {0, 7}
+
+
+@pytest.mark.parametrize('expression', ['* * *', '60 * * * *', '* 24 * * *', '* * 0 * *', '5-1 * * * *', '*/0 * * * *'])
+def test_parse_cron_rejects_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        app.parse_cron(expression)
+
+
+def test_cron_day_of_week_only():
+    # Dimanches d'octobre 2026 à 2h30
+    assert fire_times('30 2 * * 0', (2026, 10, 1), (2026, 11, 1)) == [
+        'Sun 04 02:30', 'Sun 11 02:30', 'Sun 18 02:30', 'Sun 25 02:30'
+    ]
+
+
+def test_cron_day_of_month_and_day_of_week_match_either():
+    # Comme cron: jour du mois ET jour de la semaine restreints -> l'un OU l'autre suffit
+    assert fire_times('0 9 13 * 5', (2026, 11, 1), (2026, 11, 21)) == [
+        'Fri 06 09:00', 'Fri 13 09:00', 'Fri 20 09:00'
+    ]
+    assert fire_times('0 9 12 * 5', (2026, 11, 1), (2026, 11, 14)) == [
+        'Fri 06 09:00', 'Thu 12 09:00', 'Fri 13 09:00'
+    ]
+
+
+def test_cron_day_of_month_with_wildcard_weekday():
+    assert fire_times('0 0 1,15 * *', (2026, 1, 1), (2026, 3, 1)) == [
+        'Thu 01 00:00', 'Thu 15 00:00', 'Sun 01 00:00', 'Sun 15 00:00'
+    ]
+
+
+@pytest.fixture
+def windows(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'MONITORED_APIS', [
+        {'url': 'http://pay.test', 'name': 'Payment-Service', 'tags': ['paiement']},
+        {'url': 'http://user.test', 'name': 'User-Service'},
+    ])
+    monkeypatch.setitem(app.targets_state, 'version', app.targets_state['version'] + 1)
+    return app.MaintenanceWindows(str(tmp_path / 'maintenance.json'))
+
+
+def test_overlapping_windows_are_merged(windows):
+    windows.add(app.normalize_window({'id': 'a', 'api': 'Payment-Service', 'start': at(2026, 1, 12, 22, 0), 'end': at(2026, 1, 12, 23, 0)}))
+    windows.add(app.normalize_window({'id': 'b', 'tag': 'paiement', 'start': at(2026, 1, 12, 22, 30), 'end': at(2026, 1, 13, 0, 30)}))
+    windows.add(app.normalize_window({'id': 'c', 'glob': '*-Service', 'start': at(2026, 1, 13, 1, 0), 'end': at(2026, 1, 13, 2, 0)}))
+    assert windows.silenced('http://pay.test', now=at(2026, 1, 12, 21, 59)) is None
+    assert windows.silenced('http://pay.test', now=at(2026, 1, 12, 22, 0)) == at(2026, 1, 13, 0, 30)
+    assert windows.silenced('http://pay.test', now=at(2026, 1, 12, 23, 30)) == at(2026, 1, 13, 0, 30)
+    assert windows.silenced('http://pay.test', now=at(2026, 1, 13, 0, 45)) is None
+    assert windows.silenced('http://pay.test', now=at(2026, 1, 13, 1, 15)) == at(2026, 1, 13, 2, 0)
+    assert windows.silenced('http://user.test', now=at(2026, 1, 13, 0, 0)) is None
+    assert windows.silenced('http://user.test', now=at(2026, 1, 13, 1, 15)) == at(2026, 1, 13, 2, 0)
+
+
+def test_recurring_window_bounded_by_start(windows):
+    windows.add(app.normalize_window({'id': 'r', 'api': 'http://user.test', 'cron': '0 3 * * *', 'duration': 1800,
+                                      'start': at(2026, 1, 13, 3, 10)}))
+    assert windows.silenced('http://user.test', now=at(2026, 1, 12, 12, 0)) is None
+    assert windows.silenced('http://user.test', now=at(2026, 1, 13, 3, 5)) is None
+    assert windows.silenced('http://user.test', now=at(2026, 1, 13, 3, 15)) == at(2026, 1, 13, 3, 30)
+
+
+def test_suppression_counted_once_per_outage(monitoring, monkeypatch, tmp_path):
+    windows = app.MaintenanceWindows(str(tmp_path / 'maintenance.json'))
+    windows.add(app.normalize_window({'api': 'User-Service', 'start': datetime.now().timestamp() - 60,
+                                      'end': datetime.now().timestamp() + 3600}))
+    monkeypatch.setattr(app, 'maintenance', windows)
+    suppressed = app.metrics._merge()[0].get(('jira_webhook_tickets_suppressed_total', ('User-Service',)), 0)
+
+    for _ in range(app.RETRY_ATTEMPTS + 3):
+        app.apply_check_result('http://api1.test', 'User-Service', False, 'HTTP 503')
+
+    assert app.api_status['http://api1.test'].status == 'down'
+    assert monitoring.of_type('api_down') == []
+    assert app.metrics._merge()[0].get(('jira_webhook_tickets_suppressed_total', ('User-Service',)), 0) == suppressed + 1
+
+
+def test_workers_do_not_overwrite_each_other(tmp_path):
+    # Deux workers, chacun avec sa vue (rechargée au plus une fois par TARGETS_RELOAD_INTERVAL)
+    path = str(tmp_path / 'maintenance.json')
+    first, second = app.MaintenanceWindows(path), app.MaintenanceWindows(path)
+    window = {'api': 'User-Service', 'start': at(2026, 1, 12, 22, 0), 'end': at(2026, 1, 12, 23, 0)}
+    first.add(app.normalize_window(dict(window, id='a')))
+    second.add(app.normalize_window(dict(window, id='b')))
+    assert sorted(w['id'] for w in second.windows) == ['a', 'b']
+    assert first.remove('a')
+    second.add(app.normalize_window(dict(window, id='c')))
+    assert not second.remove('a')
+    assert sorted(w['id'] for w in app.MaintenanceWindows(path).windows) == ['b', 'c']
+
+
+def test_concurrent_writes_keep_every_window(tmp_path):
+    path = str(tmp_path / 'maintenance.json')
+    workers = [app.MaintenanceWindows(path) for _ in range(4)]
+    window = {'api': 'User-Service', 'start': at(2026, 1, 12, 22, 0), 'end': at(2026, 1, 12, 23, 0)}
+
+    def add_windows(worker, index):
+        for count in range(10):
+            worker.add(app.normalize_window(dict(window, id=f'{index}-{count}')))
+
+    threads = [threading.Thread(target=add_windows, args=(worker, index)) for index, worker in enumerate(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(app.MaintenanceWindows(path).windows) == 40
@@ -0,0 +1,100 @@
+"""
+Index local des tickets ouverts (OpenTicketIndex): une seule demande de ticket par panne,
+synchronisation JQL et commentaire sur le ticket encore ouvert d'une panne précédente
+"""
+import pytest
+
+import app
+
+URL = 'http://api1.test'
+NAME = 'User-Service'
+
+
+class Response:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+        self.text = ''
+
+    def json(self):
+        return self.data
+
+
+def fail(times, message='HTTP 503'):
+    for _ in range(times):
+        app.apply_check_result(URL, NAME, False, message)
+
+
+def create_ticket(monitoring, key='MON-1'):
+    """
+    Joue le rôle du dispatcher: ticket créé pour la dernière demande api_down
+    """
+    _, kwargs, callback = monitoring.of_type('api_down')[-1]
+    app.open_tickets.add(kwargs['api_name'], key)
+    callback({'success': True, 'ticket_key': key, 'ticket_url': f"{app.JIRA_URL}/browse/{key}"})
+
+
+def test_one_ticket_request_per_outage(monitoring):
+    fail(app.RETRY_ATTEMPTS)
+    assert app.api_status[URL].status == 'down'
+    assert len(monitoring.of_type('api_down')) == 1
+
+    # Création en cours puis ticket créé: plus aucune demande tant que la panne dure
+    fail(3)
+    create_ticket(monitoring)
+    fail(3)
+    assert len(monitoring.of_type('api_down')) == 1
+    assert app.api_status[URL].ticket_key == 'MON-1'
+
+
+def test_failed_creation_is_requested_again(monitoring):
+    fail(app.RETRY_ATTEMPTS)
+    _, _, callback = monitoring.of_type('api_down')[0]
+    callback({'success': False, 'error': 'Erreur Jira: 500'})
+    fail(1)
+    assert len(monitoring.of_type('api_down')) == 2
+
+
+def test_new_outage_with_ticket_still_open_is_commented(monitoring, monkeypatch):
+    # Ticket d'une panne précédente encore ouvert dans Jira (pas de transition de résolution)
+    app.open_tickets.replace_all({NAME: 'MON-1'})
+    fail(app.RETRY_ATTEMPTS)
+    assert len(monitoring.of_type('api_down')) == 1
+
+    comments = []
+    monkeypatch.setattr(app, 'comment_jira_ticket', lambda key, body, on_retry=None: comments.append((key, body)) or {
+        'success': True, 'ticket_key': key, 'ticket_url': f"{app.JIRA_URL}/browse/{key}"})
+    monkeypatch.setattr(app, 'create_jira_ticket', lambda *args, **kwargs: pytest.fail("ticket en double"))
+    ticket_type, kwargs, callback = monitoring.of_type('api_down')[0]
+    [(item, result)] = app.JiraDispatcher(10)._create_tickets([(0.0, ticket_type, kwargs, callback)])
+
+    assert result['existing'] and result['ticket_key'] == 'MON-1'
+    assert [key for key, _ in comments] == ['MON-1']
+    callback(result)
+    assert app.api_status[URL].ticket_key == 'MON-1'
+    fail(3)
+    assert len(monitoring.of_type('api_down')) == 1
+
+
+def test_refresh_indexes_open_tickets_by_api(monkeypatch):
+    monkeypatch.setattr(app, 'open_tickets', app.OpenTicketIndex())
+    prefix = app.TICKET_SUMMARY_PREFIX
+    pages = [
+        {'total': 3, 'issues': [{'key': 'MON-9', 'fields': {'summary': f"{prefix} - User-Service"}},
+                                {'key': 'MON-4', 'fields': {'summary': f"{prefix} - User-Service"}}]},
+        {'total': 3, 'issues': [{'key': 'MON-5', 'fields': {'summary': f"{prefix} - Payment-Service"}}]},
+    ]
+    # Incident corrélé encore ouvert: l'API rattachée garde son association
+    app.open_tickets.add('Order-Service', 'MON-5')
+    app.open_tickets.add('Stock-Service', 'MON-2')
+    requests_sent = []
+
+    def search(method, path, on_retry=None, **kwargs):
+        requests_sent.append(kwargs['params']['startAt'])
+        return Response(pages[len(requests_sent) - 1])
+
+    monkeypatch.setattr(app, 'jira_request', search)
+
+    assert app.refresh_open_tickets() == {'success': True, 'open_tickets': 3}
+    assert requests_sent == [0, 2]
+    assert sorted(app.open_tickets.items()) == [('Order-Service', 'MON-5'), ('Payment-Service', 'MON-5'), ('User-Service', 'MON-9')]
@@ -0,0 +1,89 @@
+"""
+Fin de panne: le ticket est détaché de l'API avant la journalisation de son état
+"""
+import pytest
+
+import app
+
+URL = 'http://api1.test'
+NAME = 'User-Service'
+
+
+def fail(times, message='HTTP 503'):
+    for _ in range(times):
+        app.apply_check_result(URL, NAME, False, message)
+
+
+def succeed(times):
+    for _ in range(times):
+        app.apply_check_result(URL, NAME, True, 'OK', http_code=200)
+
+
+def restart(monkeypatch, monitoring):
+    """
+    Simule un redémarrage: état en mémoire et index perdus, journal relu
+    """
+    monkeypatch.setattr(app, 'api_status', {})
+    monkeypatch.setattr(app, 'open_tickets', app.OpenTicketIndex())
+    monkeypatch.setattr(app, 'state_journal', app.StateJournal(app.state_journal.path))
+    monitoring.items.clear()
+    app.recover_state()
+
+
+def create_ticket(monitoring, key='MON-1'):
+    """
+    Joue le rôle du dispatcher: ticket créé pour la dernière demande api_down
+    """
+    _, kwargs, callback = monitoring.of_type('api_down')[-1]
+    app.open_tickets.add(kwargs['api_name'], key)
+    callback({'success': True, 'ticket_key': key, 'ticket_url': f"{app.JIRA_URL}/browse/{key}"})
+
+
+def test_recovery_detaches_ticket_before_journaling(monitoring, monkeypatch):
+    fail(app.RETRY_ATTEMPTS)
+    create_ticket(monitoring)
+    succeed(app.RECOVERY_ATTEMPTS)
+
+    assert app.api_status[URL].status == 'up'
+    assert [kwargs['ticket_key'] for _, kwargs, _ in monitoring.of_type('api_recovered')] == ['MON-1']
+    assert app.open_tickets.get(NAME) is None
+
+    # Le journal ne doit plus rattacher MON-1 à l'API revenue UP
+    recovered = app.state_journal.recover()[URL]
+    assert (recovered.status, recovered.ticket_key) == ('up', None)
+    restart(monkeypatch, monitoring)
+    assert app.api_status[URL].ticket_key is None
+    assert app.open_tickets.get(NAME) is None
+
+    # Nouvelle panne après le redémarrage: nouvelle demande de ticket
+    fail(app.RETRY_ATTEMPTS)
+    assert len(monitoring.of_type('api_down')) == 1
+
+
+def test_ticket_cancelled_when_api_recovers_before_sending(monitoring, monkeypatch):
+    fail(app.RETRY_ATTEMPTS)
+    succeed(app.RECOVERY_ATTEMPTS)
+    monkeypatch.setattr(app, 'create_jira_ticket', lambda *args, **kwargs: pytest.fail("ticket pour une API UP"))
+    ticket_type, kwargs, callback = monitoring.of_type('api_down')[0]
+    [(item, result)] = app.JiraDispatcher(10)._create_tickets([(0.0, ticket_type, kwargs, callback)])
+    assert result['cancelled']
+
+
+def test_ticket_created_after_recovery_is_resolved_not_attached(monitoring, monkeypatch):
+    fail(app.RETRY_ATTEMPTS)
+    succeed(app.RECOVERY_ATTEMPTS)
+    assert monitoring.of_type('api_recovered') == []
+
+    # Création terminée après le retour UP: le dispatcher a indexé le ticket, puis rappelle
+    create_ticket(monitoring)
+    state = app.api_status[URL]
+    assert (state.status, state.ticket_key, state.ticket_pending) == ('up', None, False)
+    assert app.open_tickets.get(NAME) is None
+    [(_, kwargs, _)] = monitoring.of_type('api_recovered')
+    assert (kwargs['ticket_key'], kwargs['recovered_at']) == ('MON-1', state.since)
+    assert kwargs['failing_since'] is not None
+    assert app.state_journal.recover()[URL].ticket_key is None
+
+    # La panne suivante demande son propre ticket
+    fail(app.RETRY_ATTEMPTS + 3)
+    assert len(monitoring.of_type('api_down')) == 2
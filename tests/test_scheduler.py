@@ -0,0 +1,76 @@
+"""
+Planification des health checks (ProbeScheduler): ordre des échéances, replanification
+et suppression paresseuses, délai avant le prochain probe
+"""
+import time
+
+import pytest
+
+import app
+
+
+def api(name, **config):
+    return dict({'url': f'http://{name}.test', 'name': name}, **config)
+
+
+def names(due):
+    return [entry['name'] for _, entry in due]
+
+
+@pytest.fixture
+def scheduler():
+    return app.ProbeScheduler()
+
+
+def test_due_apis_pop_in_deadline_order(scheduler):
+    scheduler.schedule(api('c'), 30)
+    scheduler.schedule(api('a'), 10)
+    scheduler.schedule(api('b'), 20)
+    now = time.monotonic()
+    assert scheduler.pop_due(now, 10) == []
+    assert names(scheduler.pop_due(now + 25, 10)) == ['a', 'b']
+    assert names(scheduler.pop_due(now + 60, 10)) == ['c']
+
+
+def test_pop_due_respects_limit(scheduler):
+    for index in range(5):
+        scheduler.schedule(api(f'api{index}'), index)
+    now = time.monotonic() + 10
+    assert names(scheduler.pop_due(now, 2)) == ['api0', 'api1']
+    assert names(scheduler.pop_due(now, 10)) == ['api2', 'api3', 'api4']
+
+
+def test_reschedule_and_remove_skip_stale_entries(scheduler):
+    scheduler.schedule(api('a'), 10)
+    scheduler.schedule(api('b'), 20)
+    scheduler.schedule(api('a'), 30)
+    scheduler.remove('http://b.test')
+    now = time.monotonic()
+    assert scheduler.next_deadline() == pytest.approx(now + 30, abs=1)
+    assert names(scheduler.pop_due(now + 25, 10)) == []
+    assert names(scheduler.pop_due(now + 35, 10)) == ['a']
+    assert len(scheduler) == 1
+
+
+def test_api_in_flight_has_no_deadline_until_rescheduled(scheduler):
+    scheduler.schedule(api('a'), 0)
+    [(_, entry)] = scheduler.pop_due(time.monotonic() + 1, 10)
+    assert scheduler.contains('http://a.test')
+    assert scheduler.next_deadline() is None
+
+    # Configuration modifiée pendant le probe: conservée, sans échéance en double
+    scheduler.update(api('a', interval=5), 0)
+    assert scheduler.next_deadline() is None
+    assert scheduler.get('http://a.test')['interval'] == 5
+
+
+def test_next_probe_delay(monkeypatch):
+    monkeypatch.setattr(app, 'HEALTH_CHECK_JITTER', 0)
+    monkeypatch.setattr(app, 'HEALTH_CHECK_RETRY_INTERVAL', 5)
+    monkeypatch.setattr(app, 'HEALTH_CHECK_MAX_BACKOFF', 300)
+    assert app.next_probe_delay(api('a', interval=60), 0) == 60
+    assert app.next_probe_delay(api('a', interval=60), 1) == 5
+    assert app.next_probe_delay(api('a', interval=60), 0, confirming=True) == 5
+    assert app.next_probe_delay(api('a', interval=60), app.RETRY_ATTEMPTS) == 60
+    assert app.next_probe_delay(api('a', interval=60), app.RETRY_ATTEMPTS + 1) == 120
+    assert app.next_probe_delay(api('a', interval=60), app.RETRY_ATTEMPTS + 10) == 300
@@ -0,0 +1,66 @@
+"""
+Journal d'état (StateJournal): snapshot + rejeu, ligne tronquée ignorée et reprise
+des tickets ouverts après un redémarrage
+"""
+from datetime import datetime
+
+import app
+
+URL = 'http://api1.test'
+NAME = 'User-Service'
+
+
+def fail(times, message='HTTP 503'):
+    for _ in range(times):
+        app.apply_check_result(URL, NAME, False, message)
+
+
+def restart(monkeypatch, monitoring):
+    """
+    Simule un redémarrage: état en mémoire et index perdus, journal relu
+    """
+    monkeypatch.setattr(app, 'api_status', {})
+    monkeypatch.setattr(app, 'open_tickets', app.OpenTicketIndex())
+    monkeypatch.setattr(app, 'state_journal', app.StateJournal(app.state_journal.path))
+    monitoring.items.clear()
+    app.recover_state()
+
+
+def make_state(status, failures=0, ticket_key=None):
+    return app.ApiState(NAME, status=status, since=datetime(2026, 1, 12, 10, 0, 0),
+                        last_check=datetime(2026, 1, 12, 10, 0, 30), consecutive_failures=failures,
+                        ticket_key=ticket_key)
+
+
+def test_replay_after_snapshot(tmp_path):
+    journal = app.StateJournal(str(tmp_path / 'state.journal'))
+    journal.record(URL, make_state('degraded', 1))
+    journal.compact({URL: make_state('degraded', 1)})
+    journal.record(URL, make_state('down', 3, 'MON-1'))
+    journal.record('http://api2.test', make_state('up'))
+
+    states = app.StateJournal(journal.path).recover()
+    assert sorted(states) == ['http://api1.test', 'http://api2.test']
+    assert (states[URL].status, states[URL].consecutive_failures, states[URL].ticket_key) == ('down', 3, 'MON-1')
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    journal = app.StateJournal(str(tmp_path / 'state.journal'))
+    journal.record(URL, make_state('down', 3))
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"url": "http://api1.test", "status": "u')
+    assert app.StateJournal(journal.path).recover()[URL].status == 'down'
+
+
+def test_open_ticket_survives_restart(monitoring, monkeypatch):
+    fail(app.RETRY_ATTEMPTS)
+    _, kwargs, callback = monitoring.of_type('api_down')[0]
+    app.open_tickets.add(NAME, 'MON-1')
+    callback({'success': True, 'ticket_key': 'MON-1', 'ticket_url': f"{app.JIRA_URL}/browse/MON-1"})
+
+    restart(monkeypatch, monitoring)
+    state = app.api_status[URL]
+    assert (state.status, state.ticket_key) == ('down', 'MON-1')
+    assert app.open_tickets.get(NAME)['key'] == 'MON-1'
+    fail(3)
+    assert monitoring.items == []
@@ -0,0 +1,106 @@
+"""
+Machine à états des APIs (advance_state): hystérésis, retour progressif et flapping
+"""
+import app
+
+
+def run(state, results, slow=False):
+    """
+    Applique une suite de résultats et retourne les statuts successifs
+    """
+    statuses = []
+    for is_healthy in results:
+        state.status = app.advance_state(state, is_healthy, slow)
+        statuses.append(state.status)
+    return statuses
+
+
+def test_first_success_is_up():
+    state = app.ApiState('A')
+    assert run(state, [True]) == ['up']
+
+
+def test_failures_degrade_then_down_after_retry_attempts():
+    state = app.ApiState('A', status='up')
+    assert run(state, [False] * app.RETRY_ATTEMPTS) == ['degraded'] * (app.RETRY_ATTEMPTS - 1) + ['down']
+
+
+def test_isolated_failure_returns_to_up():
+    state = app.ApiState('A', status='up')
+    assert run(state, [False, True]) == ['degraded', 'up']
+
+
+def test_recovering_needs_consecutive_successes():
+    state = app.ApiState('A', status='up')
+    run(state, [False] * app.RETRY_ATTEMPTS)
+    assert run(state, [True] * app.RECOVERY_ATTEMPTS) == ['recovering'] * (app.RECOVERY_ATTEMPTS - 1) + ['up']
+
+
+def test_failure_while_recovering_goes_straight_back_down():
+    state = app.ApiState('A', status='up')
+    run(state, [False] * app.RETRY_ATTEMPTS)
+    assert run(state, [True, False]) == ['recovering', 'down']
+
+
+def run_latencies(state, slow_flags):
+    statuses = []
+    for slow in slow_flags:
+        state.status = app.advance_state(state, True, slow)
+        statuses.append(state.status)
+    return statuses
+
+
+def test_slow_responses_degrade_after_several_probes():
+    state = app.ApiState('A', status='up')
+    attempts = app.SLOW_RESPONSE_ATTEMPTS
+    assert run(state, [True] * attempts, slow=True) == ['up'] * (attempts - 1) + ['degraded']
+    recovery = app.SLOW_RECOVERY_ATTEMPTS
+    assert run(state, [True] * recovery) == ['degraded'] * (recovery - 1) + ['up']
+
+
+def test_latency_around_threshold_does_not_oscillate():
+    state = app.ApiState('A', status='up')
+    assert set(run_latencies(state, [True, False] * 10)) == {'up'}
+    run_latencies(state, [True] * app.SLOW_RESPONSE_ATTEMPTS)
+    assert set(run_latencies(state, [False, True] * 10)) == {'degraded'}
+
+
+def test_failure_degraded_returns_up_on_first_response():
+    # DEGRADED après un échec (pas pour lenteur): pas d'attente de réponses rapides
+    state = app.ApiState('A', status='up')
+    assert run(state, [False, True]) == ['degraded', 'up']
+    assert run_latencies(state, [True]) == ['up']
+
+
+def test_slow_recovery_after_outage_is_degraded():
+    state = app.ApiState('A', status='up')
+    run(state, [False] * app.RETRY_ATTEMPTS)
+    slow_probes = max(app.RECOVERY_ATTEMPTS, app.SLOW_RESPONSE_ATTEMPTS)
+    assert run(state, [True] * slow_probes, slow=True)[-1] == 'degraded'
+
+
+def test_alternating_results_enter_and_leave_flapping():
+    state = app.ApiState('A', status='up')
+    statuses = run(state, [True, False] * app.FLAP_WINDOW)
+    assert statuses[-1] == 'flapping'
+    # Le flapping dure tant que la fenêtre reste instable (hystérésis entre les deux seuils)
+    statuses = run(state, [True] * app.FLAP_WINDOW)
+    assert statuses[0] == 'flapping'
+    assert statuses[-1] == 'up'
+    assert 'down' not in statuses
+
+
+def test_flap_ratio_counts_changes_in_window():
+    state = app.ApiState('A')
+    for is_healthy in (True, True, False, True):
+        state.record_result(is_healthy)
+    assert state.flap_ratio() == 2 / 3
+
+
+def test_is_recovery():
+    assert app.is_recovery('recovering', 'up')
+    assert app.is_recovery('down', 'degraded')
+    assert app.is_recovery('unknown', 'up')
+    assert not app.is_recovery('up', 'degraded')
+    assert not app.is_recovery('flapping', 'degraded')
+    assert not app.is_recovery('up', 'down')
@@ -0,0 +1,75 @@
+"""
+Store de statut partagé (StatusStore): aller-retour écriture/lecture, génération
+et lecture de repli quand le seqlock reste impair (leader arrêté en pleine écriture)
+"""
+from datetime import datetime
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def status_store(tmp_path):
+    store = app.StatusStore(str(tmp_path / 'status.mmap'), 4)
+    store.open_writer()
+    return store
+
+
+def make_state(status='up', failures=0, ticket=None):
+    state = app.ApiState('User-Service', status=status, last_check=datetime(2026, 1, 12, 10, 0, 0),
+                         consecutive_failures=failures)
+    state.last_ticket_created = ticket
+    return state
+
+
+def stick_seq_odd(mm, offset):
+    seq = app.StatusStore.SEQ.unpack_from(mm, offset)[0]
+    app.StatusStore.SEQ.pack_into(mm, offset, seq | 1)
+
+
+def test_status_round_trip(status_store):
+    status_store.write('http://api1.test', make_state('down', 3, datetime(2026, 1, 12, 10, 1, 0)))
+    assert status_store.read_all() == {
+        'http://api1.test': {
+            'name': 'User-Service',
+            'status': 'down',
+            'last_check': '2026-01-12T10:00:00',
+            'consecutive_failures': 3,
+            'last_ticket_created': '2026-01-12T10:01:00'
+        }
+    }
+
+
+def test_removed_slot_is_reused(status_store):
+    status_store.write('http://api1.test', make_state())
+    status_store.remove('http://api1.test')
+    status_store.write('http://api2.test', make_state())
+    assert list(status_store.read_all()) == ['http://api2.test']
+    assert status_store.read_header()['used'] == 1
+
+
+def test_generation_changes_only_with_served_state(status_store):
+    status_store.write('http://api1.test', make_state())
+    generation = status_store.read_header()['generation']
+    # Nouveau health check sans changement d'état: la génération (clé du cache) ne bouge pas
+    later = make_state()
+    later.last_check = datetime(2026, 1, 12, 10, 0, 30)
+    status_store.write('http://api1.test', later)
+    assert status_store.read_header()['generation'] == generation
+    assert status_store.read_all()['http://api1.test']['last_check'] == '2026-01-12T10:00:30'
+    status_store.write('http://api1.test', make_state('degraded', 1))
+    assert status_store.read_header()['generation'] == generation + 1
+
+
+def test_status_record_read_with_stuck_seqlock(status_store):
+    status_store.write('http://api1.test', make_state('down', 3))
+    stick_seq_odd(status_store._mm, status_store.HEADER_SIZE)
+    assert status_store.read_all()['http://api1.test']['status'] == 'down'
+
+
+def test_stats_round_trip_and_stuck_seqlock(status_store):
+    status_store.publish_stats({'jira_queue': {'queue_depth': 2}})
+    assert status_store.read_stats() == {'jira_queue': {'queue_depth': 2}}
+    stick_seq_odd(status_store._mm, status_store._stats_offset(status_store.capacity))
+    assert status_store.read_stats() == {'jira_queue': {'queue_depth': 2}}
@@ -0,0 +1,98 @@
+"""
+Configuration des APIs monitorées: validation, application par différence
+et mise à jour protégée par ADMIN_TOKEN
+"""
+import json
+
+import pytest
+
+import app
+
+
+def target(name, **config):
+    return dict({'url': f'http://{name}.test', 'name': name}, **config)
+
+
+@pytest.fixture
+def targets(monitoring, monkeypatch, tmp_path):
+    """
+    Worker leader avec un fichier des APIs et un scheduler propres au test
+    """
+    path = tmp_path / 'targets.json'
+    monkeypatch.setattr(app, 'MONITORED_APIS_FILE', str(path))
+    monkeypatch.setattr(app, 'MONITORED_APIS', [])
+    monkeypatch.setattr(app, 'probe_scheduler', app.ProbeScheduler())
+    monkeypatch.setattr(app, 'leader_lock_fd', -1)
+    monkeypatch.setattr(app, 'targets_state', {'mtime': None, 'checked_at': 0.0, 'version': 0})
+    return path
+
+
+def test_normalize_target():
+    assert app.normalize_target({'url': ' http://a.test ', 'interval': '10', 'method': 'head', 'expected_status': 204,
+                                 'tags': 'paiement'}) == {
+        'url': 'http://a.test', 'name': 'a.test', 'interval': 10.0, 'method': 'HEAD',
+        'expected_status': [204], 'tags': ['paiement']
+    }
+    assert app.normalize_target({'url': 'tcp://db.test:5432'})['type'] == 'tcp'
+
+
+@pytest.mark.parametrize('data', [
+    {'targets': 'http://a.test'},
+    [{'name': 'sans URL'}],
+    [{'url': 'http://a.test', 'interval': 0}],
+    [{'url': 'http://a.test', 'type': 'ftp'}],
+    [{'url': 'http://a.test'}, {'url': 'http://a.test', 'name': 'doublon'}],
+])
+def test_parse_targets_rejects_invalid_lists(data):
+    with pytest.raises(ValueError):
+        app.parse_targets(data)
+
+
+def test_apply_targets_touches_only_the_difference(targets):
+    app.apply_targets([target('a'), target('b'), target('c', interval=30)])
+    for url in ('http://a.test', 'http://b.test'):
+        app.apply_check_result(url, url, True, 'OK', http_code=200)
+    version = app.targets_state['version']
+
+    added, removed, changed = app.apply_targets([target('a'), target('c', interval=60), target('d')])
+    assert (added, removed, changed) == (['http://d.test'], ['http://b.test'], ['http://c.test'])
+    assert sorted(app.probe_scheduler.urls()) == ['http://a.test', 'http://c.test', 'http://d.test']
+    assert app.probe_scheduler.get('http://c.test')['interval'] == 60
+    # L'état de l'API inchangée est conservé, celui de l'API supprimée oublié
+    assert sorted(app.api_status) == ['http://a.test']
+    assert list(app.status_store.read_all()) == ['http://a.test']
+    assert app.targets_state['version'] == version + 1
+
+
+def test_renamed_api_keeps_its_state(targets):
+    app.apply_targets([target('a')])
+    app.apply_check_result('http://a.test', 'a', True, 'OK', http_code=200)
+    app.apply_targets([{'url': 'http://a.test', 'name': 'Renamed'}])
+    assert app.api_status['http://a.test'].name == 'Renamed'
+    assert app.status_store.read_all()['http://a.test']['name'] == 'Renamed'
+
+
+def test_reload_targets_from_file(targets):
+    targets.write_text(json.dumps({'targets': [target('a'), target('b')]}), encoding='utf-8')
+    app.reload_targets(force=True)
+    assert [api['name'] for api in app.MONITORED_APIS] == ['a', 'b']
+
+    # Fichier invalide: la configuration courante est conservée
+    targets.write_text('{"targets": [', encoding='utf-8')
+    app.reload_targets(force=True)
+    assert [api['name'] for api in app.MONITORED_APIS] == ['a', 'b']
+
+
+@pytest.mark.parametrize('token, allow_unauthenticated, headers, expected', [
+    ('', False, {}, 403),
+    ('', True, {}, 200),
+    ('secret', False, {}, 401),
+    ('secret', False, {'Authorization': 'Bearer autre'}, 401),
+    ('secret', False, {'Authorization': 'Bearer secret'}, 200),
+])
+def test_update_targets_requires_admin_token(targets, monkeypatch, token, allow_unauthenticated, headers, expected):
+    monkeypatch.setattr(app, 'ADMIN_TOKEN', token)
+    monkeypatch.setattr(app, 'ADMIN_ALLOW_UNAUTHENTICATED', allow_unauthenticated)
+    response = app.app.test_client().post('/monitoring/targets', json=[target('a')], headers=headers)
+    assert response.status_code == expected
+    assert targets.exists() == (expected == 200)